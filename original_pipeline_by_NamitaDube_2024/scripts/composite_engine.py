@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Vectorized normalisation and composite scores (CS1-CS4).
+
+All steps are NumPy array operations on whole columns:
+  - g_RMS and Local_GDT go through the sigmoid L / (1 + exp(-k (x - x0))),
+  - Global/Local LDDT are scaled x100, Global_GDT is kept as is,
+  - the CS4 threshold parts are 100 where the value is above the cutoff, else 0,
+  - CS1-CS4 are NaN-skipping means of their parts.
+
+sweep() evaluates many (L, k, x0) and (gdt_cutoff, lddt_cutoff) settings in one
+broadcasted call, which is what sensitivity studies need.
+
+Example (sensitivity sweep):
+  python composite_engine.py --in combined_results.csv --out cs_sweep.csv \
+      --gdt-cutoffs 70 80 90 --lddt-cutoffs 70 80 90 --x0 3.5 3.77 4.0
+"""
+import argparse, itertools
+import numpy as np, pandas as pd
+
+SIGMOID_DEFAULTS = {"L": 105.0, "k": -0.77, "x0": 3.77}
+RAW_COLUMNS = ["g_RMS", "Local_GDT", "Global_LDDT", "Global_GDT", "Local_LDDT"]
+NORMALIZED_COLUMNS = ["Global_GDT_normalized", "g_RMS_normalized", "Global_LDDT_normalized",
+                      "Local_GDT_normalized", "Local_LDDT_normalized"]
+CS_PARTS = {
+    "CS1": ["Local_LDDT_normalized", "Local_GDT_normalized"],
+    "CS2": ["Local_LDDT_normalized", "Local_GDT_normalized", "Global_LDDT_normalized"],
+    "CS3": ["Local_LDDT_normalized", "Local_GDT_normalized", "Global_LDDT_normalized", "Global_GDT_normalized"],
+}
+
+def sigmoid(x, L=105.0, k=-0.77, x0=3.77):
+    """Sigmoid on arrays; L, k and x0 may be arrays too and broadcast against x."""
+    return L / (1 + np.exp(-k * (np.asarray(x, dtype=float) - x0)))
+
+def numeric_column(df: pd.DataFrame, col: str) -> np.ndarray:
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+
+def normalize_metrics(df: pd.DataFrame, L=105.0, k=-0.77, x0=3.77) -> pd.DataFrame:
+    """Model plus the five *_normalized columns of normalize_metrics.py."""
+    return pd.DataFrame({
+        "Model": df["Model"].to_numpy(),
+        "Global_GDT_normalized": numeric_column(df, "Global_GDT"),      # usually already 0..100
+        "g_RMS_normalized": sigmoid(numeric_column(df, "g_RMS"), L, k, x0),
+        "Global_LDDT_normalized": numeric_column(df, "Global_LDDT") * 100.0,   # expect 0..1 → 0..100
+        "Local_GDT_normalized": sigmoid(numeric_column(df, "Local_GDT"), L, k, x0),
+        "Local_LDDT_normalized": numeric_column(df, "Local_LDDT") * 100.0,     # expect 0..1 → 0..100
+    })
+
+def threshold_part(x, cutoff):
+    """100 where x > cutoff, else 0 (NaN counts as below the cutoff)."""
+    with np.errstate(invalid="ignore"):
+        return np.where(np.asarray(x, dtype=float) > cutoff, 100.0, 0.0)
+
+def nan_mean(parts):
+    """Mean over parts skipping NaN (NaN when every part is NaN); parts broadcast together."""
+    parts = np.broadcast_arrays(*parts)
+    total = sum(np.where(np.isnan(p), 0.0, p) for p in parts)
+    count = sum((~np.isnan(p)).astype(int) for p in parts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / np.maximum(count, 1), np.nan)
+
+def composite_arrays(norm, gdt_cutoff=80.0, lddt_cutoff=80.0):
+    """CS1-CS4 arrays from a mapping of *_normalized arrays; cutoffs may be arrays that broadcast."""
+    scores = {name: nan_mean([norm[col] for col in cols]) for name, cols in CS_PARTS.items()}
+    scores["CS4"] = nan_mean([norm["Local_LDDT_normalized"], norm["Local_GDT_normalized"],
+                              threshold_part(norm["Global_LDDT_normalized"], lddt_cutoff),
+                              threshold_part(norm["Global_GDT_normalized"], gdt_cutoff),
+                              norm["g_RMS_normalized"]])
+    return scores
+
+def composite_scores(norm_df: pd.DataFrame, gdt_cutoff=80.0, lddt_cutoff=80.0) -> pd.DataFrame:
+    """Model,CS1,CS2,CS3,CS4 for a normalized_metrics table."""
+    norm = {col: numeric_column(norm_df, col) for col in NORMALIZED_COLUMNS}
+    out = pd.DataFrame({"Model": norm_df["Model"].to_numpy()})
+    for name, values in composite_arrays(norm, gdt_cutoff, lddt_cutoff).items():
+        out[name] = values
+    return out
+
+def sweep(df: pd.DataFrame, gdt_cutoffs=(80.0,), lddt_cutoffs=(80.0,), L=(105.0,), k=(-0.77,), x0=(3.77,)) -> pd.DataFrame:
+    """
+    CS1-CS4 of every model for every combination of sigmoid parameters and cutoffs,
+    from raw merged metrics (combined_results.csv). Returns a long table with one row
+    per (setting, model). All settings are evaluated as one broadcasted array operation.
+    """
+    settings = np.array(list(itertools.product(L, k, x0, gdt_cutoffs, lddt_cutoffs)), dtype=float)
+    col = lambda i: settings[:, i:i + 1]   # (S, 1) so it broadcasts against (N,) model columns
+    raw = {name: numeric_column(df, name) for name in RAW_COLUMNS}
+    norm = {
+        "Global_GDT_normalized": raw["Global_GDT"][None, :],
+        "g_RMS_normalized": sigmoid(raw["g_RMS"], col(0), col(1), col(2)),
+        "Global_LDDT_normalized": raw["Global_LDDT"][None, :] * 100.0,
+        "Local_GDT_normalized": sigmoid(raw["Local_GDT"], col(0), col(1), col(2)),
+        "Local_LDDT_normalized": raw["Local_LDDT"][None, :] * 100.0,
+    }
+    scores = composite_arrays(norm, gdt_cutoff=col(3), lddt_cutoff=col(4))
+    n_settings, n_models = len(settings), len(df)
+    out = pd.DataFrame(np.repeat(settings, n_models, axis=0), columns=["L", "k", "x0", "gdt_cutoff", "lddt_cutoff"])
+    out.insert(0, "Model", np.tile(df["Model"].to_numpy(), n_settings))
+    for name, values in scores.items():
+        out[name] = np.broadcast_to(values, (n_settings, n_models)).ravel()
+    return out
+
+def main():
+    ap = argparse.ArgumentParser(description="Composite score sensitivity sweep")
+    ap.add_argument("--in", dest="inp", default="combined_results.csv")
+    ap.add_argument("--out", default="composite_sweep.csv")
+    ap.add_argument("--gdt-cutoffs", type=float, nargs="+", default=[80.0])
+    ap.add_argument("--lddt-cutoffs", type=float, nargs="+", default=[80.0])
+    ap.add_argument("--L", type=float, nargs="+", default=[SIGMOID_DEFAULTS["L"]])
+    ap.add_argument("--k", type=float, nargs="+", default=[SIGMOID_DEFAULTS["k"]])
+    ap.add_argument("--x0", type=float, nargs="+", default=[SIGMOID_DEFAULTS["x0"]])
+    args = ap.parse_args()
+
+    out = sweep(pd.read_csv(args.inp), args.gdt_cutoffs, args.lddt_cutoffs, args.L, args.k, args.x0)
+    out.to_csv(args.out, index=False)
+    print(f"Wrote {args.out} with {len(out)} rows")
+
+if __name__ == "__main__":
+    main()
@@ -2,24 +2,32 @@
 """
 Extract Global GDT_TS and g_RMS from LGA output files in a given folder (recursive).
 Writes: global_gdt_rms.csv with columns: Model,Global_GDT,g_RMS
+(or a Parquet file when --out ends in .parquet).
+
+Files are parsed on a worker pool; each file is read only until both values are found,
+and rows are streamed to the output in discovery order.
 
 Example:
-  python extract_global_gdt_rms.py --root /path/to/lga --out global_gdt_rms.csv
+  python extract_global_gdt_rms.py --root /path/to/lga --out global_gdt_rms.csv --workers 8
 """
-import argparse, os, re, glob, csv
+import argparse, os, re
 from typing import Optional, Tuple
+from extract_utils import iter_files, parallel_map, RowWriter
 
-def parse_global_gdt(line: str) -> Optional[float]:
-    for pat in [r"GDT[_\s]?TS[=\s:]+([0-9]+(?:\.[0-9]+)?)", r"\bGDT[=\s:]+([0-9]+(?:\.[0-9]+)?)"]:
-        m = re.search(pat, line)
+GDT_PATTERNS = [re.compile(r"GDT[_\s]?TS[=\s:]+([0-9]+(?:\.[0-9]+)?)"), re.compile(r"\bGDT[=\s:]+([0-9]+(?:\.[0-9]+)?)")]
+GRMS_PATTERNS = [re.compile(r"g[_\s]?RMS[=\s:]+([0-9]+(?:\.[0-9]+)?)"), re.compile(r"\bRMSD[=\s:]+([0-9]+(?:\.[0-9]+)?)")]
+
+def parse_first(line: str, patterns) -> Optional[float]:
+    for pat in patterns:
+        m = pat.search(line)
         if m: return float(m.group(1))
     return None
 
+def parse_global_gdt(line: str) -> Optional[float]:
+    return parse_first(line, GDT_PATTERNS)
+
 def parse_grms(line: str) -> Optional[float]:
-    for pat in [r"g[_\s]?RMS[=\s:]+([0-9]+(?:\.[0-9]+)?)", r"\bRMSD[=\s:]+([0-9]+(?:\.[0-9]+)?)"]:
-        m = re.search(pat, line)
-        if m: return float(m.group(1))
-    return None
+    return parse_first(line, GRMS_PATTERNS)
 
 def extract_from_file(path: str) -> Tuple[Optional[float], Optional[float]]:
     gdt = None
@@ -28,32 +36,32 @@ def extract_from_file(path: str) -> Tuple[Optional[float], Optional[float]]:
       for line in f:
         if "GDT" in line:
             gdt = gdt or parse_global_gdt(line)
-        if "RMS" in line or "RMSD" in line:
+        if "RMS" in line:
             grms = grms or parse_grms(line)
+        # A value of 0 is still replaced by a later match, as in the serial extractor
+        if gdt and grms:
+            break
     return gdt, grms
 
+def extract_row(path: str) -> Optional[tuple]:
+    model = os.path.splitext(os.path.basename(path))[0]
+    gdt, grms = extract_from_file(path)
+    if gdt is not None and grms is not None:
+        return (model, gdt, grms)
+    return None
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--root", required=True, help="Folder containing LGA outputs (*.lga/*.txt)")
-    ap.add_argument("--out", default="global_gdt_rms.csv")
+    ap.add_argument("--out", default="global_gdt_rms.csv", help="Output .csv or .parquet")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parser processes (1 = serial)")
     args = ap.parse_args()
 
-    files = []
-    for ext in ("*.lga","*.txt"):
-        files += glob.glob(os.path.join(args.root, "**", ext), recursive=True)
-
-    rows = []
-    for fp in files:
-        model = os.path.splitext(os.path.basename(fp))[0]
-        gdt, grms = extract_from_file(fp)
-        if gdt is not None and grms is not None:
-            rows.append((model, gdt, grms))
-
-    with open(args.out, "w", newline="") as w:
-        cw = csv.writer(w)
-        cw.writerow(["Model","Global_GDT","g_RMS"])
-        cw.writerows(rows)
-    print(f"Wrote {len(rows)} rows to {args.out}")
+    files = iter_files(args.root, ("*.lga", "*.txt"))
+    with RowWriter(args.out, ["Model", "Global_GDT", "g_RMS"]) as writer:
+        for row in parallel_map(extract_row, files, workers=args.workers):
+            writer.write(row)
+    print(f"Wrote {writer.count} rows to {args.out}")
 
 if __name__ == "__main__":
     main()
@@ -3,47 +3,48 @@
 Extract Global LDDT from files in a folder (recursive).
 Looks for a line containing "Global LDDT" and takes the first float on that line.
 Writes: global_lddt.csv with columns: Model,Global_LDDT (0..1)
+(or a Parquet file when --out ends in .parquet).
+
+Files are parsed on a worker pool and rows are streamed to the output in discovery order.
 
 Example:
-  python extract_global_lddt.py --root /path/to/lddt --out global_lddt.csv
+  python extract_global_lddt.py --root /path/to/lddt --out global_lddt.csv --workers 8
 """
-import argparse, os, re, glob, csv
+import argparse, os, re
+from typing import Optional
+from extract_utils import iter_files, parallel_map, RowWriter
+
+FLOAT_PATTERN = re.compile(r"([0-9]*\.[0-9]+)")
+GLOBAL_LDDT_PATTERN = re.compile(r"global lddt", re.IGNORECASE)
 
 def find_float_on_line(line: str):
-    m = re.search(r"([0-9]*\.[0-9]+)", line)
+    m = FLOAT_PATTERN.search(line)
     return float(m.group(1)) if m else None
 
+def extract_row(path: str) -> Optional[tuple]:
+    try:
+        with open(path, "r", errors="ignore") as fh:
+            for line in fh:
+                if GLOBAL_LDDT_PATTERN.search(line):
+                    score = find_float_on_line(line)
+                    if score is not None:
+                        return (os.path.splitext(os.path.basename(path))[0], score)
+    except Exception:
+        pass
+    return None
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--root", required=True, help="Folder containing *.lddt/*.txt/*.log")
-    ap.add_argument("--out", default="global_lddt.csv")
+    ap.add_argument("--out", default="global_lddt.csv", help="Output .csv or .parquet")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parser processes (1 = serial)")
     args = ap.parse_args()
 
-    files = []
-    for ext in ("*.lddt","*.txt","*.log"):
-        files += glob.glob(os.path.join(args.root, "**", ext), recursive=True)
-
-    rows = []
-    for f in files:
-        try:
-            with open(f, "r", errors="ignore") as fh:
-                score = None
-                for line in fh:
-                    if "Global LDDT" in line or "global lddt" in line.lower():
-                        score = find_float_on_line(line)
-                        if score is not None:
-                            break
-                if score is not None:
-                    model = os.path.splitext(os.path.basename(f))[0]
-                    rows.append((model, score))
-        except Exception:
-            continue
-
-    with open(args.out, "w", newline="") as w:
-        cw = csv.writer(w)
-        cw.writerow(["Model","Global_LDDT"])
-        cw.writerows(rows)
-    print(f"Wrote {len(rows)} rows to {args.out}")
+    files = iter_files(args.root, ("*.lddt", "*.txt", "*.log"))
+    with RowWriter(args.out, ["Model", "Global_LDDT"]) as writer:
+        for row in parallel_map(extract_row, files, workers=args.workers):
+            writer.write(row)
+    print(f"Wrote {writer.count} rows to {args.out}")
 
 if __name__ == "__main__":
     main()
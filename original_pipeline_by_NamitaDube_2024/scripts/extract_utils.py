@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the extract_* scripts: lazy recursive file discovery, an
+order-preserving worker pool and a row writer that streams to CSV or Parquet.
+
+Rows are written as results arrive, in discovery order, so memory stays flat no
+matter how many model x reference comparisons a CASP round produces.
+"""
+import csv, glob, os
+from multiprocessing import Pool
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence
+
+def iter_files(root: str, patterns: Sequence[str]) -> Iterator[str]:
+    """Yield files under root matching each pattern in turn (same order as the serial extractors)."""
+    for pattern in patterns:
+        yield from glob.iglob(os.path.join(root, "**", pattern), recursive=True)
+
+def parallel_map(func: Callable, items: Iterable, workers: int = 1, chunksize: int = 64) -> Iterator:
+    """map(func, items) over a process pool, yielding results lazily and in input order."""
+    if workers <= 1:
+        yield from map(func, items)
+        return
+    with Pool(processes=workers) as pool:
+        yield from pool.imap(func, items, chunksize=chunksize)
+
+class RowWriter:
+    """Write rows to a .csv file, or to a .parquet file in batches (requires pyarrow)."""
+
+    def __init__(self, path: str, header: List[str], batch_size: int = 10000):
+        self.path, self.header, self.batch_size = path, header, batch_size
+        self.count = 0
+        self.batch: List[tuple] = []
+        self.parquet = os.path.splitext(path)[1].lower() == ".parquet"
+        if self.parquet:
+            try:
+                import pyarrow.parquet  # noqa: F401
+            except ImportError as e:
+                raise ImportError("Parquet output requires pyarrow: pip install pyarrow") from e
+            self._pq_writer = None
+        else:
+            self._fh = open(path, "w", newline="")
+            self._csv = csv.writer(self._fh)
+            self._csv.writerow(header)
+
+    def write(self, row: Optional[tuple]):
+        if row is None:
+            return
+        self.count += 1
+        if not self.parquet:
+            self._csv.writerow(row)
+            return
+        self.batch.append(row)
+        if len(self.batch) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self.batch:
+            return
+        import pyarrow as pa, pyarrow.parquet as pq
+        table = pa.Table.from_pylist([dict(zip(self.header, row)) for row in self.batch])
+        if self._pq_writer is None:
+            self._pq_writer = pq.ParquetWriter(self.path, table.schema)
+        self._pq_writer.write_table(table.cast(self._pq_writer.schema))
+        self.batch = []
+
+    def close(self):
+        if self.parquet:
+            self._flush()
+            if self._pq_writer is not None:
+                self._pq_writer.close()
+            else:
+                import pyarrow as pa, pyarrow.parquet as pq
+                pq.write_table(pa.table({name: pa.array([], pa.string()) for name in self.header}), self.path)
+        else:
+            self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Residue-window engine shared by extract_local_gdt.py and extract_local_lddt.py.
+
+Each per-residue table is read once into two NumPy arrays (residue, value), sorted by
+residue, and turned into prefix sums of the valid values and their counts. The mean
+over any window [start, end] is then two searchsorted lookups and a subtraction, so
+any number of windows costs one read per file. The result is a wide table with one
+column per window, averaged over files that map to the same model.
+"""
+import argparse, os
+from functools import partial
+from typing import List, Optional, Sequence, Tuple
+import numpy as np, pandas as pd
+from extract_utils import iter_files, parallel_map
+
+Window = Tuple[Optional[int], Optional[int]]
+
+def read_any(path: str, usecols: Sequence[int]) -> pd.DataFrame:
+    ext = os.path.splitext(path)[1].lower()
+    sep = "\t" if ext == ".tsv" else "," if ext == ".csv" else r"\s+"
+    return pd.read_csv(path, sep=sep, header=None, usecols=list(usecols))
+
+def read_residue_table(path: str, rcol: int, vcol: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Return (residues, values) as float arrays sorted by residue, or None if unreadable."""
+    try:
+        df = read_any(path, sorted({rcol, vcol}))
+    except Exception:
+        return None
+    if rcol not in df.columns or vcol not in df.columns:
+        return None
+    res = pd.to_numeric(df[rcol], errors="coerce").to_numpy(dtype=float)
+    val = pd.to_numeric(df[vcol], errors="coerce").to_numpy(dtype=float)
+    order = np.argsort(res, kind="stable")
+    return res[order], val[order]
+
+def window_means(res: np.ndarray, val: np.ndarray, windows: Sequence[Window]) -> np.ndarray:
+    """Mean of the non-NaN values with start <= residue <= end, for every window at once."""
+    valid = ~np.isnan(val)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, val, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    # Rows without a residue number (NaN, sorted last) only count towards the whole-chain
+    # window (None, None); an open end such as "23-" stops at the last numbered residue
+    n_numbered = int(np.count_nonzero(~np.isnan(res)))
+    starts = np.array([0 if start is None else np.searchsorted(res[:n_numbered], start, "left") for start, _ in windows])
+    ends = np.array([(len(res) if start is None else n_numbered) if end is None
+                     else np.searchsorted(res[:n_numbered], end, "right") for start, end in windows])
+    total = sums[ends] - sums[starts]
+    n = counts[ends] - counts[starts]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 0, total / np.maximum(n, 1), np.nan)
+
+def model_name(path: str, prefix_split: Optional[str]) -> str:
+    name = os.path.splitext(os.path.basename(path))[0]
+    if prefix_split and prefix_split in name:
+        name = name.split(prefix_split, 1)[0]
+    return name
+
+def process_file(path: str, rcol: int, vcol: int, windows: Sequence[Window], prefix_split: Optional[str]):
+    table = read_residue_table(path, rcol, vcol)
+    if table is None:
+        return None
+    means = window_means(*table, windows)
+    if np.isnan(means).all():
+        return None
+    return model_name(path, prefix_split), means
+
+def window_column(metric: str, window: Window, single: bool) -> str:
+    if single:
+        return metric
+    start, end = window
+    return f"{metric}_{'' if start is None else start}-{'' if end is None else end}"
+
+def compute_local_windows(files, metric: str, rcol: int, vcol: int, windows: Sequence[Window],
+                          prefix_split: Optional[str] = None, workers: int = 1) -> pd.DataFrame:
+    """Wide table Model, <metric>[_start-end]... with per-model means over all windows."""
+    func = partial(process_file, rcol=rcol, vcol=vcol, windows=windows, prefix_split=prefix_split)
+    names: List[str] = []
+    values: List[np.ndarray] = []
+    for result in parallel_map(func, files, workers=workers):
+        if result is not None:
+            names.append(result[0])
+            values.append(result[1])
+    columns = [window_column(metric, window, len(windows) == 1) for window in windows]
+    data = np.vstack(values) if values else np.empty((0, len(windows)))
+    out = pd.DataFrame(data, columns=columns)
+    out.insert(0, "Model", names)
+    return out.groupby("Model", as_index=False).mean()
+
+def parse_window(text: str) -> Window:
+    start, _, end = text.partition("-")
+    return (int(start) if start else None, int(end) if end else None)
+
+def main(metric: str, description: str, default_res_col: int, default_val_col: int):
+    ap = argparse.ArgumentParser(description=description)
+    ap.add_argument("--root", required=True, help="Folder with per-residue tables")
+    ap.add_argument("--out", required=True, help="Output CSV")
+    ap.add_argument("--start", type=int, default=None, help="Start residue (inclusive)")
+    ap.add_argument("--end", type=int, default=None, help="End residue (inclusive)")
+    ap.add_argument("--windows", nargs="+", type=parse_window, default=None,
+                    help="Residue windows START-END (e.g. 23-34 297-316); one output column per window")
+    ap.add_argument("--res-col", type=int, default=default_res_col, help=f"1-based residue column (default {default_res_col})")
+    ap.add_argument("--val-col", type=int, default=default_val_col, help=f"1-based value column (default {default_val_col})")
+    ap.add_argument("--glob", default="*.*", help="Glob pattern (default '*.*')")
+    ap.add_argument("--prefix-split", default=None, help="Split filename on this char; use prefix as Model")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Reader processes (1 = serial)")
+    args = ap.parse_args()
+
+    if args.windows:
+        windows = args.windows
+    elif args.start is not None and args.end is not None:
+        windows = [(args.start, args.end)]
+    else:
+        windows = [(None, None)]
+
+    files = iter_files(args.root, (args.glob,))
+    out = compute_local_windows(files, metric, args.res_col - 1, args.val_col - 1, windows,
+                                prefix_split=args.prefix_split, workers=args.workers)
+    out.to_csv(args.out, index=False)
+    print(f"Wrote {args.out} with {len(out)} rows.")
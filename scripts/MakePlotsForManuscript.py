@@ -1,10 +1,12 @@
 
-from process_two_state_score import get_v1_ref_df, get_v2_ref_df, get_best_fit, get_best_fit_single_state, create_stacked_bar, create_scatter, frange
+from scoring_core import get_v1_ref_df, get_v2_ref_df, get_best_fit, get_best_fit_single_state, frange
+from process_two_state_score import create_stacked_bar, create_scatter
+from result_cache import get_combined_df
+from stage_profiler import stage, is_enabled, get_records, reset_records, write_profile_report
 
 def Figure1_C():
     # Creates figure 1C - Single state plot for T1214 Composite_Score_4
-    v1_df = get_v1_ref_df('T1214', 'Composite_Score_4')
-    combined_df = get_best_fit_single_state('T1214', v1_df, 'Composite_Score_4')
+    combined_df = get_combined_df('T1214', 'Composite_Score_4', mode='single')
     combined_df = combined_df.sort_values(by='Combined_Score', ascending=False)
     
     # Create stacked bar plots
@@ -22,9 +24,7 @@ def Figure1_C():
 
 def Figure2_B_C():
     # Creates figure 2B and C - Two state plots for M1228 TMscore
-    v1_df = get_v1_ref_df('M1228', 'TMscore')
-    v2_df = get_v2_ref_df('M1228', 'TMscore')
-    combined_df = get_best_fit('M1228', v1_df, v2_df, 'TMscore')
+    combined_df = get_combined_df('M1228', 'TMscore')
     combined_df = combined_df.sort_values(by='Combined_Score', ascending=False)
     
     # Create stacked bar plots
@@ -62,9 +62,7 @@ def Figure2_B_C():
 
 def Figure4_C():
     # Creates figure 4C - Two state plots for T1228 GDT_TS
-    v1_df = get_v1_ref_df('T1228', 'GDT_TS')
-    v2_df = get_v2_ref_df('T1228', 'GDT_TS')
-    combined_df = get_best_fit('T1228', v1_df, v2_df, 'GDT_TS')
+    combined_df = get_combined_df('T1228', 'GDT_TS')
     combined_df['Combined_Score'] = combined_df['Combined_Score'] * 100
     combined_df['Best_v1_ref'] = combined_df['Best_v1_ref'] * 100
     combined_df['Best_v2_ref'] = combined_df['Best_v2_ref'] * 100
@@ -111,9 +109,7 @@ def Figure5_C():
     # Creates figure 5C - Two state scatter plots for M1239 TMscore and T1239 GDT_TS
     
     # M1239 TMscore
-    v1_df = get_v1_ref_df('M1239', 'TMscore')
-    v2_df = get_v2_ref_df('M1239', 'TMscore')
-    combined_df = get_best_fit('M1239', v1_df, v2_df, 'TMscore')
+    combined_df = get_combined_df('M1239', 'TMscore')
     combined_df = combined_df.sort_values(by='Combined_Score', ascending=False)
    
     scatter_kwargs = {
@@ -132,9 +128,7 @@ def Figure5_C():
     create_scatter(**scatter_kwargs)
 
     # T1239 GDT_TS
-    v1_df = get_v1_ref_df('T1239', 'GDT_TS')
-    v2_df = get_v2_ref_df('T1239', 'GDT_TS')
-    combined_df = get_best_fit('T1239', v1_df, v2_df, 'GDT_TS')
+    combined_df = get_combined_df('T1239', 'GDT_TS')
     combined_df['Combined_Score'] = combined_df['Combined_Score'] * 100
     combined_df['Best_v1_ref'] = combined_df['Best_v1_ref'] * 100
     combined_df['Best_v2_ref'] = combined_df['Best_v2_ref'] * 100
@@ -160,9 +154,7 @@ def Figure5_C():
 
 def Figure6_B_C():
     # Creates figure 6B and C - Two state plots for T1249 AvgDockQ
-    v1_df = get_v1_ref_df('T1249', 'AvgDockQ')
-    v2_df = get_v2_ref_df('T1249', 'AvgDockQ')
-    combined_df = get_best_fit('T1249', v1_df, v2_df, 'AvgDockQ')
+    combined_df = get_combined_df('T1249', 'AvgDockQ')
     combined_df = combined_df.sort_values(by='Combined_Score', ascending=False)
     
     # Create stacked bar plots
@@ -193,9 +185,7 @@ def Figure6_B_C():
 
 def Figure7_C_D():
     # Creates figure 7C and D - Two state plots for R1203 Composite_Score_4
-    v1_df = get_v1_ref_df('R1203', 'Composite_Score_4')
-    v2_df = get_v2_ref_df('R1203', 'Composite_Score_4')
-    combined_df = get_best_fit('R1203', v1_df, v2_df, 'Composite_Score_4')
+    combined_df = get_combined_df('R1203', 'Composite_Score_4')
     combined_df = combined_df.sort_values(by='Combined_Score', ascending=False)
     
     # Create stacked bar plots
@@ -228,9 +218,7 @@ def FigS3():
     # Creates figure S3 - M1228 GDT_TS and GlobDockQ
     
     # M1228 GDT_TS
-    v1_df = get_v1_ref_df('M1228', 'GDT_TS')
-    v2_df = get_v2_ref_df('M1228', 'GDT_TS')
-    combined_df = get_best_fit('M1228', v1_df, v2_df, 'GDT_TS')
+    combined_df = get_combined_df('M1228', 'GDT_TS')
     combined_df['Combined_Score'] = combined_df['Combined_Score'] * 100
     combined_df['Best_v1_ref'] = combined_df['Best_v1_ref'] * 100
     combined_df['Best_v2_ref'] = combined_df['Best_v2_ref'] * 100
@@ -265,9 +253,7 @@ def FigS3():
     create_scatter(**scatter_kwargs)
     
     # M1228 GlobDockQ
-    v1_df = get_v1_ref_df('M1228', 'GlobDockQ')
-    v2_df = get_v2_ref_df('M1228', 'GlobDockQ')
-    combined_df = get_best_fit('M1228', v1_df, v2_df, 'GlobDockQ')
+    combined_df = get_combined_df('M1228', 'GlobDockQ')
     combined_df = combined_df.sort_values(by='Combined_Score', ascending=False)
 
     # Create stacked bar plot
@@ -300,9 +286,7 @@ def FigS5():
     # Creates figure S5 - M1239 GDT_TS and GlobDockQ
     
     # M1239 GDT_TS
-    v1_df = get_v1_ref_df('M1239', 'GDT_TS')
-    v2_df = get_v2_ref_df('M1239', 'GDT_TS')
-    combined_df = get_best_fit('M1239', v1_df, v2_df, 'GDT_TS')
+    combined_df = get_combined_df('M1239', 'GDT_TS')
     combined_df['Combined_Score'] = combined_df['Combined_Score'] * 100
     combined_df['Best_v1_ref'] = combined_df['Best_v1_ref'] * 100
     combined_df['Best_v2_ref'] = combined_df['Best_v2_ref'] * 100
@@ -333,9 +317,7 @@ def FigS5():
     create_scatter(**scatter_kwargs)
     
     # M1239 GlobDockQ
-    v1_df = get_v1_ref_df('M1239', 'GlobDockQ')
-    v2_df = get_v2_ref_df('M1239', 'GlobDockQ')
-    combined_df = get_best_fit('M1239', v1_df, v2_df, 'GlobDockQ')
+    combined_df = get_combined_df('M1239', 'GlobDockQ')
     combined_df = combined_df.sort_values(by='Combined_Score', ascending=False)
     
     # Create stacked bar plot
@@ -367,9 +349,7 @@ def FigS6():
     # Create Figure S6 - M1228 and M1239 TMscore
     
     # M1228 TMscore
-    v1_df = get_v1_ref_df('M1228', 'TMscore')
-    v2_df = get_v2_ref_df('M1228', 'TMscore')
-    combined_df = get_best_fit('M1228', v1_df, v2_df, 'TMscore')
+    combined_df = get_combined_df('M1228', 'TMscore')
     combined_df = combined_df.sort_values(by='Combined_Score', ascending=False)
     
     # Create stacked bar plot
@@ -397,9 +377,7 @@ def FigS6():
     create_scatter(**scatter_kwargs)
 
     # M1239 TMscore
-    v1_df = get_v1_ref_df('M1239', 'TMscore')
-    v2_df = get_v2_ref_df('M1239', 'TMscore')
-    combined_df = get_best_fit('M1239', v1_df, v2_df, 'TMscore')
+    combined_df = get_combined_df('M1239', 'TMscore')
     combined_df = combined_df.sort_values(by='Combined_Score', ascending=False)
     
     # Create stacked bar plot
@@ -427,9 +405,7 @@ def FigS7():
     # Creates figure S7 - T1228 and T1239 GDT_TS
     
     # T1228 GDT_TS
-    v1_df = get_v1_ref_df('T1228', 'GDT_TS')
-    v2_df = get_v2_ref_df('T1228', 'GDT_TS')
-    combined_df = get_best_fit('T1228', v1_df, v2_df, 'GDT_TS')
+    combined_df = get_combined_df('T1228', 'GDT_TS')
     combined_df = combined_df.sort_values(by='Combined_Score', ascending=False)
     combined_df['Best_v1_ref'] = combined_df['Best_v1_ref'] * 100
     combined_df['Best_v2_ref'] = combined_df['Best_v2_ref'] * 100
@@ -455,9 +431,7 @@ def FigS7():
     create_scatter(**scatter_kwargs)
 
     # T1239 GDT_TS
-    v1_df = get_v1_ref_df('T1239', 'GDT_TS')
-    v2_df = get_v2_ref_df('T1239', 'GDT_TS')
-    combined_df = get_best_fit('T1239', v1_df, v2_df, 'GDT_TS')
+    combined_df = get_combined_df('T1239', 'GDT_TS')
     combined_df = combined_df.sort_values(by='Combined_Score', ascending=False)
     combined_df['Best_v1_ref'] = combined_df['Best_v1_ref'] * 100
     combined_df['Best_v2_ref'] = combined_df['Best_v2_ref'] * 100
@@ -490,17 +464,14 @@ def FigS11():
     assessment_TM_GDT(TARGET_SCORE_DICT_TM_GDT, save_path="./output/PLOTS_MANUSCRIPT/FigS11.png")
 
 def make_plots_for_manuscript():
-    Figure1_C()
-    Figure2_B_C()
-    Figure4_C()
-    Figure5_C()
-    Figure6_B_C()
-    Figure7_C_D()
-    FigS3()
-    FigS5()
-    FigS6()
-    FigS7()
-    FigS11()
+    reset_records()
+    for figure in [Figure1_C, Figure2_B_C, Figure4_C, Figure5_C, Figure6_B_C, Figure7_C_D,
+                   FigS3, FigS5, FigS6, FigS7, FigS11]:
+        with stage(figure.__name__):
+            figure()
+    # Set CASP_PROFILE=1 to see where the run spends its time
+    if is_enabled():
+        write_profile_report(get_records(), 'MakePlotsForManuscript')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,217 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+
+# Benchmark suite for the scoring core on synthetic data (see synthetic_data.py).
+#
+# For every group count and data style the suite writes a synthetic v1/v2 score set and
+# times each stage: loading the CSVs, get_best_fit, get_best_fit_single_state,
+# get_best_fit_dual_state and the scatter / stacked bar plots. Each stage is timed
+# (best of --repeats runs) and then run once more under tracemalloc for its peak Python
+# memory. The plot stages draw one bar and label per group and are skipped above
+# STAGE_MAX_GROUPS (override with --max-groups STAGE=N). Every run is appended to
+# ./output/BENCHMARKS/benchmark_history.json together with the git commit and library
+# versions, and compared against the previous run.
+#
+# Usage:
+#     python scripts/benchmark_scoring.py
+#     python scripts/benchmark_scoring.py --groups 100 1000 --stages get_best_fit --repeats 5
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import matplotlib
+
+from synthetic_data import STYLES, generate_score_tables
+
+BENCHMARK_DIR = './output/BENCHMARKS'
+HISTORY_PATH = f'{BENCHMARK_DIR}/benchmark_history.json'
+SCORE = 'GDT_TS'
+# get_best_fit selects its tie-breaking path by target ID
+STYLE_IDS = {'two_state': 'S0001', 'one_group_only': 'T1214'}
+STAGES = ['load', 'get_best_fit', 'get_best_fit_single_state', 'get_best_fit_dual_state',
+          'create_scatter', 'create_stacked_bar']
+DEFAULT_GROUPS = [100, 1000, 10000, 100000]
+STAGE_MAX_GROUPS = {
+    'create_scatter': 300,
+    'create_stacked_bar': 300,
+}
+
+
+def load_reference_frames(ID, data_dir):
+    """Read the synthetic v1/v2 tables the way get_v1_ref_df/get_v2_ref_df read the real ones"""
+    from score_store import read_score_table
+    from scoring_core import prepare_reference_df
+
+    return [prepare_reference_df(ID, read_score_table(ID, version, SCORE, data_dir=data_dir,
+                                                      store_dir=os.path.join(data_dir, 'STORE')), version)
+            for version in ['v1', 'v2']]
+
+
+def get_stage_runner(stage, ID, data_dir, frames, combined_df):
+    """Return a no-argument function that runs one stage on prepared inputs"""
+    import process_two_state_score as scoring
+
+    v1_df, v2_df = frames
+    plot_dir = os.path.join(data_dir, 'PLOTS')
+    os.makedirs(plot_dir, exist_ok=True)
+    runners = {
+        'load': lambda: load_reference_frames(ID, data_dir),
+        'get_best_fit': lambda: scoring.get_best_fit(ID, v1_df, v2_df, SCORE),
+        'get_best_fit_single_state': lambda: scoring.get_best_fit_single_state(ID, v1_df, SCORE),
+        'get_best_fit_dual_state': lambda: scoring.get_best_fit_dual_state(ID, v1_df, v2_df, SCORE),
+        'create_scatter': lambda: scoring.create_scatter(
+            combined_df['Best_v1_ref'], combined_df['Best_v2_ref'], combined_df['Group'],
+            'V1', 'V2', ID, save_path=os.path.join(plot_dir, f'{ID}_scatter.png')),
+        'create_stacked_bar': lambda: scoring.create_stacked_bar(
+            combined_df, ID, SCORE, save_path=os.path.join(plot_dir, f'{ID}_stacked_bar.png')),
+    }
+    return runners[stage]
+
+
+def time_stage(run, repeats):
+    seconds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+def peak_memory_mb(run):
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(group_counts=DEFAULT_GROUPS, styles=STYLES, stages=STAGES, repeats=3,
+                   max_groups=STAGE_MAX_GROUPS, work_dir=f'{BENCHMARK_DIR}/data', seed=0):
+    """Return one result dict per (style, groups, stage)"""
+    results = []
+    for style in styles:
+        ID = STYLE_IDS[style]
+        for num_groups in group_counts:
+            data_dir = os.path.join(work_dir, f'{style}_{num_groups}')
+            generate_score_tables(data_dir, ID, [SCORE], num_groups=num_groups, style=style, seed=seed)
+            frames = load_reference_frames(ID, data_dir)
+            combined_df = None
+            for stage in stages:
+                if num_groups > max_groups.get(stage, float('inf')):
+                    results.append({'style': style, 'groups': num_groups, 'stage': stage,
+                                    'seconds': None, 'peak_mb': None, 'skipped': True})
+                    print(f"  {style:15s} {num_groups:>7d} {stage:28s} skipped (> {max_groups[stage]} groups)")
+                    continue
+                if stage.startswith('create_') and combined_df is None:
+                    import process_two_state_score as scoring
+                    combined_df = scoring.get_best_fit(ID, *frames, SCORE)
+                run = get_stage_runner(stage, ID, data_dir, frames, combined_df)
+                seconds = time_stage(run, repeats)
+                peak_mb = peak_memory_mb(run)
+                results.append({'style': style, 'groups': num_groups, 'stage': stage,
+                                'seconds': seconds, 'peak_mb': peak_mb, 'skipped': False})
+                print(f"  {style:15s} {num_groups:>7d} {stage:28s} {seconds:9.4f}s {peak_mb:9.1f} MB")
+    return results
+
+
+def get_git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path=HISTORY_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_runs(previous, results):
+    """Print the speed ratio of every stage that was also measured in the previous run"""
+    previous_seconds = {(r['style'], r['groups'], r['stage']): r['seconds']
+                        for r in previous['results'] if not r['skipped']}
+    print(f"Compared with run of {previous['timestamp']} (commit {previous['commit']}):")
+    for result in results:
+        before = previous_seconds.get((result['style'], result['groups'], result['stage']))
+        if result['skipped'] or not before:
+            continue
+        ratio = result['seconds'] / before
+        label = 'slower' if ratio > 1.1 else ('faster' if ratio < 0.9 else 'same')
+        print(f"  {result['style']:15s} {result['groups']:>7d} {result['stage']:28s} "
+              f"{before:9.4f}s -> {result['seconds']:9.4f}s  x{ratio:.2f} {label}")
+
+
+def record_run(results, config, path=HISTORY_PATH):
+    """Append the run to the JSON history and compare it with the previous one"""
+    history = load_history(path)
+    run = {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': get_git_commit(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'cpu_count': os.cpu_count(),
+        'config': config,
+        'results': results,
+    }
+    if history:
+        compare_runs(history[-1], results)
+    history.append(run)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(history, f, indent=2)
+    print(f"Appended run to {path}")
+    return run
+
+
+def parse_max_groups(values):
+    max_groups = dict(STAGE_MAX_GROUPS)
+    for value in values or []:
+        stage, limit = value.split('=')
+        max_groups[stage] = int(limit)
+    return max_groups
+
+
+if __name__ == "__main__":
+    matplotlib.use('Agg')
+    parser = argparse.ArgumentParser(description='Benchmark the scoring core on synthetic data')
+    parser.add_argument('--groups', type=int, nargs='+', default=DEFAULT_GROUPS, help='Group counts to benchmark')
+    parser.add_argument('--styles', nargs='+', choices=STYLES, default=STYLES)
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--repeats', type=int, default=3, help='Timed runs per stage (the best is kept)')
+    parser.add_argument('--max-groups', nargs='*', metavar='STAGE=N',
+                        help='Skip STAGE above N groups (defaults: %s)' % STAGE_MAX_GROUPS)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    config = {'groups': args.groups, 'styles': args.styles, 'stages': args.stages, 'repeats': args.repeats,
+              'max_groups': parse_max_groups(args.max_groups), 'seed': args.seed}
+    results = run_benchmarks(args.groups, args.styles, args.stages, args.repeats, config['max_groups'],
+                             seed=args.seed)
+    record_run(results, config)
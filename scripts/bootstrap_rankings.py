@@ -0,0 +1,226 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+# Bootstrap confidence intervals for the two-state rankings.
+#
+# The models of every group are resampled with replacement and Combined_Score is
+# recomputed for each replicate with the same rules as get_best_fit. The models of one
+# target/metric are taken from its score tensor (score_tensor.py) as a dense group x
+# model x reference array; models are resampled within their model version (v1/v2
+# predictions), so every replicate keeps the number of v1 and v2 models of a group.
+# Replicates are computed in batches of CHUNK_SIZE with NumPy gathers and the model axis
+# reductions of score_tensor.py, and the target/metric pairs run on a process pool.
+#
+# For every group the output gives the point rank, the rank and Combined_Score
+# intervals and the fraction of replicates in which the group beats the AF3 baseline
+# group 304. Ranks are 1 + the number of groups with a higher Combined_Score.
+#
+# Usage:
+#     python scripts/bootstrap_rankings.py --replicates 2000 --workers 4
+#     -> ./output/BOOTSTRAP/{ID}_{score}_two_state_bootstrap.csv
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from result_cache import get_combined_df
+from score_tensor import ONE_GROUP_ONLY, best_over_models, build_score_tensor, combine_pairing_scores, \
+    get_distinct_model_scores
+
+BOOTSTRAP_DIR = './output/BOOTSTRAP'
+BASELINE_GROUP = 'TS304'
+NUM_REPLICATES = 2000
+CONFIDENCE = 0.95
+# Replicates per batch; a batch holds CHUNK_SIZE x groups x models x 2 scores
+CHUNK_SIZE = 250
+
+
+def get_model_scores(tensor, groups):
+    """
+    The models of the given groups from a score tensor, packed per group:
+        scores    groups x models x 2 (score against the v1 and v2 reference), NaN if missing
+        order     groups x models x 2, tie-break position of every model's score (lowest wins)
+        stratum   groups x models, 0 for v1 models, 1 for v2 models, -1 for padding
+        offsets, counts  groups x 2, first slot and number of models of every stratum
+    """
+    one_group_only = tensor['ID'] in ONE_GROUP_ONLY
+    rows = pd.Index(tensor['groups']).get_indexer(groups)
+    values, order = np.asarray(tensor['values'][rows], dtype=float), np.asarray(tensor['order'][rows])
+    model_versions = np.array(tensor['model_versions'])
+    if one_group_only:
+        # R1203/T1214 label every model by the reference file it was scored in, so a model
+        # is identified by its number alone
+        version = np.where(np.isnan(values), -np.inf, values).argmax(axis=2)[:, :, None, :]
+        values = np.take_along_axis(values, version, axis=2)
+        order = np.take_along_axis(order, version, axis=2)
+        model_versions = np.array([''])
+    num_groups, num_numbers, num_versions = values.shape[:3]
+    values = values.reshape(num_groups, num_numbers * num_versions, 2)
+    order = order.reshape(num_groups, num_numbers * num_versions, 2)
+
+    # Every (model number, model version) cell is a model; without version labels all
+    # models form one stratum that counts as both v1 and v2 models
+    both_versions = (model_versions == '').all()
+    cell_stratum = np.zeros(len(model_versions), dtype=int) if both_versions else \
+        np.select([model_versions == 'v1', model_versions == 'v2'], [0, 1], -1)
+    cell_stratum = np.tile(cell_stratum, num_numbers)
+    present = ~np.isnan(values).all(axis=2) & (cell_stratum >= 0)
+
+    # Pack the models of every group into the first slots, v1 models before v2 models
+    num_cells = len(cell_stratum)
+    cells = np.argsort(np.where(present, cell_stratum * num_cells + np.arange(num_cells), 2 * num_cells + 1),
+                       axis=1, kind='stable')
+    num_models = max(int(present.sum(axis=1).max(initial=0)), 1)
+    cells = cells[:, :num_models]
+    valid = np.take_along_axis(present, cells, axis=1)
+    scores = np.where(valid[..., None], np.take_along_axis(values, cells[..., None], axis=1), np.nan)
+    stratum = np.where(valid, cell_stratum[cells], -1)
+    counts = np.stack([(stratum == s).sum(axis=1) for s in (0, 1)], axis=1)
+    offsets = np.stack([np.zeros(num_groups, dtype=int), counts[:, 0]], axis=1)
+    return {'scores': scores, 'order': np.take_along_axis(order, cells[..., None], axis=1), 'stratum': stratum,
+            'offsets': offsets, 'counts': counts, 'one_group_only': one_group_only, 'both_versions': both_versions}
+
+
+def sample_slots(model_scores, num_replicates, rng):
+    """Draw replicates x groups x models slot indices, resampling within every stratum"""
+    stratum = model_scores['stratum']
+    num_groups = stratum.shape[0]
+    slot_stratum = np.maximum(stratum, 0)
+    rows = np.arange(num_groups)[:, None]
+    offsets = model_scores['offsets'][rows, slot_stratum]
+    counts = model_scores['counts'][rows, slot_stratum]
+    draws = rng.random((num_replicates,) + stratum.shape)
+    return offsets + (draws * counts).astype(int)
+
+
+def get_replicate_scores(model_scores, slots):
+    """Combined_Score of every group for every replicate (replicates x groups)"""
+    stratum = model_scores['stratum']
+    num_replicates, num_groups, num_models = slots.shape
+    rows = np.arange(num_groups)[:, None]
+    # Every (replicate, group) pair is one row of the score tensor reductions
+    sampled = model_scores['scores'][rows, slots].reshape(-1, num_models, 2)
+    member = np.broadcast_to(stratum >= 0, slots.shape).reshape(-1, num_models)
+
+    if model_scores['one_group_only']:
+        # A model drawn twice is still the same model, so models are told apart by slot
+        order = model_scores['order'][rows, slots].reshape(-1, num_models, 2)
+        combined = get_distinct_model_scores(sampled, member, order, slots.reshape(-1, num_models))
+        return combined.reshape(num_replicates, num_groups)
+
+    is_v1 = np.broadcast_to((stratum == 0) | model_scores['both_versions'], slots.shape).reshape(-1, num_models)
+    is_v2 = np.broadcast_to((stratum == 1) | model_scores['both_versions'], slots.shape).reshape(-1, num_models)
+    best = {
+        'v1_v1': best_over_models(sampled[..., 0], member & is_v1),
+        'v2_v2': best_over_models(sampled[..., 1], member & is_v2),
+        'v1_v2': best_over_models(sampled[..., 0], member & is_v2),
+        'v2_v1': best_over_models(sampled[..., 1], member & is_v1),
+    }
+    return combine_pairing_scores(best).reshape(num_replicates, num_groups)
+
+
+def get_ranks(scores):
+    """1 + the number of groups with a higher score, along the last axis"""
+    return 1 + (scores[..., None, :] > scores[..., :, None]).sum(axis=-1)
+
+
+def bootstrap_target(ID, score, num_replicates=NUM_REPLICATES, seed=None, confidence=CONFIDENCE):
+    """Bootstrap the two-state ranking of one target/metric and return one row per group"""
+    combined_df = get_combined_df(ID, score)
+    if combined_df.empty:
+        return pd.DataFrame()
+    groups = combined_df['Group'].to_numpy()
+    # float64 so the replicates use exactly the scores of get_best_fit
+    model_scores = get_model_scores(build_score_tensor(ID, score, dtype=np.float64), groups)
+    rng = np.random.default_rng(seed)
+    baseline = np.flatnonzero(groups == BASELINE_GROUP)
+
+    replicate_scores, replicate_ranks = [], []
+    for start in range(0, num_replicates, CHUNK_SIZE):
+        slots = sample_slots(model_scores, min(CHUNK_SIZE, num_replicates - start), rng)
+        chunk_scores = get_replicate_scores(model_scores, slots)
+        replicate_scores.append(chunk_scores)
+        replicate_ranks.append(get_ranks(chunk_scores))
+    replicate_scores = np.concatenate(replicate_scores)
+    replicate_ranks = np.concatenate(replicate_ranks)
+
+    alpha = (1 - confidence) / 2 * 100
+    point_scores = combined_df['Combined_Score'].to_numpy(dtype=float)
+    results_df = pd.DataFrame({
+        'Group': groups,
+        'Group_Name': combined_df['Group_Name'].to_numpy(),
+        'Combined_Score': point_scores,
+        'Rank': get_ranks(point_scores),
+        'Rank_Median': np.median(replicate_ranks, axis=0),
+        'Rank_Low': np.percentile(replicate_ranks, alpha, axis=0, method='lower'),
+        'Rank_High': np.percentile(replicate_ranks, 100 - alpha, axis=0, method='higher'),
+        'Combined_Score_Low': np.percentile(replicate_scores, alpha, axis=0),
+        'Combined_Score_High': np.percentile(replicate_scores, 100 - alpha, axis=0),
+        # Strictly higher Combined_Score than group 304 in the same replicate
+        'P_Beats_304': (replicate_scores > replicate_scores[:, baseline]).mean(axis=0) if len(baseline) else np.nan,
+    })
+    if len(baseline):
+        results_df.loc[baseline, 'P_Beats_304'] = np.nan
+    results_df.insert(0, 'ID', ID)
+    results_df.insert(1, 'Score', score)
+    return results_df.sort_values(['Rank', 'Group'], kind='stable').reset_index(drop=True)
+
+
+def run_bootstrap_job(ID, score, num_replicates, seed, confidence, output_dir):
+    results_df = bootstrap_target(ID, score, num_replicates, seed, confidence)
+    if results_df.empty:
+        return None
+    os.makedirs(output_dir, exist_ok=True)
+    out_path = f'{output_dir}/{ID}_{score}_two_state_bootstrap.csv'
+    results_df.to_csv(out_path, index=False)
+    return out_path
+
+
+def run_bootstrap(target_score_dict, num_replicates=NUM_REPLICATES, seed=0, confidence=CONFIDENCE,
+                  workers=None, output_dir=BOOTSTRAP_DIR):
+    """Bootstrap every target/metric of target_score_dict; the results do not depend on workers or on the other targets"""
+    jobs = [(ID, score) for ID, scores in target_score_dict.items() for score in scores]
+    # One independent stream per target/metric, so a job's result does not depend on the other jobs
+    args = [(ID, score, num_replicates, np.random.SeedSequence(seed, spawn_key=tuple(f'{ID}|{score}'.encode())),
+             confidence, output_dir) for ID, score in jobs]
+    if workers == 1:
+        out_paths = [run_bootstrap_job(*job_args) for job_args in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            out_paths = list(executor.map(run_bootstrap_job, *zip(*args)))
+    for out_path in out_paths:
+        if out_path is not None:
+            print(f"Wrote {out_path}")
+    return [out_path for out_path in out_paths if out_path is not None]
+
+
+if __name__ == "__main__":
+    from process_two_state_score import TARGET_SCORE_DICT
+
+    parser = argparse.ArgumentParser(description='Bootstrap confidence intervals for the two-state rankings')
+    parser.add_argument('--replicates', type=int, default=NUM_REPLICATES)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--confidence', type=float, default=CONFIDENCE)
+    parser.add_argument('--targets', nargs='+', default=None, help='Targets to bootstrap (default: all)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes (1 runs the targets sequentially)')
+    args = parser.parse_args()
+    target_score_dict = {ID: scores for ID, scores in TARGET_SCORE_DICT.items()
+                         if args.targets is None or ID in args.targets}
+    run_bootstrap(target_score_dict, args.replicates, args.seed, args.confidence, args.workers)
@@ -0,0 +1,351 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+
+# Incremental driver for the Complete Workflow in the README.
+#
+# Every output is a node of a dependency graph: one node per (script, ID, score) for the
+# per-target scripts, one per manuscript figure, and one per LaTeX table script. A node
+# lists the files it reads (score CSVs, the group-name lookup, the CSVs written by
+# upstream nodes and its own source code) and the CSVs and figures it writes. Its
+# signature is the sha256 of the files it reads, stored in ./output/BUILD_STATE.json after
+# a successful run. A node is rebuilt only when its signature changed or one of its
+# declared outputs is missing. Because upstream outputs are hashed by content, a rebuilt
+# CSV that comes out identical does not invalidate the tables and figures that read it.
+# Several scripts rewrite the same file (the two-state CSV is written by process_two_state_score,
+# the full-axis, simple-bar and multi-panel scripts and FigS11). Every one of them declares
+# it as an output and depends on the earlier writers, in the order of the Complete Workflow,
+# and a writer is rebuilt whenever an earlier writer of the same file is, so the last
+# writer always has the final word as in a clean build.
+# Nodes are run level by level, and the stale nodes of a level run in parallel.
+#
+# Usage:
+#     python scripts/build_pipeline.py                # rebuild stale outputs
+#     python scripts/build_pipeline.py --dry-run      # list stale nodes
+#     python scripts/build_pipeline.py --force --workers 4
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from parallel_runner import init_worker
+from result_cache import get_input_paths
+from group_registry import GROUP_LOOKUP_PATH
+from data_manifest import get_score_path
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+CSV_DIR = './output/OUTPUT_CSVS'
+PLOTS_DIR = './output/PLOTS'
+MANUSCRIPT_DIR = './output/PLOTS_MANUSCRIPT'
+GROUP_LOOKUP = GROUP_LOOKUP_PATH
+STATE_FILE = './output/BUILD_STATE.json'
+# Code every assessment depends on, in addition to its own script
+SCORING_CODE = ['scoring_core.py', 'process_two_state_score.py', 'score_store.py', 'result_cache.py', 'group_registry.py',
+                'figure_renderer.py', 'label_placer.py', 'data_manifest.py']
+
+# Per-target scripts, in the order they run: module name, assessment mode and suffix of the CSV they write
+TARGET_SCRIPTS = {
+    'two_state': ('process_two_state_score', 'two', 'two_state'),
+    'full_axis': ('process_two_state_score_full_axis', 'two', 'two_state'),
+    'simple_bar': ('process_two_state_score_simple_bar_plots', 'two', 'two_state'),
+    'single_state': ('process_single_state_score', 'single', 'single_state'),
+    'dual_state': ('process_dual_state_score', 'dual', 'dual_state'),
+}
+
+# Scatter and bar plots each per-target script writes to PLOTS_DIR, as the part after '{ID}_{score}_'
+TARGET_FIGURES = {
+    'two_state': (['scatter_plot'], ['two_state_vertical', 'two_state_horizontal']),
+    'full_axis': (['scatter_plot_full_axis'], []),
+    'simple_bar': ([], ['two_state_horizontal_simple', 'two_state_vertical_simple']),
+    'single_state': ([], ['single_state_vertical', 'single_state_horizontal']),
+    'dual_state': (['scatter_plot_dual_state'], ['two_state_vertical', 'two_state_horizontal']),
+}
+# Bar plot file names use the axis label of these scores
+BAR_SCORE_NAMES = {'Composite_Score_4': 'Σ4'}
+
+# Manuscript figures and the (ID, score, mode) results each one plots
+MANUSCRIPT_FIGURES = {
+    'Figure1_C': [('T1214', 'Composite_Score_4', 'single')],
+    'Figure2_B_C': [('M1228', 'TMscore', 'two')],
+    'Figure4_C': [('T1228', 'GDT_TS', 'two')],
+    'Figure5_C': [('M1239', 'TMscore', 'two'), ('T1239', 'GDT_TS', 'two')],
+    'Figure6_B_C': [('T1249', 'AvgDockQ', 'two')],
+    'Figure7_C_D': [('R1203', 'Composite_Score_4', 'two')],
+    'FigS3': [('M1228', 'GDT_TS', 'two'), ('M1228', 'GlobDockQ', 'two')],
+    'FigS5': [('M1239', 'GDT_TS', 'two'), ('M1239', 'GlobDockQ', 'two')],
+    'FigS6': [('M1228', 'TMscore', 'two'), ('M1239', 'TMscore', 'two')],
+    'FigS7': [('T1228', 'GDT_TS', 'two'), ('T1239', 'GDT_TS', 'two')],
+}
+
+# Files each manuscript figure function writes to MANUSCRIPT_DIR
+MANUSCRIPT_OUTPUTS = {
+    'Figure1_C': ['Figure1_C', 'FigS1'],
+    'Figure2_B_C': ['Figure2_B', 'Figure2_C', 'FigS3_A1', 'FigS3_A2'],
+    'Figure4_C': ['Figure4_C', 'FigS4A1', 'FigS4A2'],
+    'Figure5_C': ['Figure5_C1', 'Figure5_C2'],
+    'Figure6_B_C': ['Figure6_B', 'Figure6_C', 'FigS8A1', 'FigS8A2'],
+    'Figure7_C_D': ['Figure7_C', 'Figure7_D', 'FigS9A1', 'FigS9A2'],
+    'FigS3': ['FigS3_B', 'FigS3_C', 'FigS3_D', 'FigS3_E'],
+    'FigS5': ['FigS5_B', 'FigS5_C', 'FigS5_D', 'FigS5_E'],
+    'FigS6': ['FigS6_A', 'FigS6_B', 'FigS6_C', 'FigS6_D'],
+    'FigS7': ['FigS7_A', 'FigS7_B', 'FigS7_C', 'FigS7_D'],
+    'FigS11': ['FigS11'],
+}
+
+
+def script_path(module):
+    return os.path.join(SCRIPTS_DIR, f'{module}.py')
+
+
+def code_inputs(module):
+    return [script_path(module)] + [os.path.join(SCRIPTS_DIR, fname) for fname in SCORING_CODE]
+
+
+def get_csv_path(ID, score, suffix):
+    return f'{CSV_DIR}/{ID}_{score}_{suffix}.csv'
+
+
+def get_figure_paths(ID, score, kind):
+    scatters, bars = TARGET_FIGURES[kind]
+    bar_score = BAR_SCORE_NAMES.get(score, score)
+    return [f'{PLOTS_DIR}/{ID}_{score}_{figure}.png' for figure in scatters] + \
+        [f'{PLOTS_DIR}/{ID}_{bar_score}_{figure}.png' for figure in bars]
+
+
+def get_manuscript_paths(figure):
+    return [f'{MANUSCRIPT_DIR}/{fname}.png' for fname in MANUSCRIPT_OUTPUTS[figure]]
+
+
+def make_node(name, inputs, outputs=(), deps=(), module=None, func=None, args=(), command=None):
+    return {'name': name, 'inputs': list(inputs), 'outputs': list(outputs), 'deps': list(deps),
+            'module': module, 'func': func, 'args': list(args), 'command': command}
+
+
+def build_graph():
+    """Return every node of the workflow, keyed by name"""
+    nodes = {}
+
+    for kind, (module, mode, suffix) in TARGET_SCRIPTS.items():
+        target_score_dict = importlib.import_module(module).TARGET_SCORE_DICT
+        for ID, scores in target_score_dict.items():
+            for score in scores:
+                outputs = [get_csv_path(ID, score, suffix)] + get_figure_paths(ID, score, kind)
+                # full_axis and simple_bar rewrite the two-state CSV and dual_state its bar plots,
+                # so run them after the earlier writers of those files
+                earlier = [f'{other}:{ID}:{score}' for other in TARGET_SCRIPTS if other != kind]
+                deps = [other for other in earlier if other in nodes and set(outputs) & set(nodes[other]['outputs'])]
+                name = f'{kind}:{ID}:{score}'
+                nodes[name] = make_node(name, get_input_paths(ID, score, mode) + [GROUP_LOOKUP] + code_inputs(module),
+                                        outputs=outputs, deps=deps, module=module, func='assessment', args=[ID, score])
+
+    multipanel = importlib.import_module('process_TM_GDT_two_state_multipanel')
+    inputs, csv_paths, deps = [], [], []
+    for ID, scores in multipanel.TARGET_SCORE_DICT.items():
+        for score in scores:
+            inputs += get_input_paths(ID, score, 'two')
+            csv_paths.append(get_csv_path(ID, score, 'two_state'))
+            deps += [name for name in (f'two_state:{ID}:{score}', f'full_axis:{ID}:{score}',
+                                       f'simple_bar:{ID}:{score}') if name in nodes]
+    # The multi-panel script draws with create_scatter_full_axis
+    inputs += [GROUP_LOOKUP, script_path('process_two_state_score_full_axis')] + code_inputs('process_TM_GDT_two_state_multipanel')
+    nodes['multipanel'] = make_node('multipanel', inputs, outputs=csv_paths + [f'{PLOTS_DIR}/GDT_TM_multi_panel.png'],
+                                    deps=deps, command=[sys.executable, script_path('process_TM_GDT_two_state_multipanel')])
+
+    for figure, results in MANUSCRIPT_FIGURES.items():
+        inputs = []
+        for ID, score, mode in results:
+            inputs += get_input_paths(ID, score, mode)
+        name = f'manuscript:{figure}'
+        nodes[name] = make_node(name, inputs + [GROUP_LOOKUP] + code_inputs('MakePlotsForManuscript'),
+                                outputs=get_manuscript_paths(figure), module='MakePlotsForManuscript', func=figure)
+    # FigS11 re-runs the multipanel assessment, which also rewrites two-state CSVs
+    nodes['manuscript:FigS11'] = make_node('manuscript:FigS11', nodes['multipanel']['inputs'] + [script_path('MakePlotsForManuscript')],
+                                           outputs=csv_paths + get_manuscript_paths('FigS11'), deps=['multipanel'],
+                                           module='MakePlotsForManuscript', func='FigS11')
+
+    # LaTeX tables read every CSV with the matching suffix in CSV_DIR
+    latex_scripts = {
+        'create_latex_tables': ('two_state', [get_score_path('T1214', 'v1', f'Composite_Score_{i}', kind='best') for i in range(1, 5)]),
+        'create_single_state_latex_tables': ('single_state', []),
+        'create_dual_state_latex_tables': ('dual_state', []),
+    }
+    csv_writers = [name for name in nodes if name.split(':')[0] in TARGET_SCRIPTS or name in ('multipanel', 'manuscript:FigS11')]
+    for module, (kind, extra_inputs) in latex_scripts.items():
+        upstream = [name for name in nodes if name.startswith(f'{kind}:')]
+        inputs = [output for name in upstream for output in nodes[name]['outputs'] if output.endswith('.csv')]
+        name = f'latex:{module}'
+        nodes[name] = make_node(name, inputs + extra_inputs + [script_path(module), script_path('latex_tables'), GROUP_LOOKUP],
+                                deps=csv_writers, command=[sys.executable, script_path(module)])
+    return nodes
+
+
+def get_levels(nodes):
+    """Group node names by depth so every node runs after all of its dependencies"""
+    depth = {}
+
+    def visit(name, stack=()):
+        if name in depth:
+            return depth[name]
+        if name in stack:
+            raise ValueError(f"Dependency cycle through {name}")
+        deps = [dep for dep in nodes[name]['deps'] if dep in nodes]
+        depth[name] = 1 + max((visit(dep, stack + (name,)) for dep in deps), default=-1)
+        return depth[name]
+
+    for name in nodes:
+        visit(name)
+    levels = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+    for name in nodes:
+        levels[depth[name]].append(name)
+    return levels
+
+
+def hash_file(path, hashes):
+    if path not in hashes:
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                hashes[path] = hashlib.sha256(f.read()).hexdigest()
+        else:
+            hashes[path] = 'missing'
+    return hashes[path]
+
+
+def get_earlier_writers(nodes, name):
+    """Return the dependencies of a node that write one of its outputs"""
+    outputs = set(nodes[name]['outputs'])
+    return [dep for dep in nodes[name]['deps'] if dep in nodes and outputs & set(nodes[dep]['outputs'])]
+
+
+def get_signature(node, hashes, writer_signatures=()):
+    hasher = hashlib.sha256(json.dumps([node['module'], node['func'], node['args'], node['command']]).encode())
+    for path in sorted(set(node['inputs'])):
+        hasher.update(f'{path}={hash_file(path, hashes)}'.encode())
+    # A node that rewrites the outputs of earlier writers has to run again after they change
+    for dep, signature in sorted(writer_signatures):
+        hasher.update(f'{dep}={signature}'.encode())
+    return hasher.hexdigest()
+
+
+def is_stale(node, signature, state):
+    return state.get(node['name']) != signature or not all(os.path.exists(path) for path in node['outputs'])
+
+
+def load_state(state_file=STATE_FILE):
+    if os.path.exists(state_file):
+        with open(state_file) as f:
+            return json.load(f)
+    return {}
+
+
+def save_state(state, state_file=STATE_FILE):
+    os.makedirs(os.path.dirname(state_file), exist_ok=True)
+    tmp_path = state_file + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, state_file)
+
+
+def run_node(node):
+    """Run one node in the current process and report success or failure with its traceback"""
+    start = time.perf_counter()
+    try:
+        if node['command'] is not None:
+            subprocess.run(node['command'], check=True)
+        else:
+            getattr(importlib.import_module(node['module']), node['func'])(*node['args'])
+        return {'name': node['name'], 'success': True, 'error': None, 'seconds': time.perf_counter() - start}
+    except Exception as e:
+        return {'name': node['name'], 'success': False, 'error': f"{type(e).__name__}: {e}",
+                'traceback': traceback.format_exc(), 'seconds': time.perf_counter() - start}
+
+
+def build(targets=None, force=False, dry_run=False, workers=None, state_file=STATE_FILE):
+    """
+    Rebuild the stale nodes of the workflow. targets restricts the build to nodes whose
+    name starts with one of the given prefixes (e.g. 'two_state:T1214', 'latex:').
+    Returns the result dicts of the nodes that were run.
+    """
+    nodes = build_graph()
+    if targets:
+        nodes = {name: node for name, node in nodes.items() if any(name.startswith(prefix) for prefix in targets)}
+    workers = workers or os.cpu_count() or 1
+    state = load_state(state_file)
+    results, failed, rebuilt, signatures = [], set(), set(), {}
+
+    for level, names in enumerate(get_levels(nodes)):
+        # Hash inputs only now, after the upstream levels have rewritten their outputs
+        hashes = {}
+        writers = {name: get_earlier_writers(nodes, name) for name in names}
+        for name in names:
+            signatures[name] = get_signature(nodes[name], hashes, [(dep, signatures[dep]) for dep in writers[name]])
+        stale = [name for name in names if force or is_stale(nodes[name], signatures[name], state)
+                 or rebuilt.intersection(writers[name])]
+        skipped = [name for name in stale if failed.intersection(nodes[name]['deps'])]
+        stale = [name for name in stale if name not in skipped]
+        failed.update(skipped)
+        for name in skipped:
+            print(f"[ERROR] Skipping {name}: a dependency failed")
+        print(f"Level {level}: {len(stale)} stale, {len(names) - len(stale) - len(skipped)} up to date")
+        if dry_run:
+            for name in stale:
+                print(f"  {name}")
+            continue
+        if not stale:
+            continue
+
+        if workers == 1 or len(stale) == 1:
+            level_results = [run_node(nodes[name]) for name in stale]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(stale)), initializer=init_worker) as executor:
+                level_results = list(executor.map(run_node, [nodes[name] for name in stale]))
+
+        for result in level_results:
+            if result['success']:
+                print(f"[SUCCESS] Built {result['name']} ({result['seconds']:.1f}s)")
+                state[result['name']] = signatures[result['name']]
+                rebuilt.add(result['name'])
+            else:
+                print(f"[ERROR] Error building {result['name']}: {result['error']}")
+                state.pop(result['name'], None)
+                failed.add(result['name'])
+        save_state(state, state_file)
+        results += level_results
+
+    print(f"Built {sum(result['success'] for result in results)}/{len(results)} stale nodes")
+    for result in results:
+        if not result['success']:
+            print(f"[ERROR] {result['name']}:\n{result['traceback']}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Rebuild only the stale CSVs, plots and LaTeX tables')
+    parser.add_argument('targets', nargs='*', help='Only build nodes whose name starts with one of these prefixes')
+    parser.add_argument('--force', action='store_true', help='Rebuild every node')
+    parser.add_argument('--dry-run', action='store_true', help='List stale nodes without building them')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Number of worker processes')
+    args = parser.parse_args()
+
+    results = build(args.targets, force=args.force, dry_run=args.dry_run, workers=args.workers)
+    if not all(result['success'] for result in results):
+        raise SystemExit(1)
@@ -0,0 +1,175 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+# Index of the score files in the data directory.
+#
+# The data directory is listed once and every {ID}_{version}_{score}_scores.csv and
+# {ID}_{version}_{score}_best_scores.csv file is indexed by (target, reference state,
+# metric, kind), with kind 'all' or 'best'. The index is kept in memory and cached in
+# ./output/DATA_MANIFEST/, and is rebuilt when the directory's mtime changes (a file
+# was added, removed or renamed). Loaders resolve their input paths through the index.
+# The V2 reference state of a target is 'v2' unless V2_REFERENCE_OVERRIDES lists the
+# states it may use instead; more than one of them having a file is an error rather
+# than a silent choice.
+#
+# Usage:
+#     python scripts/data_manifest.py
+#     path = find_score_file('T1228', 'v1_1', 'GDT_TS')
+#     version = get_v2_reference_version('T1228', 'GDT_TS')    # 'v1_1'
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+
+DATA_DIR = './data'
+MANIFEST_DIR = './output/DATA_MANIFEST'
+SCORE_FILE_PATTERN = re.compile(r'^(?P<target>[^_]+)_(?P<version>v\d+(?:_\d+)?)_(?P<metric>.+)_scores\.csv$')
+DEFAULT_V2_REFERENCE = 'v2'
+# Targets re-released as v1_1 / v2_1 instead of v2, and the states their second state may use
+V2_REFERENCE_OVERRIDES = {
+    'T1228': ['v1_1', 'v2_1'],
+    'T1239': ['v1_1'],
+}
+KINDS = ['all', 'best']
+RACY_WINDOW_NS = 2 * 10**9
+
+# In-memory manifests by absolute data directory: (directory mtime_ns, index)
+_manifests = {}
+
+
+def parse_score_file(fname):
+    """Return (target, version, metric, kind) for a score file name, or None"""
+    match = SCORE_FILE_PATTERN.match(fname)
+    if match is None:
+        return None
+    metric, kind = match.group('metric'), 'all'
+    # *_best_scores.csv files hold one row per group and use a different layout
+    if metric.endswith('_best'):
+        metric, kind = metric[:-len('_best')], 'best'
+    return match.group('target'), match.group('version'), metric, kind
+
+
+def scan_data_dir(data_dir=DATA_DIR):
+    """List data_dir once and return one entry per score file, sorted by file name"""
+    entries = []
+    for fname in sorted(os.listdir(data_dir)):
+        key = parse_score_file(fname)
+        if key is not None:
+            target, version, metric, kind = key
+            entries.append({'target': target, 'version': version, 'metric': metric, 'kind': kind,
+                            'file': fname})
+    return entries
+
+
+def get_manifest_path(data_dir, manifest_dir=MANIFEST_DIR):
+    digest = hashlib.sha256(os.path.abspath(data_dir).encode()).hexdigest()[:16]
+    return os.path.join(manifest_dir, f'{digest}.json')
+
+
+def read_manifest(manifest_path, data_dir, mtime_ns):
+    """Return the cached entries of data_dir, or None if the cache is missing or stale"""
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if manifest.get('data_dir') != os.path.abspath(data_dir) or manifest.get('mtime_ns') != mtime_ns:
+        return None
+    return manifest['files']
+
+
+def write_manifest(manifest_path, data_dir, mtime_ns, entries):
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    # Write to a temporary file first so parallel workers never read a partial manifest
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(manifest_path), suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump({'data_dir': os.path.abspath(data_dir), 'mtime_ns': mtime_ns, 'files': entries}, f, indent=1)
+    os.replace(tmp_path, manifest_path)
+
+
+def get_manifest(data_dir=DATA_DIR, manifest_dir=MANIFEST_DIR):
+    """Return {(target, version, metric, kind): path} for data_dir, scanning it only when it changed"""
+    if not os.path.isdir(data_dir):
+        return {}
+    abs_dir = os.path.abspath(data_dir)
+    mtime_ns = os.stat(data_dir).st_mtime_ns
+    cached = _manifests.get(abs_dir)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    manifest_path = get_manifest_path(data_dir, manifest_dir)
+    entries = read_manifest(manifest_path, data_dir, mtime_ns)
+    # A directory changed within the mtime granularity may change again without a new
+    # mtime, so it is scanned on every call until it has been quiet for RACY_WINDOW_NS
+    racy = time.time_ns() - mtime_ns < RACY_WINDOW_NS
+    if entries is None:
+        entries = scan_data_dir(data_dir)
+        if not racy:
+            try:
+                write_manifest(manifest_path, data_dir, mtime_ns, entries)
+            except OSError:
+                pass  # A read-only output directory only costs the rescan next time
+    index = {(e['target'], e['version'], e['metric'], e['kind']): os.path.join(data_dir, e['file'])
+             for e in entries}
+    if not racy:
+        _manifests[abs_dir] = (mtime_ns, index)
+    return index
+
+
+def find_score_file(ID, version, score, kind='all', data_dir=DATA_DIR):
+    """Path of the {ID}_{version}_{score}[_best]_scores.csv file, or None if there is none"""
+    return get_manifest(data_dir).get((ID, version, score, kind))
+
+
+def get_score_path(ID, version, score, kind='all', data_dir=DATA_DIR):
+    """Like find_score_file, but files missing from the manifest keep their conventional name"""
+    suffix = '_best_scores.csv' if kind == 'best' else '_scores.csv'
+    return find_score_file(ID, version, score, kind, data_dir) or f'{data_dir}/{ID}_{version}_{score}{suffix}'
+
+
+def list_score_files(kind='all', data_dir=DATA_DIR):
+    """Return (ID, version, score, path) for every score file of the given kind, sorted by file name"""
+    return sorted(((ID, version, score, path) for (ID, version, score, file_kind), path in get_manifest(data_dir).items()
+                   if file_kind == kind), key=lambda entry: os.path.basename(entry[3]))
+
+
+def get_reference_versions(ID, score, kind='all', data_dir=DATA_DIR):
+    """Reference states with a score file for ID and score"""
+    return sorted(version for (target, version, metric, file_kind) in get_manifest(data_dir)
+                  if (target, metric, file_kind) == (ID, score, kind))
+
+
+def get_v2_reference_version(ID, score, data_dir=DATA_DIR):
+    """The second reference state of ID: 'v2', or the one of its V2_REFERENCE_OVERRIDES states with a score file"""
+    candidates = V2_REFERENCE_OVERRIDES.get(ID, [DEFAULT_V2_REFERENCE])
+    versions = get_reference_versions(ID, score, data_dir=data_dir)
+    found = [version for version in candidates if version in versions]
+    if len(found) > 1:
+        raise ValueError(f"{ID} {score} has score files for several V2 reference states {found}; "
+                         "remove all but one or update V2_REFERENCE_OVERRIDES")
+    # With nothing to read the loader reports the missing file
+    return found[0] if found else candidates[0]
+
+
+if __name__ == "__main__":
+    index = get_manifest()
+    print(f"Indexed {len(index)} score files in {DATA_DIR}")
+    for ID in sorted({target for target, _, _, _ in index}):
+        metrics = sorted({metric for target, _, metric, _ in index if target == ID})
+        print(f"{ID}: {', '.join(metrics)} (V2 reference {get_v2_reference_version(ID, metrics[0])})")
@@ -0,0 +1,193 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+
+# Golden-output equivalence harness for the scoring engines.
+#
+# Runs the reference loop implementation (reference_scoring.py) and a candidate engine
+# (by default the current scoring_core functions) side by side on every
+# target/score of TARGET_SCORE_DICT in ./data and on synthetic inputs of both layouts,
+# for the two-state, single-state and dual-state functions. The frames must be exactly
+# equal: same columns, order, dtypes and values (assert_frame_equal with check_exact).
+# Differences are reported per column with the first differing rows, and the run prints
+# the time of each engine per mode so speedups and behaviour changes show up together.
+# Cases where the reference loop itself raises (R1203/T1214 single/dual-state when the
+# first group has no positive v1 score) are reported and skipped. Exits with status 1 if
+# any case differs.
+#
+# Usage:
+#     python scripts/equivalence_harness.py
+#     python scripts/equivalence_harness.py --candidate my_engine --synthetic-groups 100 2000
+
+import argparse
+import importlib
+import time
+
+import numpy as np
+import pandas as pd
+
+MODES = {
+    'two': 'get_best_fit',
+    'single': 'get_best_fit_single_state',
+    'dual': 'get_best_fit_dual_state',
+}
+SYNTHETIC_GROUPS = [50, 500]
+SYNTHETIC_SEEDS = [0, 1]
+# (style, ID) of the synthetic cases; R1203 and T1214 take the distinct-model path
+SYNTHETIC_LAYOUTS = [('two_state', 'S0001'), ('two_state', 'R1203'), ('one_group_only', 'T1214')]
+# make_score_frames settings: mixed model versions, then only v1 or only v2 models with
+# integer scores (many ties and zeros) and many NaNs
+SYNTHETIC_VARIANTS = {
+    'mixed': {'decimals': 2},
+    'all_v1': {'version_mix': 1.0, 'decimals': 0, 'nan_rate': 0.3},
+    'all_v2': {'version_mix': 0.0, 'decimals': 0, 'nan_rate': 0.3},
+}
+# Small cases run once per layout: one model per group, so a table can be empty after dropna
+SYNTHETIC_EDGE_CASES = {
+    'few_models': {'num_groups': 5, 'models_per_group': 1, 'version_mix': 1.0, 'nan_rate': 0.3, 'decimals': 2,
+                   'missing_group_rate': 0.2, 'seed': 0},
+}
+MAX_REPORTED_ROWS = 5
+
+
+def get_engine(module_name):
+    """Return {mode: function} for a module exposing the three get_best_fit functions"""
+    module = importlib.import_module(module_name)
+    return {mode: getattr(module, func) for mode, func in MODES.items()}
+
+
+def get_data_cases(target_score_dict=None):
+    """Yield (case name, ID, score, v1_df, v2_df) for every target/score with data in ./data"""
+    from process_two_state_score import TARGET_SCORE_DICT
+    from scoring_core import get_v1_ref_df, get_v2_ref_df
+
+    for ID, scores in (target_score_dict or TARGET_SCORE_DICT).items():
+        for score in scores:
+            yield f'data:{ID}:{score}', ID, score, get_v1_ref_df(ID, score), get_v2_ref_df(ID, score)
+
+
+def get_synthetic_cases(group_counts=SYNTHETIC_GROUPS, seeds=SYNTHETIC_SEEDS):
+    """Yield synthetic cases of every layout and variant, with ties, NaNs and missing groups"""
+    from synthetic_data import make_score_frames
+    from scoring_core import prepare_reference_df
+
+    for style, ID in SYNTHETIC_LAYOUTS:
+        settings = [(f'{variant}:{num_groups}:{seed}', dict(kwargs, num_groups=num_groups, seed=seed))
+                    for variant, kwargs in SYNTHETIC_VARIANTS.items() for num_groups in group_counts for seed in seeds]
+        for name, kwargs in settings + list(SYNTHETIC_EDGE_CASES.items()):
+            v1_df, v2_df = make_score_frames(ID, 'GDT_TS', style=style, **kwargs)
+            # Same preparation as get_v1_ref_df/get_v2_ref_df
+            yield (f'synthetic:{style}:{ID}:{name}', ID, 'GDT_TS',
+                   prepare_reference_df(ID, v1_df, 'v1').reset_index(drop=True),
+                   prepare_reference_df(ID, v2_df, 'v2').reset_index(drop=True))
+
+
+def run_engine(func, mode, ID, score, v1_df, v2_df):
+    """Run one engine function on copies of the inputs and return (frame, seconds)"""
+    args = (ID, v1_df.copy(), score) if mode == 'single' else (ID, v1_df.copy(), v2_df.copy(), score)
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def diff_frames(expected, actual):
+    """Return a list of human-readable differences between two result frames (empty if equal)"""
+    if list(expected.columns) != list(actual.columns):
+        return [f"columns differ: expected {list(expected.columns)}, got {list(actual.columns)}"]
+    if len(expected) != len(actual):
+        return [f"row count differs: expected {len(expected)}, got {len(actual)}"]
+    differences = []
+    for col in expected.columns:
+        if expected[col].dtype != actual[col].dtype:
+            differences.append(f"{col}: dtype {expected[col].dtype} != {actual[col].dtype}")
+        left = expected[col].reset_index(drop=True)
+        right = actual[col].reset_index(drop=True)
+        both_missing = left.isna().to_numpy() & right.isna().to_numpy()
+        equal = both_missing | (left.astype(object) == right.astype(object)).to_numpy()
+        mismatched = np.flatnonzero(~equal)
+        if len(mismatched):
+            rows = ', '.join(f"row {i}: {left[i]!r} != {right[i]!r}" for i in mismatched[:MAX_REPORTED_ROWS])
+            differences.append(f"{col}: {len(mismatched)} values differ ({rows})")
+    if not differences:
+        try:
+            pd.testing.assert_frame_equal(expected, actual, check_exact=True)
+        except AssertionError as e:
+            differences.append(str(e).strip())
+    return differences
+
+
+def run_harness(candidate='scoring_core', reference='reference_scoring', modes=tuple(MODES),
+                data=True, synthetic_groups=SYNTHETIC_GROUPS):
+    """Compare candidate with reference on every case; returns the list of failing case names"""
+    engines = {'reference': get_engine(reference), 'candidate': get_engine(candidate)}
+    cases = []
+    if data:
+        cases += list(get_data_cases())
+    if synthetic_groups:
+        cases += list(get_synthetic_cases(synthetic_groups))
+
+    failures, skipped = [], []
+    timings = {(mode, engine): 0.0 for mode in modes for engine in engines}
+    for name, ID, score, v1_df, v2_df in cases:
+        for mode in modes:
+            try:
+                expected, seconds = run_engine(engines['reference'][mode], mode, ID, score, v1_df, v2_df)
+            except Exception as e:
+                skipped.append(f'{name}:{mode}')
+                print(f"[WARNING] Skipping {name} {mode}: the reference raises {type(e).__name__}: {e}")
+                continue
+            timings[(mode, 'reference')] += seconds
+            try:
+                actual, seconds = run_engine(engines['candidate'][mode], mode, ID, score, v1_df, v2_df)
+            except Exception as e:
+                failures.append(f'{name}:{mode}')
+                print(f"[ERROR] {name} {mode}: the candidate raises {type(e).__name__}: {e}")
+                continue
+            timings[(mode, 'candidate')] += seconds
+            differences = diff_frames(expected, actual)
+            if differences:
+                failures.append(f'{name}:{mode}')
+                print(f"[ERROR] {name} {mode}:")
+                for difference in differences:
+                    print(f"    {difference}")
+
+    print(f"Compared {candidate} with {reference} on {len(cases)} cases x {len(modes)} modes "
+          f"({len(skipped)} skipped)")
+    for mode in modes:
+        reference_seconds = timings[(mode, 'reference')]
+        candidate_seconds = timings[(mode, 'candidate')]
+        speedup = reference_seconds / candidate_seconds if candidate_seconds else float('inf')
+        print(f"  {MODES[mode]:28s} reference {reference_seconds:8.3f}s  candidate {candidate_seconds:8.3f}s  x{speedup:.1f}")
+    if failures:
+        print(f"[ERROR] {len(failures)} cases differ")
+    else:
+        print("[SUCCESS] All outputs are identical")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Check a scoring engine against the reference implementation')
+    parser.add_argument('--candidate', default='scoring_core',
+                        help='Module exposing get_best_fit, get_best_fit_single_state and get_best_fit_dual_state')
+    parser.add_argument('--reference', default='reference_scoring')
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+    parser.add_argument('--no-data', action='store_true', help='Skip the ./data targets')
+    parser.add_argument('--synthetic-groups', type=int, nargs='*', default=SYNTHETIC_GROUPS,
+                        help='Group counts of the synthetic cases (none to skip them)')
+    args = parser.parse_args()
+    failures = run_harness(args.candidate, args.reference, args.modes, not args.no_data, args.synthetic_groups)
+    if failures:
+        raise SystemExit(1)
@@ -0,0 +1,180 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+
+# Figure templates and timing for the plotting functions.
+#
+# get_figure(layout, figsize) returns a Figure from a per-process pool with one template
+# per layout ('scatter', 'bar_horizontal', 'bar_vertical', ...). The template is cleared
+# and resized instead of being rebuilt, is drawn on an Agg canvas directly (no pyplot
+# figure manager), and is saved with save_figure. Plotting functions time each figure
+# with record_timing; get_timings returns the timings of this process and
+# write_timing_report writes them to a CSV.
+#
+# The render mode (set_render_mode, the CASP_RENDER_MODE environment variable or the
+# --render-mode option of the assessment scripts) controls how save_figure writes:
+#     standard  savefig at the requested dpi (default)
+#     draft     savefig at DRAFT_DPI without bbox_inches='tight', for quick layout checks
+#     final     the figure is drawn at the requested dpi in this thread and the RGBA
+#               buffer is PNG-encoded and written by a background thread pool while the
+#               next figure is built; wait_for_saves blocks until every file is written.
+#               The files are byte-identical to the standard mode.
+
+import atexit
+import csv
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from stage_profiler import stage
+
+TIMING_REPORT = './output/figure_timings.csv'
+RENDER_MODES = ['standard', 'draft', 'final']
+DRAFT_DPI = 72
+SAVE_THREADS = 2
+# Rendered buffers waiting to be encoded; at 300 dpi each one is ~20 MB
+MAX_PENDING_SAVES = 4
+
+_templates = {}
+_timings = []
+_pending_saves = []
+_save_executor = None
+
+
+def reset_subplot_params(fig):
+    import matplotlib
+    # tight_layout stores its margins in subplotpars; start every plot from the rc defaults
+    fig.subplotpars.update(**{name: matplotlib.rcParams[f'figure.subplot.{name}']
+                              for name in ['left', 'right', 'bottom', 'top', 'wspace', 'hspace']})
+
+
+def get_figure(layout, figsize):
+    """Return (fig, ax) for layout, reusing that layout's template figure when there is one"""
+    # matplotlib is only imported once a figure is requested, so importing this module is cheap
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = _templates.get(layout)
+    if fig is None:
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        _templates[layout] = fig
+    else:
+        fig.clear()
+        reset_subplot_params(fig)
+        fig.set_size_inches(figsize)
+    return fig, fig.add_subplot()
+
+
+def is_template(fig):
+    return any(fig is template for template in _templates.values())
+
+
+def release_figure(fig):
+    """Drop the artists of a finished template figure so they do not stay in memory"""
+    if is_template(fig):
+        fig.clear()
+
+
+def record_timing(name, start):
+    """Record the wall time since start (time.perf_counter()) spent building and saving name"""
+    _timings.append({'figure': name, 'seconds': time.perf_counter() - start, 'pid': os.getpid()})
+
+
+def get_render_mode():
+    mode = os.environ.get('CASP_RENDER_MODE', 'standard')
+    if mode not in RENDER_MODES:
+        raise ValueError(f"Unknown render mode {mode}, expected one of {RENDER_MODES}")
+    return mode
+
+
+def set_render_mode(mode):
+    """Set the render mode for this process and the worker processes it starts"""
+    if mode not in RENDER_MODES:
+        raise ValueError(f"Unknown render mode {mode}, expected one of {RENDER_MODES}")
+    os.environ['CASP_RENDER_MODE'] = mode
+
+
+def render_rgba(fig, dpi, **kwargs):
+    """Draw fig as savefig would (including bbox_inches) and return a copy of the RGBA buffer"""
+    frames = []
+    cid = fig.canvas.mpl_connect('draw_event', lambda event: frames.append(np.array(event.renderer.buffer_rgba())))
+    try:
+        fig.savefig(io.BytesIO(), format='rgba', dpi=dpi, **kwargs)
+    finally:
+        fig.canvas.mpl_disconnect(cid)
+    return frames[-1]
+
+
+def write_png(path, rgba, dpi):
+    import matplotlib.image
+    # Same call as FigureCanvasAgg.print_png, so the file matches savefig(path)
+    matplotlib.image.imsave(path, rgba, format='png', origin='upper', dpi=dpi)
+
+
+def wait_for_saves():
+    """Block until every queued PNG is written; re-raises the first failed write"""
+    pending = list(_pending_saves)
+    _pending_saves.clear()
+    for future in pending:
+        future.result()
+
+
+def submit_save(path, rgba, dpi):
+    global _save_executor
+    if _save_executor is None:
+        _save_executor = ThreadPoolExecutor(max_workers=SAVE_THREADS)
+        atexit.register(wait_for_saves)
+    while len(_pending_saves) >= MAX_PENDING_SAVES:
+        _pending_saves.pop(0).result()
+    _pending_saves.append(_save_executor.submit(write_png, path, rgba, dpi))
+
+
+def save_figure(fig, path, dpi=300, **kwargs):
+    """Save fig to path according to the render mode, then release it if it is a template"""
+    mode = get_render_mode()
+    with stage('savefig'):
+        if mode == 'draft':
+            kwargs.pop('bbox_inches', None)
+            fig.savefig(path, dpi=min(dpi, DRAFT_DPI), **kwargs)
+        elif mode == 'final' and str(path).endswith('.png') and not kwargs.keys() - {'bbox_inches'}:
+            submit_save(path, render_rgba(fig, dpi, **kwargs), dpi)
+        else:
+            fig.savefig(path, dpi=dpi, **kwargs)
+    release_figure(fig)
+
+
+def get_timings():
+    return list(_timings)
+
+
+def reset_timings():
+    _timings.clear()
+
+
+def write_timing_report(timings, path=TIMING_REPORT):
+    """Write one row per figure, slowest first, and print the total"""
+    timings = sorted(timings, key=lambda timing: timing['seconds'], reverse=True)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['figure', 'seconds', 'pid'])
+        writer.writeheader()
+        writer.writerows(timings)
+    total = sum(timing['seconds'] for timing in timings)
+    print(f"Rendered {len(timings)} figures in {total:.1f}s of figure time, report in {path}")
@@ -0,0 +1,59 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+
+# Process-wide registry of CASP group numbers and names.
+#
+# The group-name CSV is parsed once per process and shared by every caller. The helpers
+# work on whole Series so plotting and table code can convert every group label at once
+# instead of parsing "TS314" -> "314" row by row.
+
+import csv
+from functools import lru_cache
+
+import pandas as pd
+
+GROUP_LOOKUP_PATH = './data/group_number_name_correspondance.csv'
+
+
+@lru_cache(maxsize=None)
+def load_group_lookup(path=GROUP_LOOKUP_PATH):
+    """Return {zero-padded group number: group name}; the dict is shared, do not modify it"""
+    lookup = {}
+    with open(path, newline='') as csvfile:
+        reader = csv.DictReader(csvfile)
+        for row in reader:
+            lookup[row['Group Number'].zfill(3)] = row['Group Name']
+    return lookup
+
+
+def normalize_group_numbers(groups):
+    """Convert group labels (e.g. TS314, 'TS014', 304) to zero-padded numbers ('314', '014', '304')"""
+    if not isinstance(groups, pd.Series):
+        groups = pd.Series(list(groups), dtype=object)
+    digits = groups.astype(str).str.replace(r'\D', '', regex=True)
+    return digits.astype(int).astype(str).str.zfill(3)
+
+
+def get_group_names(groups, default='Unknown'):
+    """
+    Map group labels to their stripped group names. default is used for groups missing from
+    the lookup and may be a scalar or a Series aligned with groups.
+    """
+    if not isinstance(groups, pd.Series):
+        groups = pd.Series(list(groups), dtype=object)
+    names = normalize_group_numbers(groups).map(load_group_lookup())
+    return names.where(names.notna(), default).astype(str).str.strip()
@@ -0,0 +1,160 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+
+# Grid-based label placement for the scatter plots, used by create_scatter with
+# label_placer='grid' as a fast alternative to adjust_text.
+#
+# Every label is measured once in display coordinates. Labels are then placed one at a
+# time: candidate positions are tried in rings of increasing distance around the label's
+# point (8 directions per ring), and the first candidate that stays inside the axes and
+# does not overlap a placed label, a scatter point or an obstacle (e.g. the inset axes)
+# is kept. Overlap checks go through a uniform grid of display-space cells, so placing n
+# labels costs O(n) grid lookups instead of adjust_text's iterative all-pairs repulsion.
+# Labels that end up away from their point get a leader arrow.
+#
+# Usage:
+#     from label_placer import place_labels
+#     place_labels(texts, ax, x, y, arrowprops=dict(arrowstyle='->', color='red', lw=0.5))
+
+import math
+
+import numpy as np
+
+# Values accepted by create_scatter(label_placer=...)
+LABEL_PLACERS = ['adjust_text', 'grid']
+
+# Unit directions tried in every ring, nearest-looking positions first
+DIRECTIONS = [(1, 1), (1, -1), (-1, 1), (-1, -1), (1, 0), (-1, 0), (0, 1), (0, -1)]
+
+
+def get_cells(box, cell_size):
+    """Grid cells (i, j) covered by the display-space box (x0, y0, x1, y1)"""
+    x0, y0, x1, y1 = box
+    return [(i, j) for i in range(int(x0 // cell_size), int(x1 // cell_size) + 1)
+            for j in range(int(y0 // cell_size), int(y1 // cell_size) + 1)]
+
+
+def add_box(grid, box, cell_size):
+    for cell in get_cells(box, cell_size):
+        grid.setdefault(cell, []).append(box)
+
+
+def overlap_area(grid, box, cell_size):
+    """Total area of box covered by the boxes stored in grid"""
+    seen = set()
+    area = 0.0
+    for cell in get_cells(box, cell_size):
+        for other in grid.get(cell, ()):
+            if id(other) in seen:
+                continue
+            seen.add(id(other))
+            w = min(box[2], other[2]) - max(box[0], other[0])
+            h = min(box[3], other[3]) - max(box[1], other[1])
+            if w > 0 and h > 0:
+                area += w * h
+    return area
+
+
+def get_point_radius(ax, scatter_size=None):
+    """Radius in display pixels of the markers drawn by ax.scatter(..., s=scatter_size)"""
+    if scatter_size is None:
+        import matplotlib as mpl
+        scatter_size = mpl.rcParams['lines.markersize'] ** 2
+    return math.sqrt(scatter_size) / 2 * ax.figure.dpi / 72
+
+
+def get_text_sizes(texts, renderer):
+    """Width and height in display pixels of each text when centred on its position"""
+    sizes = []
+    for text in texts:
+        text.set_horizontalalignment('center')
+        text.set_verticalalignment('center')
+        bbox = text.get_window_extent(renderer)
+        sizes.append((bbox.width, bbox.height))
+    return sizes
+
+
+def get_candidates(px, py, width, height, radius, max_rings, pad):
+    """Yield (ring, box) candidates around the point (px, py), closest ring first"""
+    step = height + pad
+    for ring in range(max_rings):
+        gap = radius + pad + ring * step
+        for dx, dy in DIRECTIONS:
+            cx = px + dx * (width / 2 + gap)
+            cy = py + dy * (height / 2 + gap)
+            yield ring, (cx - width / 2, cy - height / 2, cx + width / 2, cy + height / 2)
+
+
+def outside_area(box, bounds):
+    """Area of box that falls outside bounds"""
+    w = min(box[2], bounds[2]) - max(box[0], bounds[0])
+    h = min(box[3], bounds[3]) - max(box[1], bounds[1])
+    inside = max(w, 0) * max(h, 0)
+    return (box[2] - box[0]) * (box[3] - box[1]) - inside
+
+
+def place_labels(texts, ax, x, y, obstacles=None, scatter_size=None, arrowprops=None,
+                 max_rings=6, pad=2.0):
+    """
+    Move texts (one per point, created with ax.text(x, y, label)) to non-overlapping
+    positions around their points. x and y hold every point drawn on ax so labels also
+    avoid unlabelled points; obstacles is a list of artists (e.g. an inset axes) the
+    labels should keep clear of. Returns the final display-space label boxes.
+    """
+    if not texts:
+        return []
+    renderer = ax.figure.canvas.get_renderer()
+    sizes = get_text_sizes(texts, renderer)
+    anchors = ax.transData.transform(np.column_stack([[text.get_position()[0] for text in texts],
+                                                      [text.get_position()[1] for text in texts]]))
+    points = ax.transData.transform(np.column_stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float)]))
+    radius = get_point_radius(ax, scatter_size)
+    ax_bbox = ax.get_window_extent(renderer)
+    bounds = (ax_bbox.x0, ax_bbox.y0, ax_bbox.x1, ax_bbox.y1)
+
+    cell_size = max(max(max(size) for size in sizes), 2 * radius, 1.0)
+    labels, blockers = {}, {}
+    for px, py in points:
+        if bounds[0] <= px <= bounds[2] and bounds[1] <= py <= bounds[3]:
+            add_box(blockers, (px - radius, py - radius, px + radius, py + radius), cell_size)
+    for artist in obstacles or []:
+        bbox = artist.get_window_extent(renderer)
+        add_box(blockers, (bbox.x0, bbox.y0, bbox.x1, bbox.y1), cell_size)
+
+    to_data = ax.transData.inverted()
+    boxes = []
+    for text, (width, height), (px, py) in zip(texts, sizes, anchors):
+        best = None
+        for ring, box in get_candidates(px, py, width, height, radius, max_rings, pad):
+            # Leaving the axes is worse than overlapping a point, which is worse than
+            # overlapping another label by the same area
+            cost = (4 * outside_area(box, bounds) + 2 * overlap_area(blockers, box, cell_size)
+                    + overlap_area(labels, box, cell_size))
+            if best is None or cost < best[0]:
+                best = (cost, ring, box)
+            if cost == 0:
+                break
+        cost, ring, box = best
+        add_box(labels, box, cell_size)
+        boxes.append(box)
+        text.set_position(to_data.transform(((box[0] + box[2]) / 2, (box[1] + box[3]) / 2)))
+        if arrowprops and ring > 0:
+            # Start the leader at the point of the label box closest to the data point
+            edge = (min(max(px, box[0]), box[2]), min(max(py, box[1]), box[3]))
+            ax.annotate('', xy=to_data.transform((px, py)), xytext=to_data.transform(edge),
+                        arrowprops=arrowprops)
+    return boxes
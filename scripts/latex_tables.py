@@ -0,0 +1,321 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+
+# Shared LaTeX table writer for create_latex_tables.py, create_dual_state_latex_tables.py
+# and create_single_state_latex_tables.py.
+#
+# A table spec (TWO_STATE, DUAL_STATE, SINGLE_STATE) lists the CSV columns, the header
+# labels and which CSVs in ./output/OUTPUT_CSVS it applies to. Cells are formatted one
+# column at a time (number formatting, N/A substitution and underscore escaping), rows are
+# joined with Series.str.cat and the table is assembled with a single join. Tables with
+# more than LONGTABLE_ROWS rows switch to longtable. The CSVs are converted on a process
+# pool with --workers.
+#
+# Usage (from the create_*_latex_tables scripts):
+#     write_latex_tables(TWO_STATE, workers=parse_latex_args().workers)
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from group_registry import get_group_names
+from data_manifest import get_score_path
+
+OUTPUT_DIR = './output/OUTPUT_CSVS'
+LONGTABLE_ROWS = 63
+NA_SUPERSCRIPT = 'N/A$^{1}$'
+NA_FOOTNOTE = "\\begin{flushleft}\\footnotesize $^{1}$ Model either not submitted or not assessed\\end{flushleft}\n"
+TEXT_COLUMNS = ['Group', 'Group_Name', 'V1_Model_For_Combined_Score', 'V2_Model_For_Combined_Score']
+NA_COLUMNS = ['V1_Model_For_Combined_Score', 'V2_Model_For_Combined_Score']
+
+TWO_STATE = {
+    'latex_dir': './output/LATEX_TABLES',
+    'file_tag': None,
+    'score_delimiter': '_two',
+    'caption_replace': 'Two-State Score',
+    'columns': ['Group', 'Group_Name', 'Combined_Score', 'Best_v1_ref', 'Best_v2_ref',
+                'V1_Model_For_Combined_Score', 'V2_Model_For_Combined_Score'],
+    'labels': ['Group', 'Group\\_Name', 'Two-State\\_Score', 'V1\\_{score}', 'V2\\_{score}', 'V1\\_Model', 'V2\\_Model'],
+    'align': 'llrrrll',
+}
+DUAL_STATE = {
+    'latex_dir': './output/DUAL_STATE_LATEX_TABLES',
+    'file_tag': 'dual_state',
+    'score_delimiter': '_dual',
+    'caption_replace': 'Dual-State Score',
+    'columns': ['Group', 'Group_Name', 'Combined_Score', 'Best_v1_ref', 'Best_v2_ref',
+                'V1_Model_For_Combined_Score'],
+    'labels': ['Group', 'Group\\_Name', 'Dual-State\\_Score', 'V1\\_{score}', 'V2\\_{score}', 'V1\\_Model'],
+    'align': 'llrrrl',
+}
+SINGLE_STATE = {
+    'latex_dir': './output/SINGLE_STATE_LATEX_TABLES',
+    'file_tag': 'single_state',
+    'score_delimiter': '_single',
+    'caption_replace': 'Single-State',
+    'columns': ['Group', 'Group_Name', 'Best_v1_ref', 'V1_Model_For_Combined_Score'],
+    'labels': ['Group', 'Group\\_Name', 'V1\\_{score}', 'V1\\_Model'],
+    'align': 'llrl',
+}
+
+
+def escape_underscores(values):
+    """Escape underscores in the string cells of values; other cells are converted with str"""
+    values = pd.Series(values, dtype=object)
+    if values.empty:
+        return values
+    escaped = values.str.replace('_', r'\_', regex=False) if values.map(type).eq(str).any() else values.map(str)
+    return escaped.where(escaped.notna(), values.map(str))
+
+
+def format_numbers(values):
+    """Format every cell that parses as a float with two decimals; other cells are kept as str"""
+    values = pd.Series(values, dtype=object)
+    numbers = pd.to_numeric(values, errors='coerce')
+    text = values.map(str)
+    unparsed = numbers.isna() & ~text.str.strip().str.lower().isin(['nan', '+nan', '-nan'])
+    formatted = pd.Series(np.char.mod('%.2f', numbers.to_numpy(dtype=float)), index=values.index, dtype=object)
+    return formatted.where(~unparsed, text)
+
+
+def is_missing(values):
+    """Cells shown as missing: NaN, 0.0 or strings containing 'None'"""
+    values = pd.Series(values, dtype=object)
+    contains_none = values.str.contains('None', regex=False) if values.map(type).eq(str).any() else False
+    return values.isna() | values.eq(0.0) | (pd.Series(contains_none, index=values.index) == True)
+
+
+def format_column(values, col):
+    """Return the LaTeX cell text of one column and whether an N/A footnote is needed"""
+    values = pd.Series(values, dtype=object).reset_index(drop=True)
+    missing = is_missing(values)
+    if col in TEXT_COLUMNS:
+        cells = escape_underscores(values)
+    else:
+        cells = format_numbers(values)
+    if col in NA_COLUMNS:
+        cells = cells.where(~missing, NA_SUPERSCRIPT)
+        return cells, bool(missing.any())
+    return cells.where(~missing, values.map(str)), False
+
+
+def format_body(df, columns):
+    """Return the table rows of df as one string and whether an N/A footnote is needed"""
+    cells, needs_footnote = [], False
+    for col in columns:
+        column_cells, column_na = format_column(df[col], col)
+        cells.append(column_cells)
+        needs_footnote = needs_footnote or column_na
+    if df.empty:
+        return "", needs_footnote
+    rows = cells[0].str.cat(cells[1:], sep=' & ')
+    return ''.join(rows + " \\\\ \n"), needs_footnote
+
+
+def get_header_row(spec, score_name):
+    score_label = score_name.replace('_', r'\_')
+    return ' & '.join(label.format(score=score_label) for label in spec['labels']) + " \\\\ \n"
+
+
+def make_long_latex_table(df, spec, caption, label, score_name):
+    if score_name == 'GlobalLDDT':
+        score_name = 'gLDDT'
+    num_columns = len(spec['columns'])
+    header_row = get_header_row(spec, score_name)
+    body, needs_footnote = format_body(df, spec['columns'])
+    parts = [
+        "% In your document body:\n",
+        f"\\begin{{longtable}}{{{'l' * num_columns}}}\n",
+        f"\\caption{{{caption}}}\n",
+        f"\\label{{{label}}} \\\\ \n",
+        "\\toprule\n",
+        header_row,
+        "\\midrule\n",
+        "\\endfirsthead\n",
+        f"\\multicolumn{{{num_columns}}}{{c}}%\n",
+        "{{\\tablename\\ \\thetable{} -- continued from previous page}} \\\\ \n",
+        "\\toprule\n",
+        header_row,
+        "\\midrule\n",
+        "\\endhead\n",
+        "\\bottomrule\n",
+        f"\\multicolumn{{{num_columns}}}{{r}}{{{{Continued on next page}}}} \\\\ \n",
+        "\\endfoot\n",
+        "\\bottomrule\n",
+        "\\endlastfoot\n",
+        body,
+        "\\end{longtable}\n",
+        NA_FOOTNOTE if needs_footnote else "",
+        "\\end{table}\n",
+    ]
+    return ''.join(parts)
+
+
+def make_latex_table(df, spec, caption, label, score_name):
+    if len(df) > LONGTABLE_ROWS:
+        return make_long_latex_table(df, spec, caption, label, score_name)
+
+    body, needs_footnote = format_body(df, spec['columns'])
+    parts = [
+        "% In your preamble:\n",
+        "\\begin{table}[ht]\n",
+        "\\centering\n",
+        f"\\caption{{{caption}}}\n",
+        f"\\label{{{label}}}\n",
+        "\\scriptsize\n",
+        "\\resizebox{\\textwidth}{!}{%\n",
+        f"\\begin{{tabular}}{{{spec['align']}}}\n",
+        "\\toprule\n",
+        get_header_row(spec, score_name),
+        "\\midrule\n",
+        body,
+        "\\bottomrule\n",
+        "\\end{tabular}%\n",
+        "}\n",
+        NA_FOOTNOTE if needs_footnote else "",
+        "\\end{table}\n",
+    ]
+    return ''.join(parts)
+
+
+def get_score_name(fname, spec):
+    base = os.path.basename(fname)
+    try:
+        return base[base.index('_') + 1:base.index(spec['score_delimiter'])]
+    except ValueError:
+        return 'score'
+
+
+def list_table_csvs(spec, output_dir=OUTPUT_DIR):
+    return [fname for fname in os.listdir(output_dir)
+            if fname.endswith('.csv') and (spec['file_tag'] is None or spec['file_tag'] in fname)]
+
+
+def write_table(spec, fname, output_dir=OUTPUT_DIR):
+    """Write the .tex table for one CSV; returns the .tex path or None if the CSV was skipped"""
+    df = pd.read_csv(os.path.join(output_dir, fname))
+    # Only keep the required columns, skip if not all present
+    if not all(col in df.columns for col in spec['columns']):
+        print(f"Skipping {fname}: missing required columns.")
+        return None
+    df = df[spec['columns']].copy()
+    # Scores are rounded to 4 decimals first, then shown with 2 (as the tables always were)
+    for col in ['Combined_Score', 'Best_v1_ref', 'Best_v2_ref']:
+        if col in df.columns:
+            df[col] = np.char.mod('%.4f', df[col].to_numpy(dtype=float))
+    caption = f"Results for {fname.replace('_', ' ').replace('.csv', '')}"
+    caption = caption.replace('two state', spec['caption_replace'])
+    label = f"tab:{fname.replace('.csv','')}"
+    latex_table = make_latex_table(df, spec, caption, label, get_score_name(fname, spec))
+    tex_path = os.path.join(spec['latex_dir'], fname.replace('.csv', '.tex'))
+    with open(tex_path, 'w') as f:
+        f.write(latex_table)
+    return tex_path
+
+
+def write_latex_tables(spec, workers=1, output_dir=OUTPUT_DIR):
+    """Write the tables of every matching CSV in output_dir, on workers processes"""
+    os.makedirs(spec['latex_dir'], exist_ok=True)
+    fnames = list_table_csvs(spec, output_dir)
+    workers = max(1, min(workers or 1, len(fnames)))
+    if workers == 1:
+        tex_paths = [write_table(spec, fname, output_dir) for fname in fnames]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            tex_paths = list(executor.map(write_table, [spec] * len(fnames), fnames, [output_dir] * len(fnames)))
+    for tex_path in tex_paths:
+        if tex_path is not None:
+            print(f"Wrote {tex_path}")
+    return [tex_path for tex_path in tex_paths if tex_path is not None]
+
+
+def make_t1214_sigma_tables(latex_dir, data_dir='./data'):
+    """Create the split T1214 Sigma1-Sigma4 score tables from the T1214 Composite_Score best scores"""
+    header_row = "Group & Group\\_Name & $\\Sigma_{score}$ Score & Model \\\\ \n"
+    os.makedirs(latex_dir, exist_ok=True)
+    for score in '1', '2', '3', '4':
+        print(f"Processing {score}")
+
+        t1214_data = pd.read_csv(get_score_path('T1214', 'v1', f'Composite_Score_{score}', kind='best', data_dir=data_dir))
+        models = t1214_data['Model']
+        # Group names for every row at once (e.g. T1214TS298_4 -> TS298 -> 298 -> name)
+        group_ts = models.str.split('_').str[0].str.split('T1214').str[1]
+        processed_df = pd.DataFrame({
+            'Group': group_ts,  # Keep original TS-prefixed group name
+            'Group_Name': get_group_names(group_ts, default=group_ts).values,
+            f'Sigma{score}_Score': t1214_data[f'Composite_Score_{score}'].round(2),
+            # Final model suffix (e.g. T1214TS298_4 -> 4)
+            'Model_Suffix': np.where(models.str.contains('_', regex=False),
+                                     models.str.split('_').str[-1], models.str[-1]),
+        })
+        processed_df = processed_df.sort_values(f'Sigma{score}_Score', ascending=False)
+
+        rows = (escape_underscores(processed_df['Group'].map(str)).str.cat(
+            [escape_underscores(processed_df['Group_Name'].map(str)),
+             pd.Series(np.char.mod('%.2f', processed_df[f'Sigma{score}_Score'].to_numpy(dtype=float)),
+                       index=processed_df.index, dtype=object),
+             processed_df['Model_Suffix'].map(str)], sep=' & ') + " \\\\ \n").tolist()
+        # Close the first minipage after half of the rows and start the second one
+        half = len(rows) // 2
+        split = (
+            "\\bottomrule\n"
+            "\\end{tabular}\n"
+            "\\end{minipage}\n"
+            "\\hfill\n"
+            "\\begin{minipage}[t]{0.48\\textwidth}\n"
+            "\\centering\n"
+            "\\begin{tabular}{llrr}\n"
+            "\\toprule\n"
+            + header_row +
+            "\\midrule\n"
+        )
+        if half > 0:
+            rows.insert(half, split)
+
+        latex_table = ''.join([
+            f"% T1214 Sigma{score} Score Table\n",
+            "\\begin{table*}[ht]\n",
+            f"\\caption{{T1214 Sigma{score} Score Results}}\n",
+            "\\label{tab:T1214_Sigma_score_split}\n",
+            "\\scriptsize\n",
+            "\\begin{minipage}[t]{0.48\\textwidth}\n",
+            "\\centering\n",
+            "\\begin{tabular}{llrr}\n",
+            "\\toprule\n",
+            header_row,
+            "\\midrule\n",
+            *rows,
+            "\\bottomrule\n",
+            "\\end{tabular}\n",
+            "\\end{minipage}\n",
+            "\\end{table*}\n",
+        ])
+
+        tex_path = os.path.join(latex_dir, f'T1214_Sigma{score}_score_table.tex')
+        with open(tex_path, 'w') as f:
+            f.write(latex_table)
+        print(f"Wrote {tex_path}")
+
+
+def parse_latex_args(description=None):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes (1 writes the tables sequentially)')
+    return parser.parse_args()
@@ -0,0 +1,270 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+
+# k-state scoring: assign the models of every group to k reference states.
+#
+# The two-state engines pair the v1 and V2 reference states with the v1 and v2 model
+# versions. Here the states are any list of reference score files ({ID}_{reference}_{score}
+# _scores.csv) with one model version per state (v1, v2, v3, ... by default). Every group
+# gets a k x k candidate matrix from its score tensor: the best score against reference r
+# of the models submitted as version c. For R1203/T1214, whose states must come from
+# different models, the candidates are the individual models instead.
+#
+# Each group then takes a one-to-one assignment of candidates to states:
+#   greedy   repeatedly takes the best remaining candidate/state score. With k = 2 this is
+#            the get_best_fit rule, including its tie-breaking, so two-state output is a
+#            special case.
+#   optimal  maximises the summed score. All assignments are scored at once for a chunk of
+#            groups (at most EXHAUSTIVE_MAX_CELLS group x assignment totals) while there are
+#            at most EXHAUSTIVE_MAX_ASSIGNMENTS of them, and the Hungarian method (scipy,
+#            optional) is used per group beyond that. Ties go to the greedy assignment, then
+#            state by state to the candidate greedy would prefer.
+#
+# Usage:
+#     python scripts/multi_state_scoring.py --targets T1228 --references v1 v2 --rule optimal
+#     -> ./output/MULTI_STATE_CSVS/{ID}_{score}_{k}_state_{rule}.csv
+
+import argparse
+import itertools
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from group_registry import get_group_names
+from score_tensor import ONE_GROUP_ONLY, best_model_numbers, best_over_models, build_score_tensor, \
+    get_references, get_version_mask
+
+MULTI_STATE_DIR = './output/MULTI_STATE_CSVS'
+ASSIGNMENT_RULES = ['greedy', 'optimal']
+# Above this many assignments per group the optimal rule switches to the Hungarian method
+EXHAUSTIVE_MAX_ASSIGNMENTS = 5040
+# Group x assignment totals held at once by the exhaustive search (~2 MB per state at float64)
+EXHAUSTIVE_MAX_CELLS = 2 ** 18
+
+
+def get_model_versions(num_states):
+    return [f'v{state + 1}' for state in range(num_states)]
+
+
+def get_version_candidates(tensor, model_versions):
+    """
+    k x k candidate matrix of every group: the best score against reference r of the
+    models of version c (0.0 if there is none). Zero scores count as not assessed, and ties
+    go to the same-version pairings first, as in get_best_fit's Best_Source order.
+    """
+    values = np.asarray(tensor['values'], dtype=float)
+    num_groups, num_states = values.shape[0], values.shape[-1]
+    scores = np.zeros((num_groups, num_states, len(model_versions)))
+    models = np.full(scores.shape, -1)
+    for c, version in enumerate(model_versions):
+        member = np.broadcast_to(get_version_mask(tensor, version), values.shape[:3])
+        for r in range(num_states):
+            scores[:, r, c] = best_over_models(values[..., r], member)
+            models[:, r, c] = best_model_numbers(values[..., r], member, tensor['row'][..., r])
+    states, versions = np.meshgrid(np.arange(num_states), np.arange(len(model_versions)), indexing='ij')
+    priority = np.where(states == versions, states, num_states + states * len(model_versions) + versions)
+    return {'scores': scores, 'models': models, 'assessed': scores != 0.0,
+            'priority': np.broadcast_to(priority, scores.shape)}
+
+
+def get_model_candidates(tensor):
+    """
+    states x models candidate matrix of every group for targets whose states must use
+    different models: the best score of every model against every reference (NaN if it has
+    none). Ties go to the later state and then to the earlier position in the sorted table,
+    as in get_best_fit's R1203/T1214 rule.
+    """
+    values = np.asarray(tensor['values'], dtype=float)
+    num_states, num_models = values.shape[-1], values.shape[1]
+    # Best version entry of every model: states index the last axis, models the second
+    scores = np.moveaxis(np.nanmax(np.where(np.isnan(values), -np.inf, values), axis=2), -1, 1)
+    scores = np.where(scores == -np.inf, np.nan, scores)
+    best = np.moveaxis(values, -1, 1) == scores[:, :, :, None]
+    order = np.where(best, np.moveaxis(tensor['order'], -1, 1), np.iinfo(np.int32).max).min(axis=-1)
+    # Pad to at least one candidate per state, so every state can be assigned
+    pad = max(num_states - num_models, 0)
+    scores = np.pad(scores, ((0, 0), (0, 0), (0, pad)), constant_values=np.nan)
+    order = np.pad(order, ((0, 0), (0, 0), (0, pad)), constant_values=np.iinfo(np.int32).max)
+    assessed = ~np.isnan(scores)
+
+    width = int(order[assessed].max(initial=-1)) + scores.shape[2] + 2
+    missing_order = width - 1 - scores.shape[2] + np.arange(scores.shape[2])
+    order = np.where(assessed, order, missing_order)
+    priority = (num_states - 1 - np.arange(num_states))[None, :, None] * width + order
+    models = np.where(assessed, np.arange(scores.shape[2]), -1)
+    return {'scores': np.nan_to_num(scores, nan=0.0), 'models': models, 'assessed': assessed,
+            'priority': priority}
+
+
+def get_state_candidates(tensor, model_versions=None, distinct_models=None):
+    """Candidate matrix of a tensor: model versions, or single models for ONE_GROUP_ONLY targets"""
+    if distinct_models is None:
+        distinct_models = tensor['ID'] in ONE_GROUP_ONLY
+    if distinct_models:
+        return get_model_candidates(tensor)
+    return get_version_candidates(tensor, model_versions or get_model_versions(tensor['values'].shape[-1]))
+
+
+def assign_greedy(candidates):
+    """
+    Assign one candidate per state, best remaining assessed score first (lowest priority on
+    ties); once no assessed pair is left the remaining states take the lowest priority pair.
+    Returns a groups x states array of candidate indices.
+    """
+    scores, assessed, priority = candidates['scores'], candidates['assessed'], candidates['priority']
+    num_groups, num_states, num_candidates = scores.shape
+    groups = np.arange(num_groups)
+    available = np.ones(scores.shape, dtype=bool)
+    assignment = np.full((num_groups, num_states), -1)
+    for _ in range(num_states):
+        masked = np.where(available & assessed, scores, -np.inf)
+        best = masked.max(axis=(1, 2), keepdims=True)
+        tied = np.where((best == -np.inf), available, available & assessed & (masked == best))
+        flat = np.where(tied, priority, np.iinfo(np.int64).max).reshape(num_groups, -1).argmin(axis=1)
+        state, candidate = np.divmod(flat, num_candidates)
+        assignment[groups, state] = candidate
+        available[groups, state, :] = False
+        available[groups, :, candidate] = False
+    return assignment
+
+
+def get_assignment_totals(scores, assignment):
+    """Summed score of assignments (groups x states, or groups x assignments x states)"""
+    states = np.arange(scores.shape[1])
+    if assignment.ndim == 2:
+        return scores[np.arange(scores.shape[0])[:, None], states, assignment].sum(axis=-1)
+    return scores[np.arange(scores.shape[0])[:, None, None], states, assignment].sum(axis=-1)
+
+
+def assign_exhaustive(scores, priority, assignments):
+    """Best of the given assignments for every group, ties broken state by state on priority"""
+    totals = get_assignment_totals(scores, np.broadcast_to(assignments, (scores.shape[0],) + assignments.shape))
+    tied = totals == totals.max(axis=1, keepdims=True, initial=-np.inf)
+    # Among equal totals take the lowest priority candidate of the first state, then the next
+    for state in range(scores.shape[1]):
+        state_priority = np.where(tied, priority[:, state, assignments[:, state]], np.iinfo(np.int64).max)
+        tied &= state_priority == state_priority.min(axis=1, keepdims=True)
+    return assignments[tied.argmax(axis=1)]
+
+
+def assign_optimal(candidates):
+    """Assign one candidate per state maximising the summed score; ties go to the greedy assignment"""
+    scores, priority = candidates['scores'], candidates['priority']
+    num_groups, num_states, num_candidates = scores.shape
+    greedy = assign_greedy(candidates)
+    if math.perm(num_candidates, num_states) <= EXHAUSTIVE_MAX_ASSIGNMENTS:
+        assignments = np.array(list(itertools.permutations(range(num_candidates), num_states)))
+        chunk = max(1, EXHAUSTIVE_MAX_CELLS // len(assignments))
+        optimal = np.concatenate([assign_exhaustive(scores[start:start + chunk], priority[start:start + chunk], assignments)
+                                  for start in range(0, max(num_groups, 1), chunk)])
+    else:
+        try:
+            from scipy.optimize import linear_sum_assignment
+        except ImportError as e:
+            raise ImportError(f"Optimal assignments of more than {EXHAUSTIVE_MAX_ASSIGNMENTS} candidate "
+                              "orders per group require scipy: pip install scipy") from e
+        optimal = np.empty((num_groups, num_states), dtype=int)
+        for g in range(num_groups):
+            states, candidate = linear_sum_assignment(scores[g], maximize=True)
+            optimal[g, states] = candidate
+    keep_greedy = get_assignment_totals(scores, greedy) >= get_assignment_totals(scores, optimal)
+    return np.where(keep_greedy[:, None], greedy, optimal)
+
+
+def assign_states(candidates, rule='greedy'):
+    if rule == 'greedy':
+        return assign_greedy(candidates)
+    if rule == 'optimal':
+        return assign_optimal(candidates)
+    raise ValueError(f"Unknown assignment rule '{rule}', expected one of {ASSIGNMENT_RULES}")
+
+
+def get_multi_state_scores(tensor, rule='greedy', model_versions=None, distinct_models=None):
+    """
+    Assign states for every group of a tensor. Returns the groups x states candidate
+    assignment, the score and model number index (-1 if none) of every state and the
+    Combined_Score of every group.
+    """
+    candidates = get_state_candidates(tensor, model_versions, distinct_models)
+    assignment = assign_states(candidates, rule)
+    rows, states = np.arange(assignment.shape[0])[:, None], np.arange(assignment.shape[1])
+    scores = candidates['scores'][rows, states, assignment]
+    return {
+        'assignment': assignment,
+        'scores': scores,
+        'models': candidates['models'][rows, states, assignment],
+        'Combined_Score': scores.sum(axis=1),
+    }
+
+
+def get_best_fit_multi_state(ID, score, references=None, model_versions=None, rule='greedy'):
+    """
+    Combined_Score table of ID/score over the given reference states, one row per group with
+    a positive Combined_Score. With the default v1/V2 references and the greedy rule the
+    scores and selected models are those of get_best_fit.
+    """
+    references = references or get_references(ID, score)
+    model_versions = model_versions or get_model_versions(len(references))
+    tensor = build_score_tensor(ID, score, dtype=np.float64, references=references)
+    distinct_models = ID in ONE_GROUP_ONLY
+    result = get_multi_state_scores(tensor, rule, model_versions, distinct_models)
+    if len(tensor['groups']) == 0:
+        return pd.DataFrame()
+
+    groups = pd.Series(tensor['groups'], dtype=object)
+    model_numbers = np.array([str(number) for number in tensor['model_numbers']] + ['None'], dtype=object)
+    results_df = pd.DataFrame({
+        'Group': groups,
+        'Group_Name': get_group_names(groups).values,
+        'Combined_Score': result['Combined_Score'],
+    })
+    for state, version in enumerate(model_versions):
+        results_df[f'Best_{version}_ref'] = result['scores'][:, state]
+    for state, version in enumerate(model_versions):
+        # Models are labelled with the version they were submitted as (the state's own for R1203/T1214)
+        labels = np.full(len(groups), version, dtype=object) if distinct_models else \
+            np.array(model_versions, dtype=object)[result['assignment'][:, state]]
+        results_df[f'{version.upper()}_Model_For_Combined_Score'] = \
+            groups + '_' + labels + '_' + model_numbers[result['models'][:, state]]
+    return results_df[results_df['Combined_Score'] > 0].reset_index(drop=True)
+
+
+def run_multi_state(target_score_dict, references=None, rule='greedy', output_dir=MULTI_STATE_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+    for ID, scores in target_score_dict.items():
+        for score in scores:
+            results_df = get_best_fit_multi_state(ID, score, references, rule=rule)
+            num_states = len(references or get_references(ID, score))
+            path = f'{output_dir}/{ID}_{score}_{num_states}_state_{rule}.csv'
+            results_df.to_csv(path, index=False)
+            print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    from process_two_state_score import TARGET_SCORE_DICT
+
+    parser = argparse.ArgumentParser(description='Assign the models of every group to k reference states')
+    parser.add_argument('--references', nargs='+', default=None,
+                        help='Reference states, e.g. v1 v2 v3 (default: v1 and the V2 reference)')
+    parser.add_argument('--rule', choices=ASSIGNMENT_RULES, default='greedy')
+    parser.add_argument('--targets', nargs='+', default=None, help='Targets to score (default: all)')
+    args = parser.parse_args()
+    target_score_dict = {ID: scores for ID, scores in TARGET_SCORE_DICT.items()
+                         if args.targets is None or ID in args.targets}
+    run_multi_state(target_score_dict, args.references, args.rule)
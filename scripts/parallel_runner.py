@@ -0,0 +1,131 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+
+# Runs assessment(ID, score) for every target/score pair of a TARGET_SCORE_DICT on a
+# process pool. Each worker switches matplotlib to the non-interactive Agg backend, and
+# a failing job is reported instead of stopping the remaining ones. The per-figure
+# timings of all jobs are written to ./output/figure_timings.csv, and with --profile
+# (or CASP_PROFILE=1) the stage profile of all jobs to ./output/PROFILE/{script}.*.
+#
+# Usage (from any of the process_*_score scripts):
+#     results = run_assessments(assessment, TARGET_SCORE_DICT, workers=parse_workers())
+
+import argparse
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from figure_renderer import (RENDER_MODES, get_timings, reset_timings, set_render_mode, wait_for_saves,
+                             write_timing_report)
+from stage_profiler import enable_profiling, get_records, is_enabled, reset_records, stage, write_profile_report
+
+
+def init_worker():
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+
+def get_jobs(target_score_dict):
+    return [(ID, score) for ID, scores in target_score_dict.items() for score in scores]
+
+
+def run_job(assessment, ID, score):
+    start = time.perf_counter()
+    reset_timings()
+    reset_records()
+    try:
+        with stage('assessment', target=ID, metric=score):
+            assessment(ID, score)
+            wait_for_saves()
+        return {'ID': ID, 'score': score, 'success': True, 'error': None,
+                'seconds': time.perf_counter() - start, 'figure_timings': get_timings(),
+                'profile': get_records()}
+    except Exception as e:
+        return {'ID': ID, 'score': score, 'success': False, 'error': f"{type(e).__name__}: {e}",
+                'traceback': traceback.format_exc(), 'seconds': time.perf_counter() - start,
+                'figure_timings': get_timings(), 'profile': get_records()}
+
+
+def report_job(result):
+    if result['success']:
+        print(f"[SUCCESS] Processed {result['ID']} {result['score']} ({result['seconds']:.1f}s)")
+    else:
+        print(f"[ERROR] Error processing {result['ID']} {result['score']}: {result['error']}")
+
+
+def run_assessments(assessment, target_score_dict, workers=None):
+    """
+    Run assessment(ID, score) for every pair in target_score_dict and return one result
+    dict per job, in TARGET_SCORE_DICT order. workers=1 runs the jobs in this process;
+    otherwise they are spread over a ProcessPoolExecutor (default: one worker per core).
+    assessment must be a module-level function so it can be sent to the workers.
+    """
+    jobs = get_jobs(target_score_dict)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+
+    results = {}
+    if workers == 1:
+        for ID, score in jobs:
+            results[(ID, score)] = run_job(assessment, ID, score)
+            report_job(results[(ID, score)])
+    else:
+        print(f"Running {len(jobs)} jobs on {workers} workers...")
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+            futures = {executor.submit(run_job, assessment, ID, score): (ID, score) for ID, score in jobs}
+            for future in as_completed(futures):
+                ID, score = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker itself died (e.g. killed), so run_job could not report it
+                    result = {'ID': ID, 'score': score, 'success': False, 'error': f"{type(e).__name__}: {e}",
+                              'traceback': traceback.format_exc(), 'seconds': 0.0, 'figure_timings': [],
+                              'profile': []}
+                results[(ID, score)] = result
+                report_job(result)
+
+    results = [results[job] for job in jobs]
+    failures = [result for result in results if not result['success']]
+    print(f"Finished {len(results) - len(failures)}/{len(results)} jobs")
+    write_timing_report([timing for result in results for timing in result['figure_timings']])
+    if is_enabled():
+        name = os.path.splitext(os.path.basename(sys.argv[0]))[0] or 'assessments'
+        write_profile_report([record for result in results for record in result['profile']], name)
+    for result in failures:
+        print(f"[ERROR] {result['ID']} {result['score']}:\n{result['traceback']}")
+    return results
+
+
+def parse_workers(description=None):
+    """Parse --workers, --render-mode and --profile; the last two are applied before returning workers"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes (1 runs the jobs sequentially)')
+    parser.add_argument('--render-mode', choices=RENDER_MODES, default=None,
+                        help='standard (default), draft (low dpi, no tight bbox) or final (background PNG encoding)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Record per-stage wall/CPU time and peak RSS to ./output/PROFILE')
+    args = parser.parse_args()
+    if args.render_mode is not None:
+        set_render_mode(args.render_mode)
+    if args.profile:
+        enable_profiling()
+    return args.workers
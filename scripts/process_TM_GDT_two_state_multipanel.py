@@ -15,16 +15,15 @@ Date: 2025-09-01
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
-from adjustText import adjust_text  
-from tqdm import tqdm
 import csv
 from os.path import exists
 from process_two_state_score_full_axis import create_scatter_full_axis
-from process_two_state_score import get_v1_ref_df, get_v2_ref_df, frange, get_group_name_lookup, get_best_fit
+from scoring_core import get_v1_ref_df, get_v2_ref_df, frange, get_group_name_lookup, get_best_fit
+from result_cache import get_combined_df
+from stage_profiler import stage, is_enabled, get_records, write_profile_report
 
 
-# get_best_fit function is now imported from process_two_state_score
+# get_best_fit function is now imported from scoring_core
 
 
 TARGET_SCORE_DICT = {"M1228": ["GDT_TS", "TMscore"], 
@@ -41,9 +40,7 @@ def assessment(TARGET_SCORE_DICT, output_dir = "./PLOTS", save_path = None):
     for ID, scores in TARGET_SCORE_DICT.items():
         for score in scores:
             try:
-                v1_df = get_v1_ref_df(ID, score)
-                v2_df = get_v2_ref_df(ID, score)
-                combined_df = get_best_fit(ID, v1_df, v2_df, score)
+                combined_df = get_combined_df(ID, score)
                 # Sort the combined_df by 'Combined_Score' in descending order
                 combined_df = combined_df.sort_values(by='Combined_Score', ascending=False)
                 # Convert GDT_TS scores to percentage
@@ -54,7 +51,8 @@ def assessment(TARGET_SCORE_DICT, output_dir = "./PLOTS", save_path = None):
                         combined_df['Best_v2_ref'] = combined_df['Best_v2_ref'] * 100
 
                 # Save the combined metric to a CSV file
-                combined_df.to_csv(f'./output/OUTPUT_CSVS/{ID}_{score}_two_state.csv', index=False)
+                with stage('csv_write', target=ID, metric=score):
+                    combined_df.to_csv(f'./output/OUTPUT_CSVS/{ID}_{score}_two_state.csv', index=False)
                 TARGET_SCORE_df_dict[ID+'_'+score] = combined_df
                 print(f"[SUCCESS] Processed {ID} {score}")
             except Exception as e:
@@ -119,18 +117,24 @@ def assessment(TARGET_SCORE_DICT, output_dir = "./PLOTS", save_path = None):
         subfix, subax = create_scatter_full_axis(**kwargs)
         # ax = subax
 
-    plt.tight_layout()
+    with stage('tight_layout'):
+        plt.tight_layout()
     
 
-    if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-    else:
-        plt.savefig(f'./output/{output_dir}/GDT_TM_multi_panel.png', dpi=300, bbox_inches='tight')
+    with stage('savefig'):
+        if save_path:
+            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        else:
+            plt.savefig(f'./output/{output_dir}/GDT_TM_multi_panel.png', dpi=300, bbox_inches='tight')
     plt.close(fig)
 
     return
 
 
-assessment(TARGET_SCORE_DICT, output_dir = "./PLOTS", save_path = None)
+if __name__ == "__main__":
+    with stage('multipanel'):
+        assessment(TARGET_SCORE_DICT, output_dir = "./PLOTS", save_path = None)
+    if is_enabled():
+        write_profile_report(get_records(), 'process_TM_GDT_two_state_multipanel')
 
 
@@ -15,12 +15,13 @@ Date: 2025-09-10
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
-from adjustText import adjust_text  
-from tqdm import tqdm
 import csv
 from os.path import exists
-from process_two_state_score import frange, get_group_name_lookup, get_v1_ref_df, get_v2_ref_df, get_best_fit_dual_state, create_scatter, create_stacked_bar
+from parallel_runner import run_assessments, parse_workers
+from result_cache import get_combined_df
+from scoring_core import frange, get_group_name_lookup, get_v1_ref_df, get_v2_ref_df, get_best_fit_dual_state
+from process_two_state_score import create_scatter, create_stacked_bar
+from stage_profiler import stage
 
 
 
@@ -109,9 +110,7 @@ def create_stacked_bar_dual_state(*args, **kwargs):
 
 def assessment(ID, score):
     
-    v1_df = get_v1_ref_df(ID, score)
-    v2_df = get_v2_ref_df(ID, score)
-    combined_df = get_best_fit(ID, v1_df, v2_df, score)
+    combined_df = get_combined_df(ID, score, mode='dual')
 
     # Sort the combined_df by 'Combined_Score' in descending order
     combined_df = combined_df.sort_values(by='Combined_Score', ascending=False)
@@ -125,7 +124,8 @@ def assessment(ID, score):
         combined_df['Combined_Score'] = combined_df['Combined_Score'] * 100
 
     # Save the combined metric to a CSV file
-    combined_df.to_csv(f'./output/OUTPUT_CSVS/{ID}_{score}_dual_state.csv', index=False)
+    with stage('csv_write', target=ID, metric=score):
+        combined_df.to_csv(f'./output/OUTPUT_CSVS/{ID}_{score}_dual_state.csv', index=False)
     
 
     # print("Creating stacked bar plots...")
@@ -199,16 +199,7 @@ def assessment(ID, score):
 
 TARGET_SCORE_DICT = {"T1214": ["GDT_TS", "GlobalLDDT", "TMscore", "Composite_Score_1", "Composite_Score_2", "Composite_Score_3", "Composite_Score_4"]}
 
-
-for ID, scores in TARGET_SCORE_DICT.items():
-    for score in scores:
-        try:
-            assessment(ID, score)
-            print(f"[SUCCESS] Processed {ID} {score}")
-        except Exception as e:
-            print(f"[ERROR] Error processing {ID} {score}: {e}")
-            raise Exception("Stop here")
-            continue
-
-
-
+if __name__ == "__main__":
+    results = run_assessments(assessment, TARGET_SCORE_DICT, workers=parse_workers())
+    if not all(result['success'] for result in results):
+        raise SystemExit(1)
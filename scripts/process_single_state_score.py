@@ -15,12 +15,13 @@ Date: 2025-09-01
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
-from adjustText import adjust_text  
-from tqdm import tqdm
 import csv
 from os.path import exists
-from process_two_state_score import frange, get_group_name_lookup, get_v1_ref_df, get_best_fit_single_state, create_stacked_bar
+from parallel_runner import run_assessments, parse_workers
+from result_cache import get_combined_df
+from scoring_core import frange, get_group_name_lookup, get_v1_ref_df, get_best_fit_single_state
+from process_two_state_score import create_stacked_bar
+from stage_profiler import stage
 
 
 
@@ -32,8 +33,7 @@ def get_best_fit(ID, v1_df, score):
 
 def assessment(ID, score):
     
-    v1_df = get_v1_ref_df(ID, score)
-    combined_df = get_best_fit(ID, v1_df, score)
+    combined_df = get_combined_df(ID, score, mode='single')
 
     # Sort the combined_df by 'Combined_Score' in descending order
     combined_df = combined_df.sort_values(by='Combined_Score', ascending=False)
@@ -43,7 +43,8 @@ def assessment(ID, score):
         combined_df['Best_v1_ref'] = combined_df['Best_v1_ref'] * 100
 
     # Save the combined metric to a CSV file
-    combined_df.to_csv(f'./output/OUTPUT_CSVS/{ID}_{score}_single_state.csv', index=False)
+    with stage('csv_write', target=ID, metric=score):
+        combined_df.to_csv(f'./output/OUTPUT_CSVS/{ID}_{score}_single_state.csv', index=False)
     
 
     print("Creating stacked bar plots...")
@@ -52,16 +53,10 @@ def assessment(ID, score):
     print(f"Done creating stacked bar plots for {ID} {score}")
 
 
+TARGET_SCORE_DICT = {"T1214": ["GDT_TS", "GlobalLDDT", "TMscore", "Composite_Score_1", "Composite_Score_2", "Composite_Score_3", "Composite_Score_4"]}
+
 if __name__ == "__main__":
-    TARGET_SCORE_DICT = {"T1214": ["GDT_TS", "GlobalLDDT", "TMscore", "Composite_Score_1", "Composite_Score_2", "Composite_Score_3", "Composite_Score_4"]}
-
-    for ID, scores in TARGET_SCORE_DICT.items():
-        for score in scores:
-            try:
-                assessment(ID, score)
-                print(f"[SUCCESS] Processed {ID} {score}")
-            except Exception as e:
-                print(f"[ERROR] Error processing {ID} {score}: {e}")
-                raise Exception("Stop here")
-                continue
+    results = run_assessments(assessment, TARGET_SCORE_DICT, workers=parse_workers())
+    if not all(result['success'] for result in results):
+        raise SystemExit(1)
 
@@ -14,458 +14,16 @@ Contribution: Main contributor
 Date: 2025-09-01
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
-from adjustText import adjust_text  
-from tqdm import tqdm
-import csv
-from os.path import exists
-
-def frange(start, stop, step):
-    vals = []
-    while start <= stop:
-        vals.append(start)
-        start += step
-    return vals
-
-def get_v1_ref_df(ID, score):
-    file = f'./data/{ID}_v1_{score}_scores.csv'
-    df = pd.read_csv(file)
-    if ID == "T1214":
-        df['Model Version'] = 'v1'
-    df = df.dropna()
-    return df
-
-def get_v2_ref_df(ID, score):
-    version = 'v2'
-    if ID == "T1228":
-        version = 'v1_1'
-        if not(exists(f'./data/{ID}_{version}_{score}_scores.csv')):
-            version = 'v2_1'
-    elif ID == "T1239":
-        version = 'v1_1'
-
-    file = f'./data/{ID}_{version}_{score}_scores.csv'
-    df = pd.read_csv(file)
-    if ID == "T1214":
-        df['Model Version'] = 'v2'
-    df = df.dropna()
-    return df
-
-def get_group_name_lookup():
-    lookup = {}
-    with open('./data/group_number_name_correspondance.csv', newline='') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            lookup[row['Group Number'].zfill(3)] = row['Group Name']
-    return lookup
-
-def get_best_fit(ID, v1_df, v2_df, score):
-    group_name_lookup = get_group_name_lookup()
-    if (
-        'Model Version' not in v1_df.columns or 
-        'Model Version' not in v2_df.columns or
-        (('Model Version' in v1_df.columns and v1_df['Model Version'].isna().all()) and
-         ('Model Version' in v2_df.columns and v2_df['Model Version'].isna().all()))
-    ):
-        v1_df_by_model_v1 = v1_df
-        v2_df_by_model_v2 = v2_df
-        v1_df_by_model_v2 = v1_df
-        v2_df_by_model_v1 = v2_df
-    else:
-        v1_df_by_model_v1 = v1_df[v1_df['Model Version'] == 'v1']
-        v1_df_by_model_v2 = v1_df[v1_df['Model Version'] == 'v2']
-        v2_df_by_model_v1 = v2_df[v2_df['Model Version'] == 'v1']
-        v2_df_by_model_v2 = v2_df[v2_df['Model Version'] == 'v2']
-    
-
-    # Initialize empty lists to store results
-    groups = pd.concat([v1_df['Group'], v2_df['Group']]).unique()
-    results = []
-
-    one_group_only = False
-    if ID == 'R1203' or ID == 'T1214':
-        one_group_only = True
-
-    # Loop through each group
-    for group in groups:
-
-        if not(one_group_only):
-
-            # Get indices of max scores for each group, excluding groups where all scores are NaN
-            v1_v1_indices = v1_df_by_model_v1.groupby('Group')[score].idxmax()
-            v1_v2_indices = v1_df_by_model_v2.groupby('Group')[score].idxmax()
-            v2_v1_indices = v2_df_by_model_v1.groupby('Group')[score].idxmax()
-            v2_v2_indices = v2_df_by_model_v2.groupby('Group')[score].idxmax()
-
-            # Filter out groups where idxmax returned NaN (all scores were NaN)
-            v1_df_by_model_v1 = v1_df_by_model_v1.loc[v1_v1_indices.dropna()]
-            v1_df_by_model_v2 = v1_df_by_model_v2.loc[v1_v2_indices.dropna()]
-            v2_df_by_model_v1 = v2_df_by_model_v1.loc[v2_v1_indices.dropna()]
-            v2_df_by_model_v2 = v2_df_by_model_v2.loc[v2_v2_indices.dropna()]
-
-            v1_df_by_model_v1 = v1_df_by_model_v1.sort_values(by=score, ascending=False)
-            v1_df_by_model_v2 = v1_df_by_model_v2.sort_values(by=score, ascending=False)
-            v2_df_by_model_v1 = v2_df_by_model_v1.sort_values(by=score, ascending=False)
-            v2_df_by_model_v2 = v2_df_by_model_v2.sort_values(by=score, ascending=False)
-
-            # Get best scores for each version/model combination for this group
-            v1_v1_group = v1_df_by_model_v1[v1_df_by_model_v1['Group'] == group]
-            v1_v2_group = v1_df_by_model_v2[v1_df_by_model_v2['Group'] == group]
-            v2_v1_group = v2_df_by_model_v1[v2_df_by_model_v1['Group'] == group]
-            v2_v2_group = v2_df_by_model_v2[v2_df_by_model_v2['Group'] == group]
-
-            v1_v1_best = v1_v1_group[score].max() if len(v1_v1_group) > 0 else 0.0
-            v1_v2_best = v1_v2_group[score].max() if len(v1_v2_group) > 0 else 0.0
-            v2_v1_best = v2_v1_group[score].max() if len(v2_v1_group) > 0 else 0.0
-            v2_v2_best = v2_v2_group[score].max() if len(v2_v2_group) > 0 else 0.0
-
-            # Get model numbers for the best scores
-            v1_v1_model_number = (
-                v1_v1_group.loc[v1_v1_group[score].idxmax(), 'Model Number'] if len(v1_v1_group) > 0 else None
-            )
-            v1_v2_model_number = (
-                v1_v2_group.loc[v1_v2_group[score].idxmax(), 'Model Number'] if len(v1_v2_group) > 0 else None
-            )
-            v2_v1_model_number = (
-                v2_v1_group.loc[v2_v1_group[score].idxmax(), 'Model Number'] if len(v2_v1_group) > 0 else None
-            )
-            v2_v2_model_number = (
-                v2_v2_group.loc[v2_v2_group[score].idxmax(), 'Model Number'] if len(v2_v2_group) > 0 else None
-            )
-
-            # Find the best overall score for this group
-            scores = [s for s in [v1_v1_best, v1_v2_best, v2_v1_best, v2_v2_best] if s != 0.0]
-            if scores:  
-                best_score = max(scores)
-                # Determine which version/model combination produced the best score
-                if best_score == v1_v1_best:
-                    best_source = 'v1_v1'
-                elif best_score == v2_v2_best:
-                    best_source = 'v2_v2'
-                elif best_score == v1_v2_best:
-                    best_source = 'v1_v2'
-                elif best_score == v2_v1_best:
-                    best_source = 'v2_v1'
-            else:
-                best_score = 0.0
-                best_source = 'v1_v1'
-        else:
-            v1_df_by_model_v1 = v1_df_by_model_v1.sort_values(by=score, ascending=False)
-            v1_df_by_model_v2 = v1_df_by_model_v2.sort_values(by=score, ascending=False)
-            v2_df_by_model_v1 = v2_df_by_model_v1.sort_values(by=score, ascending=False)
-            v2_df_by_model_v2 = v2_df_by_model_v2.sort_values(by=score, ascending=False)
-
-            # Get best scores for each version/model combination for this group
-            v1_v1_group = v1_df_by_model_v1[v1_df_by_model_v1['Group'] == group]
-            v1_v2_group = v1_df_by_model_v2[v1_df_by_model_v2['Group'] == group]
-            v2_v1_group = v2_df_by_model_v1[v2_df_by_model_v1['Group'] == group]
-            v2_v2_group = v2_df_by_model_v2[v2_df_by_model_v2['Group'] == group]
-
-            v1_v1_best = v1_v1_group[score].max() if len(v1_v1_group) > 0 else 0.0
-            v2_v2_best = v2_v2_group[score].max() if len(v2_v2_group) > 0 else 0.0
-            v1_v2_best = None
-            v2_v1_best = None
-            v1_v2_model_number = None
-            v2_v1_model_number = None
-
-            if v1_v1_best > v2_v2_best:
-                best_source = 'v1_v1'
-                best_score = v1_v1_best
-                v1_v1_model_number = (
-                    v1_v1_group.loc[v1_v1_group[score].idxmax(), 'Model Number'] if len(v1_v1_group) > 0 else None
-                )
-                v2_v2_group = v2_v2_group[v2_v2_group['Model Number'] != v1_v1_model_number]
-
-                v2_v2_model_number = (
-                    v2_v2_group.loc[v2_v2_group[score].idxmax(), 'Model Number'] if len(v2_v2_group) > 0 else None
-                )
-                v2_v2_best = v2_v2_group[score].max() if len(v2_v2_group) > 0 else 0.0
-            else:
-                best_source = 'v2_v2'
-                best_score = v2_v2_best
-                v2_v2_model_number = (
-                    v2_v2_group.loc[v2_v2_group[score].idxmax(), 'Model Number'] if len(v2_v2_group) > 0 else None
-                )
-                v1_v1_group = v1_v1_group[v1_v1_group['Model Number'] != v2_v2_model_number]
-
-                v1_v1_model_number = (
-                    v1_v1_group.loc[v1_v1_group[score].idxmax(), 'Model Number'] if len(v1_v1_group) > 0 else None
-                )
-                v1_v1_best = v1_v1_group[score].max() if len(v1_v1_group) > 0 else 0.0
-
-
-
-        cumulative_score = 0
-        best_v1_ref = 0
-        best_v2_ref = 0
-        best_v1_ref_model_number = 0
-        best_v2_ref_model_number = 0
-        if best_source == 'v1_v1':
-            cumulative_score = v1_v1_best + v2_v2_best
-            best_v1_ref = v1_v1_best
-            best_v2_ref = v2_v2_best
-            best_v1_ref_model_number = 'v1' + '_' + str(v1_v1_model_number)
-            best_v2_ref_model_number = 'v2' + '_' + str(v2_v2_model_number)
-        elif best_source == 'v1_v2':
-            cumulative_score = v1_v2_best + v2_v1_best
-            best_v1_ref = v1_v2_best
-            best_v2_ref = v2_v1_best
-            best_v1_ref_model_number = 'v2' + '_' + str(v1_v2_model_number)
-            best_v2_ref_model_number = 'v1' + '_' + str(v2_v1_model_number)
-        elif best_source == 'v2_v1':
-            cumulative_score = v2_v1_best + v1_v2_best
-            best_v2_ref = v2_v1_best
-            best_v1_ref = v1_v2_best
-            best_v2_ref_model_number = 'v1' + '_' + str(v2_v1_model_number)
-            best_v1_ref_model_number = 'v2' + '_' + str(v1_v2_model_number)
-        elif best_source == 'v2_v2':
-            cumulative_score = v2_v2_best + v1_v1_best
-            best_v2_ref = v2_v2_best
-            best_v1_ref = v1_v1_best
-            best_v2_ref_model_number = 'v2' + '_' + str(v2_v2_model_number)
-            best_v1_ref_model_number = 'v1' + '_' + str(v1_v1_model_number)
-        else:
-            raise
-
-        # Extract group number from group string (e.g., TS314 -> 314)
-        group_number = str(int(''.join(filter(str.isdigit, group)))).zfill(3)
-        group_name = group_name_lookup.get(group_number, "Unknown").strip()
-
-        if cumulative_score > 0: # only include groups with a positive cumulative score
-            # Store results
-            results.append({
-                'Group': group,
-                'Group_Name': group_name,
-                'Combined_Score': cumulative_score,
-                'Best_v1_ref': best_v1_ref,
-                'Best_v2_ref': best_v2_ref,
-                'V1_Model_For_Combined_Score': group + '_' + best_v1_ref_model_number,
-                'V2_Model_For_Combined_Score': group + '_' + best_v2_ref_model_number,
-                'Best_Score': best_score,
-                'Best_Source': best_source,
-                'v1_v1_Score': v1_v1_best,
-                'v1_v2_Score': v1_v2_best,
-                'v2_v1_Score': v2_v1_best,
-                'v2_v2_Score': v2_v2_best,
-                'v1_v1_ModelNumber': v1_v1_model_number,
-                'v1_v2_ModelNumber': v1_v2_model_number,
-                'v2_v1_ModelNumber': v2_v1_model_number,
-                'v2_v2_ModelNumber': v2_v2_model_number
-            })
-
-    # Convert results to DataFrame
-    results_df = pd.DataFrame(results)
-    return results_df
-
-def get_best_fit_single_state(ID, v1_df, score):
-    """Single state version of get_best_fit - only uses v1 data"""
-    group_name_lookup = get_group_name_lookup()
-    if (
-        'Model Version' not in v1_df.columns or 
-        (('Model Version' in v1_df.columns and v1_df['Model Version'].isna().all()))
-    ):
-        v1_df_by_model_v1 = v1_df
-    else:
-        v1_df_by_model_v1 = v1_df[v1_df['Model Version'] == 'v1']
-    
-
-    # Initialize empty lists to store results
-    groups = v1_df['Group'].unique()
-    results = []
-
-    one_group_only = False
-    if ID == 'R1203' or ID == 'T1214':
-        one_group_only = True
-
-    # Loop through each group
-    for group in groups:
-
-        if not(one_group_only):
-
-            # Get indices of max scores for each group, excluding groups where all scores are NaN
-            v1_v1_indices = v1_df_by_model_v1.groupby('Group')[score].idxmax()
-
-            # Filter out groups where idxmax returned NaN (all scores were NaN)
-            v1_df_by_model_v1 = v1_df_by_model_v1.loc[v1_v1_indices.dropna()]
-
-            v1_df_by_model_v1 = v1_df_by_model_v1.sort_values(by=score, ascending=False)
-
-            # Get best scores for each version/model combination for this group
-            v1_v1_group = v1_df_by_model_v1[v1_df_by_model_v1['Group'] == group]
-
-            v1_v1_best = v1_v1_group[score].max() if len(v1_v1_group) > 0 else 0.0
-
-            # Get model numbers for the best scores
-            v1_v1_model_number = (
-                v1_v1_group.loc[v1_v1_group[score].idxmax(), 'Model Number'] if len(v1_v1_group) > 0 else None
-            )
-
-            # Find the best overall score for this group
-            if v1_v1_best != 0.0:  
-                best_score = v1_v1_best
-                best_source = 'v1_v1'
-            else:
-                best_score = 0.0
-                best_source = 'v1_v1'
-        else:
-            v1_df_by_model_v1 = v1_df_by_model_v1.sort_values(by=score, ascending=False)
-
-            # Get best scores for each version/model combination for this group
-            v1_v1_group = v1_df_by_model_v1[v1_df_by_model_v1['Group'] == group]
-
-            v1_v1_best = v1_v1_group[score].max() if len(v1_v1_group) > 0 else 0.0
-
-            if v1_v1_best != 0.0:
-                best_source = 'v1_v1'
-                best_score = v1_v1_best
-                v1_v1_model_number = (
-                    v1_v1_group.loc[v1_v1_group[score].idxmax(), 'Model Number'] if len(v1_v1_group) > 0 else None
-                )
-            else:
-                best_source = 'v1_v1'
-                best_score = v1_v1_best
-
-
-        cumulative_score = 0
-        best_v1_ref = 0
-        best_v1_ref_model_number = 0
-        if best_source == 'v1_v1':
-            cumulative_score = v1_v1_best
-            best_v1_ref = v1_v1_best
-            best_v1_ref_model_number = 'v1' + '_' + str(v1_v1_model_number)
-        else:
-            raise
-
-        # Extract group number from group string (e.g., TS314 -> 314)
-        group_number = str(int(''.join(filter(str.isdigit, group)))).zfill(3)
-        group_name = group_name_lookup.get(group_number, "Unknown").strip()
-
-        if cumulative_score > 0: # only include groups with a positive cumulative score
-            # Store results
-            results.append({
-                'Group': group,
-                'Group_Name': group_name,   
-                'Combined_Score': cumulative_score,
-                'Best_v1_ref': best_v1_ref,
-                'V1_Model_For_Combined_Score': group + '_' + best_v1_ref_model_number,
-                'Best_Score': best_score,
-                'Best_Source': best_source,
-                'v1_v1_Score': v1_v1_best,
-                'v1_v1_ModelNumber': v1_v1_model_number,
-            })
-
-    # Convert results to DataFrame
-    results_df = pd.DataFrame(results)
-    return results_df
-
-def get_best_fit_dual_state(ID, v1_df, v2_df, score):
-    """Dual state version of get_best_fit - finds best v1, then matching v2"""
-    group_name_lookup = get_group_name_lookup()
-    if (
-        'Model Version' not in v1_df.columns or 
-        (('Model Version' in v1_df.columns and v1_df['Model Version'].isna().all()))
-    ):
-        v1_df_by_model_v1 = v1_df
-    else:
-        v1_df_by_model_v1 = v1_df[v1_df['Model Version'] == 'v1']
-    
-
-    # Initialize empty lists to store results
-    groups = v1_df['Group'].unique()
-    results = []
-
-    one_group_only = False
-    if ID == 'R1203' or ID == 'T1214':
-        one_group_only = True
-
-    # Loop through each group
-    for group in groups:
-
-        if not(one_group_only):
-
-            # Get indices of max scores for each group, excluding groups where all scores are NaN
-            v1_v1_indices = v1_df_by_model_v1.groupby('Group')[score].idxmax()
-
-            # Filter out groups where idxmax returned NaN (all scores were NaN)
-            v1_df_by_model_v1 = v1_df_by_model_v1.loc[v1_v1_indices.dropna()]
-
-            v1_df_by_model_v1 = v1_df_by_model_v1.sort_values(by=score, ascending=False)
-
-            # Get best scores for each version/model combination for this group
-            v1_v1_group = v1_df_by_model_v1[v1_df_by_model_v1['Group'] == group]
-
-            v1_v1_best = v1_v1_group[score].max() if len(v1_v1_group) > 0 else 0.0
-
-            # Get model numbers for the best scores
-            v1_v1_model_number = (
-                v1_v1_group.loc[v1_v1_group[score].idxmax(), 'Model Number'] if len(v1_v1_group) > 0 else None
-            )
-
-            # Find the best overall score for this group
-            if v1_v1_best != 0.0:  
-                best_score = v1_v1_best
-                best_source = 'v1_v1'
-            else:
-                best_score = 0.0
-                best_source = 'v1_v1'
-        else:
-            v1_df_by_model_v1 = v1_df_by_model_v1.sort_values(by=score, ascending=False)
-
-            # Get best scores for each version/model combination for this group
-            v1_v1_group = v1_df_by_model_v1[v1_df_by_model_v1['Group'] == group]
-
-            v1_v1_best = v1_v1_group[score].max() if len(v1_v1_group) > 0 else 0.0
-
-            if v1_v1_best != 0.0:
-                best_source = 'v1_v1'
-                best_score = v1_v1_best
-                v1_v1_model_number = (
-                    v1_v1_group.loc[v1_v1_group[score].idxmax(), 'Model Number'] if len(v1_v1_group) > 0 else None
-                )
-            else:
-                best_source = 'v1_v1'
-                best_score = v1_v1_best
-
-
-        cumulative_score = 0
-        best_v1_ref = 0
-        best_v1_ref_model_number = 0
-        if best_source == 'v1_v1':
-            cumulative_score = v1_v1_best
-            best_v1_ref = v1_v1_best
-            best_v1_ref_model_number = 'v1' + '_' + str(v1_v1_model_number)
-        else:
-            raise
-
-        # Extract group number from group string (e.g., TS314 -> 314)
-        group_number = str(int(''.join(filter(str.isdigit, group)))).zfill(3)
-        group_name = group_name_lookup.get(group_number, "Unknown").strip()
-
-        v2_score_row = v2_df[(v2_df['Group'] == group) & (v2_df['Model Number'] == v1_v1_model_number)]
-        v2_score = v2_score_row[score].values[0] if not v2_score_row.empty else None
-
-        if v2_score is not None:
-            cumulative_score += v2_score
-
-        if cumulative_score > 0: # only include groups with a positive cumulative score
-            # Store results
-            results.append({
-                'Group': group,
-                'Group_Name': group_name,   
-                'Combined_Score': cumulative_score,
-                'Best_v1_ref': best_v1_ref,
-                'Best_v2_ref': v2_score,
-                'V1_Model_For_Combined_Score': group + '_' + best_v1_ref_model_number,
-                'v1_v1_Score': v1_v1_best,
-                'v1_v1_ModelNumber': v1_v1_model_number,
-                'v2_v2_Score': v2_score,
-                'v2_v2_ModelNumber': v2_score_row['Model Number'].values[0] if not v2_score_row.empty else None,
-            })
-
-    # Convert results to DataFrame
-    results_df = pd.DataFrame(results)
-    return results_df
+import time
+from group_registry import normalize_group_numbers, get_group_names
+from figure_renderer import get_figure, save_figure, record_timing
+from label_placer import LABEL_PLACERS, place_labels
+from stage_profiler import stage
+from parallel_runner import run_assessments, parse_workers
+# The loaders and selection engines live in the plotting-free scoring_core module
+from scoring_core import frange, get_v1_ref_df, get_v2_ref_version, get_v2_ref_df, get_group_name_lookup, \
+    get_group_number, best_rows_by_group, model_number_column, get_best_fit, get_best_fit_single_state, \
+    get_best_fit_dual_state
 
 def create_scatter(
     x,
@@ -488,6 +46,7 @@ def create_scatter(
     rect_width=None,
     rect_height=None,
     adjust_texts=True,
+    label_placer='adjust_text',  # 'adjust_text' or 'grid' (fast placement, see label_placer.py)
     save_path=None,
     dpi=300,
     legend_position='upper right',
@@ -528,6 +87,7 @@ def create_scatter(
         rect_xy: (x, y) for rectangle lower left
         rect_width, rect_height: Rectangle width and height
         adjust_texts: Whether to adjust text to avoid overlap
+        label_placer: 'adjust_text' (iterative repulsion) or 'grid' (fast grid-based placement)
         save_path: If provided, save the figure to this path
         dpi: Dots per inch for saving
         legend_position: Position for the legend
@@ -548,14 +108,24 @@ def create_scatter(
         title_fontsize: Title font size (default 20)
         tick_labelsize: Tick label size (default 20)
     Returns:
-        fig, ax_main, ax_inset (if inset=True)
+        fig, ax_main, ax_inset (if inset=True); None when save_path is set without ax, as the
+        reusable template figure is cleared once saved
     """
+    import matplotlib.pyplot as plt
+    from adjustText import adjust_text
 
-    # Use provided axes or create new ones
+    if label_placer not in LABEL_PLACERS:
+        raise ValueError(f"Unknown label_placer {label_placer}, expected one of {LABEL_PLACERS}")
+    start = time.perf_counter()
+    templated = False
+    # Use provided axes, a reusable template when the figure is only saved, or new ones
     if ax is not None:
         ax_main = ax
         fig = ax.figure
         ax_main.clear()  # Clear the existing axes
+    elif save_path:
+        fig, ax_main = get_figure('scatter_inset' if inset else 'scatter', figsize)
+        templated = True
     else:
         fig, ax_main = plt.subplots(figsize=figsize)
     
@@ -581,8 +151,7 @@ def create_scatter(
 
     # --- AF3 Baseline Highlighting ---
     if AF3_baseline:
-        for i, (xv, yv, txt) in enumerate(zip(x, y, group_labels)):
-            group_num = str(int(''.join(filter(str.isdigit, str(txt))))).zfill(3)
+        for i, (xv, yv, group_num) in enumerate(zip(x, y, normalize_group_numbers(group_labels))):
             if group_num == '304':
                 ax_main.axhline(yv, color='gray', linestyle='--', linewidth=2)
                 ax_main.axvline(xv, color='gray', linestyle='--', linewidth=2)
@@ -644,8 +213,7 @@ def create_scatter(
             ax_main.add_patch(rect)
         # --- AF3 Baseline Highlighting ---
         if AF3_baseline:
-            for i, (xv, yv, txt) in enumerate(zip(x, y, group_labels)):
-                group_num = str(int(''.join(filter(str.isdigit, str(txt))))).zfill(3)
+            for i, (xv, yv, group_num) in enumerate(zip(x, y, normalize_group_numbers(group_labels))):
                 if group_num == '304':
                     ax_inset.axhline(yv, color='gray', linestyle='--', linewidth=2)
                     ax_inset.axvline(xv, color='gray', linestyle='--', linewidth=2)
@@ -668,23 +236,31 @@ def create_scatter(
                 texts_inset.append(ax_inset.text(xv, yv, txt.replace('TS', ''), fontsize=text_fontsize))
             else:
                 texts_main.append(ax_main.text(xv, yv, txt.replace('TS', ''), fontsize=text_fontsize))
-        if adjust_texts:
-            if texts_inset:
-                adjust_text(texts_inset, 
-                            ax=ax_inset, 
-                            arrowprops=dict(arrowstyle='->', color='red', lw=0.5),
-                            expand_points=(1.1, 1.1),
-                            force_points=(0.1, 0.1))
-            if texts_main:
-                adjust_text(texts_main, 
-                            ax=ax_main, 
-                            arrowprops=dict(arrowstyle='->', color='red', lw=0.5),
-                            expand_points=(2.0, 2.0),
-                            force_text=(0.5, 0.5),
-                            force_points=(0.5, 0.5),
-                            avoid_text=True,
-                            avoid_points=True,
-                            avoid_self=True)
+        with stage('label_adjustment', metric=score):
+            if adjust_texts and label_placer == 'grid':
+                arrowprops = dict(arrowstyle='->', color='red', lw=0.5)
+                if texts_inset:
+                    place_labels(texts_inset, ax_inset, x, y, arrowprops=arrowprops)
+                if texts_main:
+                    place_labels(texts_main, ax_main, x, y, obstacles=[ax_inset] if inset else None,
+                                 scatter_size=scatter_size, arrowprops=arrowprops)
+            elif adjust_texts:
+                if texts_inset:
+                    adjust_text(texts_inset, 
+                                ax=ax_inset, 
+                                arrowprops=dict(arrowstyle='->', color='red', lw=0.5),
+                                expand_points=(1.1, 1.1),
+                                force_points=(0.1, 0.1))
+                if texts_main:
+                    adjust_text(texts_main, 
+                                ax=ax_main, 
+                                arrowprops=dict(arrowstyle='->', color='red', lw=0.5),
+                                expand_points=(2.0, 2.0),
+                                force_text=(0.5, 0.5),
+                                force_points=(0.5, 0.5),
+                                avoid_text=True,
+                                avoid_points=True,
+                                avoid_self=True)
     ax_main.set_xlabel(xlabel, fontsize=xlabel_fontsize)
     ax_main.set_ylabel(ylabel, fontsize=ylabel_fontsize)
     ax_main.set_title(title, fontsize=title_fontsize)
@@ -705,11 +281,13 @@ def create_scatter(
     ax_main.tick_params(axis='both', labelsize=tick_labelsize)
     
     if ax is None:  # Only call tight_layout if we created a new figure
-        plt.tight_layout()
+        with stage('tight_layout', metric=score):
+            fig.tight_layout()
     if save_path:
-        fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
-        if ax is None:  # Only close the figure if we created it
-            plt.close(fig)
+        save_figure(fig, save_path, dpi=dpi, bbox_inches='tight')  # Template figures are cleared once saved
+        record_timing(save_path, start)
+    if templated:
+        return None
     if inset:
         return fig, ax_main, ax_inset
     else:
@@ -752,6 +330,7 @@ def create_stacked_bar(combined_df, ID, score, horizontal=False, star=False, \
     composite_score_4_replacement='Σ4'  # Replacement for Composite_Score_4
 ):
     import matplotlib.pyplot as plt
+    start = time.perf_counter()
     
     # Handle score name replacements
     if replace_updated:
@@ -799,18 +378,15 @@ def create_stacked_bar(combined_df, ID, score, horizontal=False, star=False, \
         rot_prim = id_config.get('rot_prim_vertical', rot_prim_vertical)
 
     # Regular stacked bar logic
-    fig, ax = plt.subplots(figsize=fig_size)
+    fig, ax = get_figure('bar_horizontal' if horizontal else 'bar_vertical', fig_size)
     group_labels_raw = combined_df['Group'].str.replace('TS', '')
     
     if horizontal:
         df_to_use = combined_df.iloc[::-1]
-        group_name_lookup = get_group_name_lookup()
-        group_labels, check_labels = [], []
-        for group in df_to_use['Group']:
-            group_id = str(int(''.join(filter(str.isdigit, group)))).zfill(3)
-            group_name = group_name_lookup.get(group_id, group).strip()
-            group_labels.append(f"{group_name} ({group_id})")
-            check_labels.append(group_id)
+        group_ids = normalize_group_numbers(df_to_use['Group'])
+        group_names = get_group_names(df_to_use['Group'], default=df_to_use['Group'])
+        group_labels = list(group_names + ' (' + group_ids + ')')
+        check_labels = list(group_ids)
         bar_size_param = 'height'
     else:
         df_to_use = combined_df
@@ -941,26 +517,26 @@ def create_stacked_bar(combined_df, ID, score, horizontal=False, star=False, \
         ax.set_yticklabels(ax.get_yticklabels(), fontsize=tick_fs_sec)
     
     # Style
-    plt.tight_layout()
+    with stage('tight_layout', target=ID, metric=score):
+        fig.tight_layout()
     for spine in ax.spines.values():
         spine.set_linewidth(spine_linewidth)
         spine.set_edgecolor(spine_edgecolor)
     
     # Save
-    if save_path:
-        plt.savefig(save_path, dpi=300)
-    else:
+    if not save_path:
         if single_state:
-            plt.savefig(f'{output_dir}/{ID}_{score}_single_state{outfile_suffix}.png', dpi=300)
+            save_path = f'{output_dir}/{ID}_{score}_single_state{outfile_suffix}.png'
         else:
-            plt.savefig(f'{output_dir}/{ID}_{score}_two_state{outfile_suffix}.png', dpi=300)
-    plt.close()
+            save_path = f'{output_dir}/{ID}_{score}_two_state{outfile_suffix}.png'
+    save_figure(fig, save_path, dpi=300)
+    record_timing(save_path, start)
 
 def assessment(ID, score):
-    
-    v1_df = get_v1_ref_df(ID, score)
-    v2_df = get_v2_ref_df(ID, score)
-    combined_df = get_best_fit(ID, v1_df, v2_df, score)
+    # result_cache imports this module, so import it here rather than at the top
+    from result_cache import get_combined_df
+
+    combined_df = get_combined_df(ID, score)
     
     # Sort the combined_df by 'Combined_Score' in descending order
     combined_df = combined_df.sort_values(by='Combined_Score', ascending=False)
@@ -973,7 +549,8 @@ def assessment(ID, score):
             combined_df['Best_v2_ref'] = combined_df['Best_v2_ref'] * 100
 
     # Save the combined metric to a CSV file
-    combined_df.to_csv(f'./output/OUTPUT_CSVS/{ID}_{score}_two_state.csv', index=False)
+    with stage('csv_write', target=ID, metric=score):
+        combined_df.to_csv(f'./output/OUTPUT_CSVS/{ID}_{score}_two_state.csv', index=False)
     
     kwargs = {}
     # Set text fontsize for specific IDs
@@ -1164,23 +741,16 @@ def assessment(ID, score):
     create_stacked_bar(combined_df, ID, score, horizontal=False, star=True, outfile_suffix = "_horizontal")
     print(f"Done creating stacked bar plots for {ID} {score}")
 
-if __name__ == "__main__":
-
-    TARGET_SCORE_DICT = {"M1228": ["BestDockQ", "GDT_TS", "GlobDockQ", "GlobalLDDT", "TMscore"], 
-                        "M1239": ["BestDockQ", "GDT_TS", "GlobDockQ", "GlobalLDDT", "TMscore"], 
-                        "R1203": ["GDT_TS", "GlobalLDDT", "Composite_Score_1", "Composite_Score_2", "Composite_Score_3","Composite_Score_4", "TMscore"], 
-                        "T1214": ["GDT_TS", "GlobalLDDT", "TMscore", "Composite_Score_1", "Composite_Score_2", "Composite_Score_3", "Composite_Score_4"],
-                        "T1228": ["GDT_TS", "GlobalLDDT", "TMscore"], 
-                        "T1239": ["GDT_TS", "GlobalLDDT", "TMscore"], 
-                        "T1249": ["AvgDockQ", "GlobalLDDT", "GDT_TS", "TMscore"]}
+TARGET_SCORE_DICT = {"M1228": ["BestDockQ", "GDT_TS", "GlobDockQ", "GlobalLDDT", "TMscore"], 
+                    "M1239": ["BestDockQ", "GDT_TS", "GlobDockQ", "GlobalLDDT", "TMscore"], 
+                    "R1203": ["GDT_TS", "GlobalLDDT", "Composite_Score_1", "Composite_Score_2", "Composite_Score_3","Composite_Score_4", "TMscore"], 
+                    "T1214": ["GDT_TS", "GlobalLDDT", "TMscore", "Composite_Score_1", "Composite_Score_2", "Composite_Score_3", "Composite_Score_4"],
+                    "T1228": ["GDT_TS", "GlobalLDDT", "TMscore"], 
+                    "T1239": ["GDT_TS", "GlobalLDDT", "TMscore"], 
+                    "T1249": ["AvgDockQ", "GlobalLDDT", "GDT_TS", "TMscore"]}
 
-    for ID, scores in TARGET_SCORE_DICT.items():
-        for score in scores:
-            try:
-                assessment(ID, score)
-                print(f"[SUCCESS] Processed {ID} {score}")
-            except Exception as e:
-                print(f"[ERROR] Error processing {ID} {score}: {e}")
-                raise Exception("Stop here")
-                continue
+if __name__ == "__main__":
+    results = run_assessments(assessment, TARGET_SCORE_DICT, workers=parse_workers())
+    if not all(result['success'] for result in results):
+        raise SystemExit(1)
 
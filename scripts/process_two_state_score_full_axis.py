@@ -15,16 +15,17 @@ Date: 2025-09-01
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
-from adjustText import adjust_text  
-from tqdm import tqdm
 import csv
 from os.path import exists
-from process_two_state_score import get_v1_ref_df, get_v2_ref_df, frange, get_group_name_lookup, get_best_fit, create_scatter
+from parallel_runner import run_assessments, parse_workers
+from result_cache import get_combined_df
+from scoring_core import get_v1_ref_df, get_v2_ref_df, frange, get_group_name_lookup, get_best_fit
+from process_two_state_score import create_scatter
+from stage_profiler import stage
 
 
 
-# get_best_fit function is now imported from process_two_state_score
+# get_best_fit function is now imported from scoring_core
 
 # create_scatter function is now imported from process_two_state_score
 # Using wrapper to adapt to full_axis version's specific parameters
@@ -47,9 +48,7 @@ def create_scatter_full_axis(*args, **kwargs):
 
 def assessment(ID, score):
     
-    v1_df = get_v1_ref_df(ID, score)
-    v2_df = get_v2_ref_df(ID, score)
-    combined_df = get_best_fit(ID, v1_df, v2_df, score)
+    combined_df = get_combined_df(ID, score)
     # Sort the combined_df by 'Combined_Score' in descending order
     combined_df = combined_df.sort_values(by='Combined_Score', ascending=False)
     # Convert GDT_TS scores to percentage
@@ -62,7 +61,8 @@ def assessment(ID, score):
             combined_df['Combined_Score'] = combined_df['Combined_Score'] * 100
 
     # Save the combined metric to a CSV file
-    combined_df.to_csv(f'./output/OUTPUT_CSVS/{ID}_{score}_two_state.csv', index=False)
+    with stage('csv_write', target=ID, metric=score):
+        combined_df.to_csv(f'./output/OUTPUT_CSVS/{ID}_{score}_two_state.csv', index=False)
     
     kwargs = {}
     # Set text fontsize for specific IDs
@@ -111,14 +111,7 @@ TARGET_SCORE_DICT = {"M1228": ["GDT_TS", "TMscore"],
                      "T1249": ["GDT_TS", "TMscore"],
                      "T1214": ["GDT_TS", "TMscore"]}
 
-
-for ID, scores in TARGET_SCORE_DICT.items():
-    for score in scores:
-        try:
-            assessment(ID, score)
-            print(f"[SUCCESS] Processed {ID} {score}")
-        except Exception as e:
-            print(f"[ERROR] Error processing {ID} {score}: {e}")
-            raise Exception("Stop here")
-            continue
-
+if __name__ == "__main__":
+    results = run_assessments(assessment, TARGET_SCORE_DICT, workers=parse_workers())
+    if not all(result['success'] for result in results):
+        raise SystemExit(1)
@@ -15,15 +15,19 @@ Date: 2025-09-01
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
-from adjustText import adjust_text  
-from tqdm import tqdm
 import csv
+import time
 from os.path import exists
-from process_two_state_score import get_v1_ref_df, get_v2_ref_df, frange, get_group_name_lookup, get_best_fit, create_stacked_bar
+from parallel_runner import run_assessments, parse_workers
+from result_cache import get_combined_df
+from group_registry import normalize_group_numbers, get_group_names
+from figure_renderer import get_figure, save_figure, record_timing
+from scoring_core import get_v1_ref_df, get_v2_ref_df, frange, get_group_name_lookup, get_best_fit
+from process_two_state_score import create_stacked_bar
+from stage_profiler import stage
 
 
-# get_best_fit function is now imported from process_two_state_score
+# get_best_fit function is now imported from scoring_core
 
 # create_stacked_bar function is now imported from process_two_state_score
 # Using wrapper with simple_bar_plots specific configurations
@@ -33,6 +37,7 @@ def create_stacked_bar_simple(combined_df, ID, score, horizontal=False, star=Fal
     if score_replaced == 'Composite_Score_4':
         score_replaced = 'Σ4'
     import matplotlib.pyplot as plt
+    start = time.perf_counter()
     num_groups = len(combined_df)
     per_group, min_size, max_size = 0.35, 6, 20
     dynamic_size = max(min_size, min(max_size, num_groups * per_group))
@@ -71,7 +76,7 @@ def create_stacked_bar_simple(combined_df, ID, score, horizontal=False, star=Fal
         else:
             legend_loc, tick_fs_prim, tick_fs_sec, rot_prim = 'lower right', 32, 32, 0
     
-    fig, ax = plt.subplots(figsize=fig_size)
+    fig, ax = get_figure('bar_horizontal' if horizontal else 'bar_vertical', fig_size)
     group_labels_raw = combined_df['Group'].str.replace('TS', '')
     if horizontal:
         df_to_use = combined_df
@@ -80,13 +85,10 @@ def create_stacked_bar_simple(combined_df, ID, score, horizontal=False, star=Fal
         bar_size_param, bar_size = 'width', 0.9
     else:
         df_to_use = combined_df.iloc[::-1]
-        group_name_lookup = get_group_name_lookup()
-        group_labels, check_labels = [], []
-        for group in df_to_use['Group']:
-            group_id = str(int(''.join(filter(str.isdigit, group)))).zfill(3)
-            group_name = group_name_lookup.get(group_id, group).strip()
-            group_labels.append(f"{group_name} ({group_id})")
-            check_labels.append(group_id)
+        group_ids = normalize_group_numbers(df_to_use['Group'])
+        group_names = get_group_names(df_to_use['Group'], default=df_to_use['Group'])
+        group_labels = list(group_names + ' (' + group_ids + ')')
+        check_labels = list(group_ids)
         bar_size_param, bar_size = 'height', 0.9
     v1_colors = ['tab:blue'] * num_groups
     v2_colors = ['#FA7E0F'] * num_groups
@@ -158,18 +160,18 @@ def create_stacked_bar_simple(combined_df, ID, score, horizontal=False, star=Fal
         ax.set_yticklabels(group_labels, fontsize=tick_fs_prim)
         ax.set_xticks(ax.get_xticks())
         ax.set_xticklabels(ax.get_xticklabels(), fontsize=tick_fs_sec)
-    plt.tight_layout()
+    with stage('tight_layout', target=ID, metric=score):
+        fig.tight_layout()
     for spine in ax.spines.values():
         spine.set_linewidth(3)
         spine.set_edgecolor('black')
-    plt.savefig(f'./output/PLOTS/{ID}_{score}_two_state{outfile_suffix}.png', dpi=300)
-    plt.close()
+    save_path = f'./output/PLOTS/{ID}_{score}_two_state{outfile_suffix}.png'
+    save_figure(fig, save_path, dpi=300)
+    record_timing(save_path, start)
 
 def assessment(ID, score):
     
-    v1_df = get_v1_ref_df(ID, score)
-    v2_df = get_v2_ref_df(ID, score)
-    combined_df = get_best_fit(ID, v1_df, v2_df, score)
+    combined_df = get_combined_df(ID, score)
     # Sort the combined_df by 'Combined_Score' in descending order
     combined_df = combined_df.sort_values(by='Combined_Score', ascending=False)
     # Convert GDT_TS scores to percentage
@@ -180,7 +182,8 @@ def assessment(ID, score):
             combined_df['Best_v2_ref'] = combined_df['Best_v2_ref'] * 100
 
     # Save the combined metric to a CSV file
-    combined_df.to_csv(f'./output/OUTPUT_CSVS/{ID}_{score}_two_state.csv', index=False)
+    with stage('csv_write', target=ID, metric=score):
+        combined_df.to_csv(f'./output/OUTPUT_CSVS/{ID}_{score}_two_state.csv', index=False)
   
 
     print("Creating stacked bar plots...")
@@ -198,13 +201,7 @@ TARGET_SCORE_DICT = {"M1228": ["BestDockQ", "GDT_TS", "GlobDockQ", "GlobalLDDT",
                      "T1239": ["GDT_TS", "GlobalLDDT", "TMscore"], 
                      "T1249": ["AvgDockQ", "GlobalLDDT", "GDT_TS", "TMscore"]}
 
-for ID, scores in TARGET_SCORE_DICT.items():
-    for score in scores:
-        try:
-            assessment(ID, score)
-            print(f"[SUCCESS] Processed {ID} {score}")
-        except Exception as e:
-            print(f"[ERROR] Error processing {ID} {score}: {e}")
-            raise Exception("Stop here")
-            continue
-
+if __name__ == "__main__":
+    results = run_assessments(assessment, TARGET_SCORE_DICT, workers=parse_workers())
+    if not all(result['success'] for result in results):
+        raise SystemExit(1)
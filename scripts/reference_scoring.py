@@ -0,0 +1,440 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+
+# Reference (original, loop-based) implementations of get_best_fit,
+# get_best_fit_single_state and get_best_fit_dual_state.
+#
+# These are the per-group loops the published rankings were produced with, kept verbatim
+# apart from reading the group names through group_registry. They define the expected
+# output for equivalence_harness.py and must not be optimized: every faster engine is
+# checked against them column by column (Best_Source tie order, 0.0 sentinels, the
+# cumulative_score > 0 filter, model string formats and dtypes).
+
+import pandas as pd
+
+from group_registry import load_group_lookup
+
+
+def get_group_name_lookup():
+    return load_group_lookup()
+
+def get_best_fit(ID, v1_df, v2_df, score):
+    group_name_lookup = get_group_name_lookup()
+    if (
+        'Model Version' not in v1_df.columns or 
+        'Model Version' not in v2_df.columns or
+        (('Model Version' in v1_df.columns and v1_df['Model Version'].isna().all()) and
+         ('Model Version' in v2_df.columns and v2_df['Model Version'].isna().all()))
+    ):
+        v1_df_by_model_v1 = v1_df
+        v2_df_by_model_v2 = v2_df
+        v1_df_by_model_v2 = v1_df
+        v2_df_by_model_v1 = v2_df
+    else:
+        v1_df_by_model_v1 = v1_df[v1_df['Model Version'] == 'v1']
+        v1_df_by_model_v2 = v1_df[v1_df['Model Version'] == 'v2']
+        v2_df_by_model_v1 = v2_df[v2_df['Model Version'] == 'v1']
+        v2_df_by_model_v2 = v2_df[v2_df['Model Version'] == 'v2']
+    
+
+    # Initialize empty lists to store results
+    groups = pd.concat([v1_df['Group'], v2_df['Group']]).unique()
+    results = []
+
+    one_group_only = False
+    if ID == 'R1203' or ID == 'T1214':
+        one_group_only = True
+
+    # Loop through each group
+    for group in groups:
+
+        if not(one_group_only):
+
+            # Get indices of max scores for each group, excluding groups where all scores are NaN
+            v1_v1_indices = v1_df_by_model_v1.groupby('Group')[score].idxmax()
+            v1_v2_indices = v1_df_by_model_v2.groupby('Group')[score].idxmax()
+            v2_v1_indices = v2_df_by_model_v1.groupby('Group')[score].idxmax()
+            v2_v2_indices = v2_df_by_model_v2.groupby('Group')[score].idxmax()
+
+            # Filter out groups where idxmax returned NaN (all scores were NaN)
+            v1_df_by_model_v1 = v1_df_by_model_v1.loc[v1_v1_indices.dropna()]
+            v1_df_by_model_v2 = v1_df_by_model_v2.loc[v1_v2_indices.dropna()]
+            v2_df_by_model_v1 = v2_df_by_model_v1.loc[v2_v1_indices.dropna()]
+            v2_df_by_model_v2 = v2_df_by_model_v2.loc[v2_v2_indices.dropna()]
+
+            v1_df_by_model_v1 = v1_df_by_model_v1.sort_values(by=score, ascending=False)
+            v1_df_by_model_v2 = v1_df_by_model_v2.sort_values(by=score, ascending=False)
+            v2_df_by_model_v1 = v2_df_by_model_v1.sort_values(by=score, ascending=False)
+            v2_df_by_model_v2 = v2_df_by_model_v2.sort_values(by=score, ascending=False)
+
+            # Get best scores for each version/model combination for this group
+            v1_v1_group = v1_df_by_model_v1[v1_df_by_model_v1['Group'] == group]
+            v1_v2_group = v1_df_by_model_v2[v1_df_by_model_v2['Group'] == group]
+            v2_v1_group = v2_df_by_model_v1[v2_df_by_model_v1['Group'] == group]
+            v2_v2_group = v2_df_by_model_v2[v2_df_by_model_v2['Group'] == group]
+
+            v1_v1_best = v1_v1_group[score].max() if len(v1_v1_group) > 0 else 0.0
+            v1_v2_best = v1_v2_group[score].max() if len(v1_v2_group) > 0 else 0.0
+            v2_v1_best = v2_v1_group[score].max() if len(v2_v1_group) > 0 else 0.0
+            v2_v2_best = v2_v2_group[score].max() if len(v2_v2_group) > 0 else 0.0
+
+            # Get model numbers for the best scores
+            v1_v1_model_number = (
+                v1_v1_group.loc[v1_v1_group[score].idxmax(), 'Model Number'] if len(v1_v1_group) > 0 else None
+            )
+            v1_v2_model_number = (
+                v1_v2_group.loc[v1_v2_group[score].idxmax(), 'Model Number'] if len(v1_v2_group) > 0 else None
+            )
+            v2_v1_model_number = (
+                v2_v1_group.loc[v2_v1_group[score].idxmax(), 'Model Number'] if len(v2_v1_group) > 0 else None
+            )
+            v2_v2_model_number = (
+                v2_v2_group.loc[v2_v2_group[score].idxmax(), 'Model Number'] if len(v2_v2_group) > 0 else None
+            )
+
+            # Find the best overall score for this group
+            scores = [s for s in [v1_v1_best, v1_v2_best, v2_v1_best, v2_v2_best] if s != 0.0]
+            if scores:  
+                best_score = max(scores)
+                # Determine which version/model combination produced the best score
+                if best_score == v1_v1_best:
+                    best_source = 'v1_v1'
+                elif best_score == v2_v2_best:
+                    best_source = 'v2_v2'
+                elif best_score == v1_v2_best:
+                    best_source = 'v1_v2'
+                elif best_score == v2_v1_best:
+                    best_source = 'v2_v1'
+            else:
+                best_score = 0.0
+                best_source = 'v1_v1'
+        else:
+            v1_df_by_model_v1 = v1_df_by_model_v1.sort_values(by=score, ascending=False)
+            v1_df_by_model_v2 = v1_df_by_model_v2.sort_values(by=score, ascending=False)
+            v2_df_by_model_v1 = v2_df_by_model_v1.sort_values(by=score, ascending=False)
+            v2_df_by_model_v2 = v2_df_by_model_v2.sort_values(by=score, ascending=False)
+
+            # Get best scores for each version/model combination for this group
+            v1_v1_group = v1_df_by_model_v1[v1_df_by_model_v1['Group'] == group]
+            v1_v2_group = v1_df_by_model_v2[v1_df_by_model_v2['Group'] == group]
+            v2_v1_group = v2_df_by_model_v1[v2_df_by_model_v1['Group'] == group]
+            v2_v2_group = v2_df_by_model_v2[v2_df_by_model_v2['Group'] == group]
+
+            v1_v1_best = v1_v1_group[score].max() if len(v1_v1_group) > 0 else 0.0
+            v2_v2_best = v2_v2_group[score].max() if len(v2_v2_group) > 0 else 0.0
+            v1_v2_best = None
+            v2_v1_best = None
+            v1_v2_model_number = None
+            v2_v1_model_number = None
+
+            if v1_v1_best > v2_v2_best:
+                best_source = 'v1_v1'
+                best_score = v1_v1_best
+                v1_v1_model_number = (
+                    v1_v1_group.loc[v1_v1_group[score].idxmax(), 'Model Number'] if len(v1_v1_group) > 0 else None
+                )
+                v2_v2_group = v2_v2_group[v2_v2_group['Model Number'] != v1_v1_model_number]
+
+                v2_v2_model_number = (
+                    v2_v2_group.loc[v2_v2_group[score].idxmax(), 'Model Number'] if len(v2_v2_group) > 0 else None
+                )
+                v2_v2_best = v2_v2_group[score].max() if len(v2_v2_group) > 0 else 0.0
+            else:
+                best_source = 'v2_v2'
+                best_score = v2_v2_best
+                v2_v2_model_number = (
+                    v2_v2_group.loc[v2_v2_group[score].idxmax(), 'Model Number'] if len(v2_v2_group) > 0 else None
+                )
+                v1_v1_group = v1_v1_group[v1_v1_group['Model Number'] != v2_v2_model_number]
+
+                v1_v1_model_number = (
+                    v1_v1_group.loc[v1_v1_group[score].idxmax(), 'Model Number'] if len(v1_v1_group) > 0 else None
+                )
+                v1_v1_best = v1_v1_group[score].max() if len(v1_v1_group) > 0 else 0.0
+
+
+
+        cumulative_score = 0
+        best_v1_ref = 0
+        best_v2_ref = 0
+        best_v1_ref_model_number = 0
+        best_v2_ref_model_number = 0
+        if best_source == 'v1_v1':
+            cumulative_score = v1_v1_best + v2_v2_best
+            best_v1_ref = v1_v1_best
+            best_v2_ref = v2_v2_best
+            best_v1_ref_model_number = 'v1' + '_' + str(v1_v1_model_number)
+            best_v2_ref_model_number = 'v2' + '_' + str(v2_v2_model_number)
+        elif best_source == 'v1_v2':
+            cumulative_score = v1_v2_best + v2_v1_best
+            best_v1_ref = v1_v2_best
+            best_v2_ref = v2_v1_best
+            best_v1_ref_model_number = 'v2' + '_' + str(v1_v2_model_number)
+            best_v2_ref_model_number = 'v1' + '_' + str(v2_v1_model_number)
+        elif best_source == 'v2_v1':
+            cumulative_score = v2_v1_best + v1_v2_best
+            best_v2_ref = v2_v1_best
+            best_v1_ref = v1_v2_best
+            best_v2_ref_model_number = 'v1' + '_' + str(v2_v1_model_number)
+            best_v1_ref_model_number = 'v2' + '_' + str(v1_v2_model_number)
+        elif best_source == 'v2_v2':
+            cumulative_score = v2_v2_best + v1_v1_best
+            best_v2_ref = v2_v2_best
+            best_v1_ref = v1_v1_best
+            best_v2_ref_model_number = 'v2' + '_' + str(v2_v2_model_number)
+            best_v1_ref_model_number = 'v1' + '_' + str(v1_v1_model_number)
+        else:
+            raise
+
+        # Extract group number from group string (e.g., TS314 -> 314)
+        group_number = str(int(''.join(filter(str.isdigit, group)))).zfill(3)
+        group_name = group_name_lookup.get(group_number, "Unknown").strip()
+
+        if cumulative_score > 0: # only include groups with a positive cumulative score
+            # Store results
+            results.append({
+                'Group': group,
+                'Group_Name': group_name,
+                'Combined_Score': cumulative_score,
+                'Best_v1_ref': best_v1_ref,
+                'Best_v2_ref': best_v2_ref,
+                'V1_Model_For_Combined_Score': group + '_' + best_v1_ref_model_number,
+                'V2_Model_For_Combined_Score': group + '_' + best_v2_ref_model_number,
+                'Best_Score': best_score,
+                'Best_Source': best_source,
+                'v1_v1_Score': v1_v1_best,
+                'v1_v2_Score': v1_v2_best,
+                'v2_v1_Score': v2_v1_best,
+                'v2_v2_Score': v2_v2_best,
+                'v1_v1_ModelNumber': v1_v1_model_number,
+                'v1_v2_ModelNumber': v1_v2_model_number,
+                'v2_v1_ModelNumber': v2_v1_model_number,
+                'v2_v2_ModelNumber': v2_v2_model_number
+            })
+
+    # Convert results to DataFrame
+    results_df = pd.DataFrame(results)
+    return results_df
+
+def get_best_fit_single_state(ID, v1_df, score):
+    """Single state version of get_best_fit - only uses v1 data"""
+    group_name_lookup = get_group_name_lookup()
+    if (
+        'Model Version' not in v1_df.columns or 
+        (('Model Version' in v1_df.columns and v1_df['Model Version'].isna().all()))
+    ):
+        v1_df_by_model_v1 = v1_df
+    else:
+        v1_df_by_model_v1 = v1_df[v1_df['Model Version'] == 'v1']
+    
+
+    # Initialize empty lists to store results
+    groups = v1_df['Group'].unique()
+    results = []
+
+    one_group_only = False
+    if ID == 'R1203' or ID == 'T1214':
+        one_group_only = True
+
+    # Loop through each group
+    for group in groups:
+
+        if not(one_group_only):
+
+            # Get indices of max scores for each group, excluding groups where all scores are NaN
+            v1_v1_indices = v1_df_by_model_v1.groupby('Group')[score].idxmax()
+
+            # Filter out groups where idxmax returned NaN (all scores were NaN)
+            v1_df_by_model_v1 = v1_df_by_model_v1.loc[v1_v1_indices.dropna()]
+
+            v1_df_by_model_v1 = v1_df_by_model_v1.sort_values(by=score, ascending=False)
+
+            # Get best scores for each version/model combination for this group
+            v1_v1_group = v1_df_by_model_v1[v1_df_by_model_v1['Group'] == group]
+
+            v1_v1_best = v1_v1_group[score].max() if len(v1_v1_group) > 0 else 0.0
+
+            # Get model numbers for the best scores
+            v1_v1_model_number = (
+                v1_v1_group.loc[v1_v1_group[score].idxmax(), 'Model Number'] if len(v1_v1_group) > 0 else None
+            )
+
+            # Find the best overall score for this group
+            if v1_v1_best != 0.0:  
+                best_score = v1_v1_best
+                best_source = 'v1_v1'
+            else:
+                best_score = 0.0
+                best_source = 'v1_v1'
+        else:
+            v1_df_by_model_v1 = v1_df_by_model_v1.sort_values(by=score, ascending=False)
+
+            # Get best scores for each version/model combination for this group
+            v1_v1_group = v1_df_by_model_v1[v1_df_by_model_v1['Group'] == group]
+
+            v1_v1_best = v1_v1_group[score].max() if len(v1_v1_group) > 0 else 0.0
+
+            if v1_v1_best != 0.0:
+                best_source = 'v1_v1'
+                best_score = v1_v1_best
+                v1_v1_model_number = (
+                    v1_v1_group.loc[v1_v1_group[score].idxmax(), 'Model Number'] if len(v1_v1_group) > 0 else None
+                )
+            else:
+                best_source = 'v1_v1'
+                best_score = v1_v1_best
+
+
+        cumulative_score = 0
+        best_v1_ref = 0
+        best_v1_ref_model_number = 0
+        if best_source == 'v1_v1':
+            cumulative_score = v1_v1_best
+            best_v1_ref = v1_v1_best
+            best_v1_ref_model_number = 'v1' + '_' + str(v1_v1_model_number)
+        else:
+            raise
+
+        # Extract group number from group string (e.g., TS314 -> 314)
+        group_number = str(int(''.join(filter(str.isdigit, group)))).zfill(3)
+        group_name = group_name_lookup.get(group_number, "Unknown").strip()
+
+        if cumulative_score > 0: # only include groups with a positive cumulative score
+            # Store results
+            results.append({
+                'Group': group,
+                'Group_Name': group_name,   
+                'Combined_Score': cumulative_score,
+                'Best_v1_ref': best_v1_ref,
+                'V1_Model_For_Combined_Score': group + '_' + best_v1_ref_model_number,
+                'Best_Score': best_score,
+                'Best_Source': best_source,
+                'v1_v1_Score': v1_v1_best,
+                'v1_v1_ModelNumber': v1_v1_model_number,
+            })
+
+    # Convert results to DataFrame
+    results_df = pd.DataFrame(results)
+    return results_df
+
+def get_best_fit_dual_state(ID, v1_df, v2_df, score):
+    """Dual state version of get_best_fit - finds best v1, then matching v2"""
+    group_name_lookup = get_group_name_lookup()
+    if (
+        'Model Version' not in v1_df.columns or 
+        (('Model Version' in v1_df.columns and v1_df['Model Version'].isna().all()))
+    ):
+        v1_df_by_model_v1 = v1_df
+    else:
+        v1_df_by_model_v1 = v1_df[v1_df['Model Version'] == 'v1']
+    
+
+    # Initialize empty lists to store results
+    groups = v1_df['Group'].unique()
+    results = []
+
+    one_group_only = False
+    if ID == 'R1203' or ID == 'T1214':
+        one_group_only = True
+
+    # Loop through each group
+    for group in groups:
+
+        if not(one_group_only):
+
+            # Get indices of max scores for each group, excluding groups where all scores are NaN
+            v1_v1_indices = v1_df_by_model_v1.groupby('Group')[score].idxmax()
+
+            # Filter out groups where idxmax returned NaN (all scores were NaN)
+            v1_df_by_model_v1 = v1_df_by_model_v1.loc[v1_v1_indices.dropna()]
+
+            v1_df_by_model_v1 = v1_df_by_model_v1.sort_values(by=score, ascending=False)
+
+            # Get best scores for each version/model combination for this group
+            v1_v1_group = v1_df_by_model_v1[v1_df_by_model_v1['Group'] == group]
+
+            v1_v1_best = v1_v1_group[score].max() if len(v1_v1_group) > 0 else 0.0
+
+            # Get model numbers for the best scores
+            v1_v1_model_number = (
+                v1_v1_group.loc[v1_v1_group[score].idxmax(), 'Model Number'] if len(v1_v1_group) > 0 else None
+            )
+
+            # Find the best overall score for this group
+            if v1_v1_best != 0.0:  
+                best_score = v1_v1_best
+                best_source = 'v1_v1'
+            else:
+                best_score = 0.0
+                best_source = 'v1_v1'
+        else:
+            v1_df_by_model_v1 = v1_df_by_model_v1.sort_values(by=score, ascending=False)
+
+            # Get best scores for each version/model combination for this group
+            v1_v1_group = v1_df_by_model_v1[v1_df_by_model_v1['Group'] == group]
+
+            v1_v1_best = v1_v1_group[score].max() if len(v1_v1_group) > 0 else 0.0
+
+            if v1_v1_best != 0.0:
+                best_source = 'v1_v1'
+                best_score = v1_v1_best
+                v1_v1_model_number = (
+                    v1_v1_group.loc[v1_v1_group[score].idxmax(), 'Model Number'] if len(v1_v1_group) > 0 else None
+                )
+            else:
+                best_source = 'v1_v1'
+                best_score = v1_v1_best
+
+
+        cumulative_score = 0
+        best_v1_ref = 0
+        best_v1_ref_model_number = 0
+        if best_source == 'v1_v1':
+            cumulative_score = v1_v1_best
+            best_v1_ref = v1_v1_best
+            best_v1_ref_model_number = 'v1' + '_' + str(v1_v1_model_number)
+        else:
+            raise
+
+        # Extract group number from group string (e.g., TS314 -> 314)
+        group_number = str(int(''.join(filter(str.isdigit, group)))).zfill(3)
+        group_name = group_name_lookup.get(group_number, "Unknown").strip()
+
+        v2_score_row = v2_df[(v2_df['Group'] == group) & (v2_df['Model Number'] == v1_v1_model_number)]
+        v2_score = v2_score_row[score].values[0] if not v2_score_row.empty else None
+
+        if v2_score is not None:
+            cumulative_score += v2_score
+
+        if cumulative_score > 0: # only include groups with a positive cumulative score
+            # Store results
+            results.append({
+                'Group': group,
+                'Group_Name': group_name,   
+                'Combined_Score': cumulative_score,
+                'Best_v1_ref': best_v1_ref,
+                'Best_v2_ref': v2_score,
+                'V1_Model_For_Combined_Score': group + '_' + best_v1_ref_model_number,
+                'v1_v1_Score': v1_v1_best,
+                'v1_v1_ModelNumber': v1_v1_model_number,
+                'v2_v2_Score': v2_score,
+                'v2_v2_ModelNumber': v2_score_row['Model Number'].values[0] if not v2_score_row.empty else None,
+            })
+
+    # Convert results to DataFrame
+    results_df = pd.DataFrame(results)
+    return results_df
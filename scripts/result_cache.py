@@ -0,0 +1,174 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+
+# On-disk cache of the combined_df frames returned by get_best_fit,
+# get_best_fit_single_state and get_best_fit_dual_state.
+#
+# Entries are pickles in ./output/RESULT_CACHE named by a sha256 of the input score CSV
+# bytes, the group-name lookup, the target/score/mode and the source of the scoring code,
+# so editing either the data or the scoring code misses the cache instead of returning
+# stale results. Hits are
+# refreshed on read and the least recently used entries are evicted once the cache holds
+# more than MAX_CACHE_ENTRIES files or MAX_CACHE_BYTES bytes.
+#
+# Usage:
+#     combined_df = get_combined_df(ID, score)                  # two-state
+#     combined_df = get_combined_df(ID, score, mode='single')   # or 'dual'
+#     python scripts/result_cache.py --clear
+
+import argparse
+import hashlib
+import os
+import pickle
+import tempfile
+from functools import lru_cache
+
+import pandas as pd
+
+from score_store import get_score_csv_path
+from group_registry import GROUP_LOOKUP_PATH
+from stage_profiler import stage
+from scoring_core import get_v1_ref_df, get_v2_ref_df, get_v2_ref_version, get_best_fit, \
+    get_best_fit_single_state, get_best_fit_dual_state
+
+CACHE_DIR = './output/RESULT_CACHE'
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+MAX_CACHE_ENTRIES = 1024
+MODES = ['two', 'single', 'dual']
+# Files whose source determines the combined_df for a given input
+SCORING_CODE_FILES = ['scoring_core.py', 'score_store.py', 'group_registry.py']
+
+
+@lru_cache(maxsize=None)
+def get_code_version():
+    hasher = hashlib.sha256()
+    scripts_dir = os.path.dirname(os.path.abspath(__file__))
+    for fname in SCORING_CODE_FILES:
+        with open(os.path.join(scripts_dir, fname), 'rb') as f:
+            hasher.update(f.read())
+    hasher.update(pd.__version__.encode())
+    return hasher.hexdigest()
+
+
+def get_input_paths(ID, score, mode):
+    paths = [get_score_csv_path(ID, 'v1', score)]
+    if mode != 'single':
+        paths.append(get_score_csv_path(ID, get_v2_ref_version(ID, score), score))
+    return paths
+
+
+def get_key_paths(ID, score, mode):
+    # Group_Name comes from the group lookup, so it is part of every entry's inputs
+    return get_input_paths(ID, score, mode) + [GROUP_LOOKUP_PATH]
+
+
+def get_cache_key(ID, score, mode):
+    hasher = hashlib.sha256()
+    hasher.update(f'{ID}|{score}|{mode}|{get_code_version()}'.encode())
+    for path in get_key_paths(ID, score, mode):
+        hasher.update(os.path.basename(path).encode())
+        with open(path, 'rb') as f:
+            hasher.update(f.read())
+    return hasher.hexdigest()
+
+
+def compute_combined_df(ID, score, mode):
+    v1_df = get_v1_ref_df(ID, score)
+    if mode == 'single':
+        with stage('selection', target=ID, metric=score):
+            return get_best_fit_single_state(ID, v1_df, score)
+    v2_df = get_v2_ref_df(ID, score)
+    with stage('selection', target=ID, metric=score):
+        if mode == 'dual':
+            return get_best_fit_dual_state(ID, v1_df, v2_df, score)
+        return get_best_fit(ID, v1_df, v2_df, score)
+
+
+def get_cache_entries(cache_dir=CACHE_DIR):
+    """Return (path, size, mtime) for every cache entry, least recently used first"""
+    if not os.path.isdir(cache_dir):
+        return []
+    entries = []
+    for fname in os.listdir(cache_dir):
+        if fname.endswith('.pkl'):
+            path = os.path.join(cache_dir, fname)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+    return sorted(entries, key=lambda entry: entry[2])
+
+
+def evict_cache(cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, max_entries=MAX_CACHE_ENTRIES):
+    entries = get_cache_entries(cache_dir)
+    total_bytes = sum(size for _, size, _ in entries)
+    while entries and (total_bytes > max_bytes or len(entries) > max_entries):
+        path, size, _ = entries.pop(0)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total_bytes -= size
+
+
+def get_combined_df(ID, score, mode='two', use_cache=True, cache_dir=CACHE_DIR):
+    """
+    Return the combined_df for (ID, score) in the given mode ('two', 'single' or 'dual'),
+    loading it from the result cache when the inputs and scoring code are unchanged.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode}, expected one of {MODES}")
+    if not use_cache:
+        return compute_combined_df(ID, score, mode)
+
+    cache_path = os.path.join(cache_dir, f'{get_cache_key(ID, score, mode)}.pkl')
+    try:
+        with stage('cache_read', target=ID, metric=score):
+            with open(cache_path, 'rb') as f:
+                combined_df = pickle.load(f)
+        os.utime(cache_path)
+        return combined_df
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        pass
+
+    combined_df = compute_combined_df(ID, score, mode)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write to a temporary file first so parallel workers never read a partial entry
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        pickle.dump(combined_df, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+    evict_cache(cache_dir)
+    return combined_df
+
+
+def clear_cache(cache_dir=CACHE_DIR):
+    for path, _, _ in get_cache_entries(cache_dir):
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Inspect or clear the combined_df result cache')
+    parser.add_argument('--clear', action='store_true', help='Remove every cache entry')
+    args = parser.parse_args()
+
+    if args.clear:
+        clear_cache()
+        print(f"Cleared {CACHE_DIR}")
+    entries = get_cache_entries()
+    print(f"{len(entries)} entries, {sum(size for _, size, _ in entries) / 1024:.1f} KB in {CACHE_DIR}")
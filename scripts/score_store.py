@@ -0,0 +1,212 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+# Columnar score store for the ./data/{ID}_{version}_{score}_scores.csv inputs.
+#
+# The ingest step converts every per-target, per-version, per-metric score CSV into an
+# Arrow IPC file laid out as
+#
+#     ./output/SCORE_STORE/target={ID}/metric={score}/version={version}.arrow
+#
+# with categorical Group/Model Version columns and the smallest integer type that holds
+# the model numbers. Scores stay float64 so rankings are unchanged. Each file records the
+# dtypes and column order of its source CSV, so read_score_table returns exactly the frame
+# pd.read_csv would have returned. Reads only open the file for the requested target,
+# metric and version, and fall back to the CSV when the store is missing or stale.
+#
+# Usage:
+#     python scripts/score_store.py
+
+import json
+import os
+
+import pandas as pd
+
+from data_manifest import DATA_DIR, find_score_file, get_score_path
+from data_manifest import list_score_files as list_manifest_files
+
+STORE_DIR = './output/SCORE_STORE'
+CATEGORICAL_COLUMNS = ['Group', 'Model Version']
+METADATA_KEY = b'casp_score_store'
+
+
+def get_score_csv_path(ID, version, score, data_dir=DATA_DIR):
+    return get_score_path(ID, version, score, data_dir=data_dir)
+
+
+def get_store_path(ID, version, score, store_dir=STORE_DIR):
+    return f'{store_dir}/target={ID}/metric={score}/version={version}.arrow'
+
+
+def list_score_files(data_dir=DATA_DIR):
+    """Return (ID, version, score, path) for every all-models score CSV in data_dir"""
+    # *_best_scores.csv files hold one row per group and use a different layout
+    return list_manifest_files('all', data_dir)
+
+
+def compact_score_frame(df):
+    """Downcast a score frame for storage: categorical strings and small integer model numbers"""
+    df = df.copy()
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype('category')
+    if 'Model Number' in df.columns and pd.api.types.is_integer_dtype(df['Model Number']):
+        df['Model Number'] = pd.to_numeric(df['Model Number'], downcast='unsigned')
+    return df
+
+
+def source_signature(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def write_score_table(df, store_path, source_path):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    metadata = {
+        'columns': list(df.columns),
+        'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()},
+        'source': source_signature(source_path),
+    }
+    table = pa.Table.from_pandas(compact_score_frame(df), preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                           METADATA_KEY: json.dumps(metadata).encode()})
+    os.makedirs(os.path.dirname(store_path), exist_ok=True)
+    feather.write_feather(table, store_path, compression='uncompressed')
+
+
+def ingest_score_store(data_dir=DATA_DIR, store_dir=STORE_DIR):
+    """Convert every score CSV in data_dir into the columnar store"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("The columnar score store requires pyarrow: pip install pyarrow") from e
+
+    score_files = list_score_files(data_dir)
+    for ID, version, score, path in score_files:
+        store_path = get_store_path(ID, version, score, store_dir)
+        write_score_table(pd.read_csv(path), store_path, path)
+        print(f"Wrote {store_path}")
+    return len(score_files)
+
+
+def read_store_metadata(store_path, source_path=None):
+    """The metadata of one store file, or None if it is missing, stale or pyarrow is not installed"""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return None
+    if not os.path.exists(store_path):
+        return None
+
+    with pa.memory_map(store_path) as source:
+        schema = pa.ipc.open_file(source).schema
+    metadata = json.loads(schema.metadata[METADATA_KEY])
+    if source_path is not None and os.path.exists(source_path) and source_signature(source_path) != metadata['source']:
+        return None
+    return metadata
+
+
+def store_frame(table, metadata):
+    """Convert an Arrow table or record batch of the store back to a frame with the source CSV dtypes"""
+    import pyarrow as pa
+
+    # Decoding the categorical columns in Arrow is much cheaper than astype on the pandas side
+    columns = [col.cast(col.type.value_type) if pa.types.is_dictionary(col.type) else col
+               for col in table.columns]
+    df = pa.table(columns, names=table.column_names).to_pandas()[metadata['columns']]
+    for col, dtype in metadata['dtypes'].items():
+        if str(df[col].dtype) != dtype:
+            df[col] = df[col].astype(dtype)
+    df.columns = pd.Index(metadata['columns'])
+    return df
+
+
+def read_store_table(store_path, source_path=None):
+    """Read one store file back with its source CSV dtypes, or None if it is missing or stale"""
+    metadata = read_store_metadata(store_path, source_path)
+    if metadata is None:
+        return None
+    import pyarrow.feather as feather
+
+    return store_frame(feather.read_table(store_path, memory_map=True), metadata)
+
+
+def iter_store_batches(store_path, metadata, max_rows=None):
+    """Yield the rows of one store file as frames of at most max_rows rows, one record batch at a time"""
+    import pyarrow as pa
+
+    with pa.memory_map(store_path) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            step = max_rows or max(batch.num_rows, 1)
+            for start in range(0, batch.num_rows, step):
+                yield store_frame(batch.slice(start, step), metadata)
+
+
+def read_score_table(ID, version, score, data_dir=DATA_DIR, store_dir=STORE_DIR):
+    """Read {ID}_{version}_{score}_scores.csv, from the columnar store when it is up to date"""
+    csv_path = get_score_csv_path(ID, version, score, data_dir)
+    df = read_store_table(get_store_path(ID, version, score, store_dir), csv_path)
+    if df is None:
+        df = pd.read_csv(csv_path)
+    return df
+
+
+def score_table_exists(ID, version, score, data_dir=DATA_DIR, store_dir=STORE_DIR):
+    return find_score_file(ID, version, score, data_dir=data_dir) is not None or \
+        os.path.exists(get_store_path(ID, version, score, store_dir))
+
+
+def scan_score_store(targets=None, metrics=None, versions=None, store_dir=STORE_DIR):
+    """
+    Read several store files into one long frame with target/metric/version columns.
+    Only files whose target, metric and version pass the filters are opened; the score
+    column is renamed to 'Score'.
+    """
+    frames = []
+    if not os.path.isdir(store_dir):
+        return pd.DataFrame()
+    for target_dir in sorted(os.listdir(store_dir)):
+        ID = target_dir.split('=', 1)[-1]
+        if targets is not None and ID not in targets:
+            continue
+        for metric_dir in sorted(os.listdir(os.path.join(store_dir, target_dir))):
+            score = metric_dir.split('=', 1)[-1]
+            if metrics is not None and score not in metrics:
+                continue
+            for version_file in sorted(os.listdir(os.path.join(store_dir, target_dir, metric_dir))):
+                version = version_file.split('=', 1)[-1].replace('.arrow', '')
+                if versions is not None and version not in versions:
+                    continue
+                df = read_store_table(os.path.join(store_dir, target_dir, metric_dir, version_file))
+                df = df.rename(columns={score: 'Score'})
+                df['target'], df['metric'], df['version'] = ID, score, version
+                frames.append(df)
+    if not frames:
+        return pd.DataFrame()
+    scores = pd.concat(frames, ignore_index=True)
+    for col in ['target', 'metric', 'version'] + CATEGORICAL_COLUMNS:
+        if col in scores.columns:
+            scores[col] = scores[col].astype('category')
+    return scores
+
+
+if __name__ == "__main__":
+    num_files = ingest_score_store()
+    print(f"Ingested {num_files} score files into {STORE_DIR}")
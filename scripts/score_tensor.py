@@ -0,0 +1,282 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+# Dense score tensor of one target/metric.
+#
+# values[group, model number, model version, reference] holds the score of every model
+# against the v1 and V2 reference states (NaN where a model was not submitted or not
+# scored), with the group, model number and model version axes integer-coded by the
+# lists in the tensor's axes. Two int32 tensors of the same shape keep the information
+# the DataFrame engines use to break ties: 'order' is the position of the entry in the
+# descending score sort of its reference table and 'row' its position in the table
+# (-1 where values is NaN). A model listed twice in a table (the M1228/M1239 TMscore and
+# T1249 GDT_TS files) keeps its best score there. 'first[group, model number, reference]'
+# holds the score of the first table row of every model number, of any version, which is
+# the V2 score get_best_fit_dual_state reads. Targets without model versions have one
+# version axis entry.
+#
+# Tensors are saved as .npy files plus an axes.json under ./output/SCORE_TENSOR/{ID}_{score}/
+# and opened memory-mapped. The two-state, single-state and dual-state Combined_Score
+# of every group are reductions over the model axes; with dtype=np.float64 they equal
+# the Combined_Score of get_best_fit, get_best_fit_single_state and
+# get_best_fit_dual_state.
+#
+# Usage:
+#     python scripts/score_tensor.py            # build and save every TARGET_SCORE_DICT tensor
+#     tensor = get_score_tensor('T1228', 'GDT_TS')
+#     combined = get_two_state_scores(tensor)   # one Combined_Score per tensor['groups'] entry
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from score_store import get_score_csv_path, read_score_table, source_signature
+from data_manifest import get_v2_reference_version
+from scoring_core import solve_distinct_pairs
+
+TENSOR_DIR = './output/SCORE_TENSOR'
+# Targets whose two states must come from different models (as in get_best_fit)
+ONE_GROUP_ONLY = ['R1203', 'T1214']
+PAIRINGS = ['v1_v1', 'v1_v2', 'v2_v1', 'v2_v2']
+TENSOR_ARRAYS = ['values', 'order', 'row', 'first']
+
+
+def get_references(ID, score):
+    """The reference states of a two-state tensor: v1 and the V2 reference"""
+    return ['v1', get_v2_reference_version(ID, score)]
+
+
+def load_reference_tables(ID, score, references=None):
+    """The reference score tables as stored, without the loaders' T1214 version labels"""
+    frames = []
+    for version in references or get_references(ID, score):
+        df = read_score_table(ID, version, score)
+        # An empty Model Version column means the target has no model versions (T1214)
+        if 'Model Version' in df.columns and df['Model Version'].isna().all():
+            df = df.drop(columns='Model Version')
+        frames.append(df.dropna())
+    return frames
+
+
+def has_model_versions(df):
+    return 'Model Version' in df.columns and not df['Model Version'].isna().all()
+
+
+def build_score_tensor(ID, score, v1_df=None, v2_df=None, dtype=np.float32, references=None, frames=None):
+    """
+    Build the tensor of ID/score from the reference tables (loaded when not given).
+    references lists the reference states along the last axis (v1 and the V2 reference by
+    default); frames can hold their tables, in the same order, instead of v1_df and v2_df.
+    """
+    references = references or get_references(ID, score)
+    if frames is None:
+        frames = [v1_df, v2_df] if v1_df is not None and v2_df is not None else \
+            load_reference_tables(ID, score, references)
+    versioned = any(has_model_versions(df) for df in frames)
+    groups = pd.Index(pd.concat([df['Group'] for df in frames]).unique())
+    model_numbers = pd.Index(pd.concat([df['Model Number'] for df in frames]).unique()).sort_values()
+    model_versions = pd.Index(sorted(pd.concat([df['Model Version'] for df in frames if 'Model Version' in df.columns])
+                                     .dropna().unique())) if versioned else pd.Index([''])
+
+    shape = (len(groups), len(model_numbers), len(model_versions), len(frames))
+    values = np.full(shape, np.nan, dtype=dtype)
+    order = np.full(shape, -1, dtype=np.int32)
+    row = np.full(shape, -1, dtype=np.int32)
+    first = np.full(shape[:2] + shape[3:], np.nan, dtype=dtype)
+    for ref, df in enumerate(frames):
+        listed = df.drop_duplicates(['Group', 'Model Number'], keep='first')
+        first[groups.get_indexer(listed['Group']), model_numbers.get_indexer(listed['Model Number']), ref] = \
+            listed[score].to_numpy()
+        df = df.assign(row=np.arange(len(df)))
+        df = df.sort_values(by=score, ascending=False).assign(order=np.arange(len(df)))
+        key = ['Group', 'Model Number', 'Model Version'] if versioned else ['Group', 'Model Number']
+        if versioned:
+            df = df[df['Model Version'].isin(model_versions)]
+        # A model listed twice keeps its best score
+        df = df.drop_duplicates(key, keep='first')
+        g, n = groups.get_indexer(df['Group']), model_numbers.get_indexer(df['Model Number'])
+        v = model_versions.get_indexer(df['Model Version']) if versioned else np.zeros(len(df), dtype=int)
+        values[g, n, v, ref] = df[score].to_numpy()
+        order[g, n, v, ref] = df['order'].to_numpy()
+        row[g, n, v, ref] = df['row'].to_numpy()
+    return {
+        'ID': ID, 'score': score, 'values': values, 'order': order, 'row': row, 'first': first,
+        'groups': groups.tolist(), 'model_numbers': model_numbers.tolist(),
+        'model_versions': model_versions.tolist(), 'references': list(references),
+    }
+
+
+def get_tensor_dir(ID, score, tensor_dir=TENSOR_DIR, references=None):
+    if references is None or list(references) == get_references(ID, score):
+        return f'{tensor_dir}/{ID}_{score}'
+    return f'{tensor_dir}/{ID}_{score}_{"_".join(references)}'
+
+
+def get_source_signatures(ID, score, references=None):
+    return [source_signature(get_score_csv_path(ID, version, score))
+            for version in references or get_references(ID, score)]
+
+
+def save_score_tensor(tensor, path, sources=None):
+    os.makedirs(path, exist_ok=True)
+    for name in TENSOR_ARRAYS:
+        np.save(f'{path}/{name}.npy', tensor[name])
+    axes = {key: tensor[key] for key in ['ID', 'score', 'groups', 'model_numbers', 'model_versions', 'references']}
+    # axes.json is written last, so a tensor without one is incomplete
+    with open(f'{path}/axes.json', 'w') as f:
+        json.dump({**axes, 'dtype': str(tensor['values'].dtype), 'sources': sources}, f, indent=1)
+
+
+def load_score_tensor(path, mmap_mode='r'):
+    """Open a saved tensor; with mmap_mode='r' the arrays are read from disk on access"""
+    with open(f'{path}/axes.json') as f:
+        axes = json.load(f)
+    tensor = {key: axes[key] for key in ['ID', 'score', 'groups', 'model_numbers', 'model_versions', 'references']}
+    for name in TENSOR_ARRAYS:
+        tensor[name] = np.load(f'{path}/{name}.npy', mmap_mode=mmap_mode)
+    return tensor, axes
+
+
+def get_score_tensor(ID, score, dtype=np.float32, tensor_dir=TENSOR_DIR, references=None):
+    """The tensor of ID/score from tensor_dir, rebuilt when its score CSVs changed"""
+    path = get_tensor_dir(ID, score, tensor_dir, references)
+    sources = get_source_signatures(ID, score, references)
+    if all(os.path.exists(f'{path}/{name}') for name in ['axes.json'] + [f'{name}.npy' for name in TENSOR_ARRAYS]):
+        tensor, axes = load_score_tensor(path)
+        if axes['sources'] == sources and axes['dtype'] == np.dtype(dtype).name:
+            return tensor
+    tensor = build_score_tensor(ID, score, dtype=dtype, references=references)
+    save_score_tensor(tensor, path, sources)
+    return tensor
+
+
+def get_version_mask(tensor, version):
+    """Model versions counted as version ('v1' or 'v2'); every version when the target has none"""
+    model_versions = np.array(tensor['model_versions'])
+    return (model_versions == version) | (model_versions == '')
+
+
+def best_over_models(values, member):
+    """Best score over the trailing model axes among members, 0.0 (get_best_fit's fill) if there is none"""
+    masked = np.where(member & ~np.isnan(values), values, -np.inf)
+    best = masked.max(axis=tuple(range(1, masked.ndim)), initial=-np.inf)
+    return np.where(best == -np.inf, 0.0, best)
+
+
+def best_model_numbers(values, member, rank, numbers=None):
+    """
+    Model number index of every group's best member entry, ties to the lowest rank (-1 if none).
+    numbers (shaped like values) names the model of every entry instead, e.g. bootstrap slots.
+    """
+    member = member & ~np.isnan(values)
+    masked = np.where(member, values, -np.inf)
+    flat_masked = masked.reshape(masked.shape[0], int(np.prod(masked.shape[1:])))
+    if flat_masked.shape[1] == 0:
+        return np.full(masked.shape[0], -1)
+    tied = member.reshape(flat_masked.shape) & (flat_masked == flat_masked.max(axis=1, keepdims=True, initial=-np.inf))
+    best = np.where(tied, rank.reshape(flat_masked.shape), np.iinfo(np.int32).max).argmin(axis=1)
+    if numbers is None:
+        numbers = np.unravel_index(best, masked.shape[1:])[0]
+    else:
+        numbers = np.take_along_axis(numbers.reshape(flat_masked.shape), best[:, None], axis=1)[:, 0]
+    return np.where(member.reshape(flat_masked.shape).any(axis=1), numbers, -1)
+
+
+def get_pairing_scores(tensor):
+    """Best score of every group for each reference/model version pairing ('v1_v2': v1 reference, v2 models)"""
+    values = np.asarray(tensor['values'], dtype=float)
+    pairing_scores = {}
+    for pairing in PAIRINGS:
+        reference, version = pairing.split('_')
+        ref = 0 if reference == 'v1' else 1
+        member = np.broadcast_to(get_version_mask(tensor, version), values.shape[:3])
+        pairing_scores[pairing] = best_over_models(values[..., ref], member)
+    return pairing_scores
+
+
+def combine_pairing_scores(best):
+    """get_best_fit's Combined_Score from the best score of every pairing (see get_pairing_scores)"""
+    # Best_Source ties are broken in the order v1_v1, v2_v2, v1_v2, v2_v1
+    scores = np.stack([best[source] for source in ['v1_v1', 'v2_v2', 'v1_v2', 'v2_v1']], axis=-1)
+    masked = np.where(scores != 0.0, scores, -np.inf)
+    source = np.argmax(masked == masked.max(axis=-1, keepdims=True), axis=-1)
+    same_version = (source < 2) | (scores == 0.0).all(axis=-1)
+    return np.where(same_version, best['v1_v1'] + best['v2_v2'], best['v1_v2'] + best['v2_v1'])
+
+
+def get_distinct_model_scores(values, member, rank, numbers, pairing='greedy'):
+    """
+    Combined_Score of every group when the two states must use different models, as
+    get_best_fit computes it for ONE_GROUP_ONLY: each state's best and runner-up model are
+    paired by solve_distinct_pairs. values and rank end with the v1/V2 reference axis;
+    member and numbers (the model of every entry) have the shape of one reference.
+    """
+    best, models, runner_up = [], [], []
+    for ref in range(2):
+        best.append(best_over_models(values[..., ref], member))
+        models.append(best_model_numbers(values[..., ref], member, rank[..., ref], numbers))
+        other = numbers != models[ref].reshape((-1,) + (1,) * (numbers.ndim - 1))
+        runner_up.append(best_over_models(values[..., ref], member & other))
+    v1_second, v2_second = solve_distinct_pairs(best[0], runner_up[0], best[1], runner_up[1],
+                                                (models[0] == models[1]) & (models[0] >= 0), pairing)
+    return np.where(v1_second, runner_up[0], best[0]) + np.where(v2_second, runner_up[1], best[1])
+
+
+def get_two_state_scores(tensor, pairing='greedy'):
+    """Two-state Combined_Score of every group, as computed by get_best_fit"""
+    values = np.asarray(tensor['values'], dtype=float)
+    if tensor['ID'] in ONE_GROUP_ONLY:
+        numbers = np.broadcast_to(np.arange(values.shape[1])[None, :, None], values.shape[:3])
+        return get_distinct_model_scores(values, np.ones(values.shape[:3], dtype=bool), tensor['order'], numbers, pairing)
+    return combine_pairing_scores(get_pairing_scores(tensor))
+
+
+def get_single_state_scores(tensor):
+    """Single-state Combined_Score of every group, as computed by get_best_fit_single_state"""
+    return get_pairing_scores(tensor)['v1_v1']
+
+
+def get_dual_state_scores(tensor):
+    """Dual-state Combined_Score of every group, as computed by get_best_fit_dual_state"""
+    values = np.asarray(tensor['values'], dtype=float)
+    member = np.broadcast_to(get_version_mask(tensor, 'v1'), values.shape[:3])
+    v1_v1 = best_over_models(values[..., 0], member)
+    # get_best_fit_dual_state takes the first best row in the sorted table for R1203/T1214
+    # and in table order otherwise
+    rank = tensor['order'] if tensor['ID'] in ONE_GROUP_ONLY else tensor['row']
+    v1_model = best_model_numbers(values[..., 0], member, rank[..., 0])
+
+    # The V2 reference score of the same model number, first table row of any version
+    v2_score = np.asarray(tensor['first'][np.arange(values.shape[0]), np.maximum(v1_model, 0), 1], dtype=float)
+    v2_score = np.where((v1_model >= 0) & ~np.isnan(v2_score), v2_score, 0.0)
+    return v1_v1 + v2_score
+
+
+def get_frame_memory(ID, score):
+    return sum(df.memory_usage(deep=True).sum() for df in load_reference_tables(ID, score))
+
+
+if __name__ == "__main__":
+    from process_two_state_score import TARGET_SCORE_DICT
+
+    for ID, scores in TARGET_SCORE_DICT.items():
+        for score in scores:
+            tensor = get_score_tensor(ID, score)
+            print(f"{ID} {score}: {tensor['values'].shape} tensor, "
+                  f"{sum(tensor[name].nbytes for name in ['values', 'order', 'row']) / 1024:.1f} KB "
+                  f"(DataFrames {get_frame_memory(ID, score) / 1024:.1f} KB)")
@@ -0,0 +1,336 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+# Plotting-free scoring core: the score loaders, the group-name lookup and the two-state,
+# single-state and dual-state selection engines.
+#
+# Only pandas, numpy and the score store are imported here, so the table scripts, the
+# result cache and CSV-only runs do not pay for importing matplotlib and adjustText.
+# process_two_state_score re-exports these functions next to the plotting code, which
+# imports its plotting backends only when a figure is requested.
+#
+# Usage:
+#     from scoring_core import get_v1_ref_df, get_v2_ref_df, get_best_fit
+#     combined_df = get_best_fit(ID, get_v1_ref_df(ID, score), get_v2_ref_df(ID, score), score)
+
+import numpy as np
+import pandas as pd
+
+from score_store import read_score_table
+from data_manifest import get_v2_reference_version
+from group_registry import load_group_lookup, get_group_names
+from stage_profiler import stage
+
+# Rules for pairing the two states of R1203/T1214, where both may not use the same model
+DISTINCT_PAIRINGS = ['greedy', 'optimal']
+
+def frange(start, stop, step):
+    vals = []
+    while start <= stop:
+        vals.append(start)
+        start += step
+    return vals
+
+def prepare_reference_df(ID, df, model_version):
+    """Label the models of T1214, whose score files have no model versions, and drop incomplete rows"""
+    if ID == "T1214":
+        df['Model Version'] = model_version
+    return df.dropna()
+
+def get_v1_ref_df(ID, score):
+    with stage('load', target=ID, metric=score):
+        df = prepare_reference_df(ID, read_score_table(ID, 'v1', score), 'v1')
+    return df
+
+def get_v2_ref_version(ID, score):
+    # v2, or the re-released v1_1 / v2_1 state of targets without one (T1228, T1239)
+    return get_v2_reference_version(ID, score)
+
+def get_v2_ref_df(ID, score):
+    with stage('load', target=ID, metric=score):
+        df = prepare_reference_df(ID, read_score_table(ID, get_v2_ref_version(ID, score), score), 'v2')
+    return df
+
+def get_group_name_lookup():
+    return load_group_lookup()
+
+def get_group_number(group):
+    # Extract group number from group string (e.g., TS314 -> 314)
+    return str(int(''.join(filter(str.isdigit, group)))).zfill(3)
+
+def best_rows_by_group(df, score):
+    """Return the first highest-scoring row of every group, indexed by Group"""
+    df = df[df[score].notna()]
+    best = df.loc[df.groupby('Group', sort=False)[score].idxmax()]
+    return best.set_index('Group')
+
+def model_number_column(values, dtype):
+    """Give a selected model number column the dtype the per-group loop used to produce"""
+    if values.isna().all():
+        return pd.Series([None] * len(values), index=values.index, dtype=object)
+    if values.isna().any():
+        return values.astype(float) if pd.api.types.is_numeric_dtype(dtype) else values
+    return values.astype(dtype)
+
+def runner_up_rows_by_group(df, score, best_rows):
+    """Return the best row of every group among the models other than the group's best model"""
+    best_model = df['Group'].map(best_rows['Model Number'])
+    return best_rows_by_group(df[df['Model Number'] != best_model], score)
+
+def solve_distinct_pairs(v1_best, v1_runner_up, v2_best, v2_runner_up, same_model, pairing='greedy'):
+    """
+    Pair one V1 and one V2 model per group when the two states must use different models.
+    Takes arrays of each state's best score, the best score among its other models and
+    whether both best scores come from the same model. 'greedy' keeps the best model of the
+    better state (V2 on ties) and gives the other state its best remaining model; 'optimal'
+    maximises the summed score and picks the greedy pair on ties.
+    Returns boolean arrays marking where V1 and V2 take their runner-up instead of their best.
+    """
+    v1_first = v1_best > v2_best
+    if pairing == 'greedy':
+        keep_v1 = v1_first
+    elif pairing == 'optimal':
+        keep_v1_sum = v1_best + v2_runner_up
+        keep_v2_sum = v1_runner_up + v2_best
+        keep_v1 = (keep_v1_sum > keep_v2_sum) | ((keep_v1_sum == keep_v2_sum) & v1_first)
+    else:
+        raise ValueError(f"Unknown pairing '{pairing}', expected one of {DISTINCT_PAIRINGS}")
+    return same_model & ~keep_v1, same_model & keep_v1
+
+def get_best_fit(ID, v1_df, v2_df, score, pairing='greedy'):
+    if (
+        'Model Version' not in v1_df.columns or 
+        'Model Version' not in v2_df.columns or
+        (('Model Version' in v1_df.columns and v1_df['Model Version'].isna().all()) and
+         ('Model Version' in v2_df.columns and v2_df['Model Version'].isna().all()))
+    ):
+        v1_df_by_model_v1 = v1_df
+        v2_df_by_model_v2 = v2_df
+        v1_df_by_model_v2 = v1_df
+        v2_df_by_model_v1 = v2_df
+    else:
+        v1_df_by_model_v1 = v1_df[v1_df['Model Version'] == 'v1']
+        v1_df_by_model_v2 = v1_df[v1_df['Model Version'] == 'v2']
+        v2_df_by_model_v1 = v2_df[v2_df['Model Version'] == 'v1']
+        v2_df_by_model_v2 = v2_df[v2_df['Model Version'] == 'v2']
+
+    groups = pd.Index(pd.concat([v1_df['Group'], v2_df['Group']]).unique(), name='Group')
+    if len(groups) == 0:
+        return pd.DataFrame()
+    model_dtype = pd.concat([v1_df['Model Number'], v2_df['Model Number']]).dtype
+
+    one_group_only = False
+    if ID == 'R1203' or ID == 'T1214':
+        one_group_only = True
+        # Ties between models of a group are broken by the descending score sort
+        v1_df_by_model_v1 = v1_df_by_model_v1.sort_values(by=score, ascending=False)
+        v2_df_by_model_v2 = v2_df_by_model_v2.sort_values(by=score, ascending=False)
+
+    # Best row of every group for each reference/model version pairing, in one groupby per pairing
+    pairings = {
+        'v1_v1': v1_df_by_model_v1,
+        'v1_v2': v1_df_by_model_v2,
+        'v2_v1': v2_df_by_model_v1,
+        'v2_v2': v2_df_by_model_v2,
+    }
+    best = {}
+    best_rows = {}
+    model_numbers = {}
+    model_strings = {}
+    for source, df in pairings.items():
+        best_rows[source] = best_rows_by_group(df, score)
+        best[source] = best_rows[source][score].reindex(groups).fillna(0.0)
+        model_numbers[source] = best_rows[source]['Model Number'].reindex(groups)
+        model_strings[source] = best_rows[source]['Model Number'].astype(str).reindex(groups).fillna('None')
+
+    if not(one_group_only):
+        # Best_Source ties are broken in the order v1_v1, v2_v2, v1_v2, v2_v1
+        source_order = ['v1_v1', 'v2_v2', 'v1_v2', 'v2_v1']
+        scores = np.column_stack([best[source].to_numpy(dtype=float) for source in source_order])
+        assessed = scores != 0.0
+        masked_scores = np.where(assessed, scores, -np.inf)
+        best_score = np.where(assessed.any(axis=1), masked_scores.max(axis=1), 0.0)
+        source_index = np.argmax(masked_scores == best_score[:, None], axis=1)
+        source_index[~assessed.any(axis=1)] = 0
+        best_source = pd.Series(np.array(source_order)[source_index], index=groups)
+        same_version = best_source.isin(['v1_v1', 'v2_v2']).to_numpy()
+
+        cumulative_score = np.where(
+            same_version,
+            best['v1_v1'] + best['v2_v2'],
+            best['v1_v2'] + best['v2_v1'],
+        )
+        best_v1_ref = np.where(same_version, best['v1_v1'], best['v1_v2'])
+        best_v2_ref = np.where(same_version, best['v2_v2'], best['v2_v1'])
+        best_v1_ref_model_number = ('v1_' + model_strings['v1_v1']).where(same_version, 'v2_' + model_strings['v1_v2'])
+        best_v2_ref_model_number = ('v2_' + model_strings['v2_v2']).where(same_version, 'v1_' + model_strings['v2_v1'])
+        v1_v2_best = best['v1_v2']
+        v2_v1_best = best['v2_v1']
+        v1_v2_model_number = model_numbers['v1_v2']
+        v2_v1_model_number = model_numbers['v2_v1']
+    else:
+        # The two states must come from different models: every group only needs each
+        # state's best model and its best other model (the runner-up) to pick the pair.
+        v1_first = (best['v1_v1'] > best['v2_v2']).to_numpy()
+        best_score = np.where(v1_first, best['v1_v1'], best['v2_v2'])
+        best_source = pd.Series(np.where(v1_first, 'v1_v1', 'v2_v2'), index=groups)
+
+        runner_up = {
+            'v1_v1': runner_up_rows_by_group(v1_df_by_model_v1, score, best_rows['v1_v1']),
+            'v2_v2': runner_up_rows_by_group(v2_df_by_model_v2, score, best_rows['v2_v2']),
+        }
+        same_model = (model_numbers['v1_v1'] == model_numbers['v2_v2']).to_numpy()
+        take_runner_up = dict(zip(['v1_v1', 'v2_v2'], solve_distinct_pairs(
+            best['v1_v1'].to_numpy(), runner_up['v1_v1'][score].reindex(groups).fillna(0.0).to_numpy(),
+            best['v2_v2'].to_numpy(), runner_up['v2_v2'][score].reindex(groups).fillna(0.0).to_numpy(),
+            same_model, pairing)))
+
+        for source, rows in runner_up.items():
+            keep = ~take_runner_up[source]
+            best[source] = best[source].where(keep, rows[score].reindex(groups).fillna(0.0))
+            model_numbers[source] = model_numbers[source].where(keep, rows['Model Number'].reindex(groups))
+            model_strings[source] = model_strings[source].where(
+                keep, rows['Model Number'].astype(str).reindex(groups).fillna('None'))
+
+        cumulative_score = (best['v1_v1'] + best['v2_v2']).to_numpy()
+        best_v1_ref = best['v1_v1']
+        best_v2_ref = best['v2_v2']
+        best_v1_ref_model_number = 'v1_' + model_strings['v1_v1']
+        best_v2_ref_model_number = 'v2_' + model_strings['v2_v2']
+        v1_v2_best = pd.Series([None] * len(groups), index=groups, dtype=object)
+        v2_v1_best = v1_v2_best
+        v1_v2_model_number = v1_v2_best
+        v2_v1_model_number = v1_v2_best
+
+    # only include groups with a positive cumulative score
+    keep = cumulative_score > 0
+    if not keep.any():
+        return pd.DataFrame()
+    group_name = get_group_names(groups).values
+    results_df = pd.DataFrame({
+        'Group': groups,
+        'Group_Name': group_name,
+        'Combined_Score': cumulative_score,
+        'Best_v1_ref': best_v1_ref,
+        'Best_v2_ref': best_v2_ref,
+        'V1_Model_For_Combined_Score': groups + '_' + best_v1_ref_model_number,
+        'V2_Model_For_Combined_Score': groups + '_' + best_v2_ref_model_number,
+        'Best_Score': best_score,
+        'Best_Source': best_source,
+        'v1_v1_Score': best['v1_v1'],
+        'v1_v2_Score': v1_v2_best,
+        'v2_v1_Score': v2_v1_best,
+        'v2_v2_Score': best['v2_v2'],
+        'v1_v1_ModelNumber': model_numbers['v1_v1'],
+        'v1_v2_ModelNumber': v1_v2_model_number,
+        'v2_v1_ModelNumber': v2_v1_model_number,
+        'v2_v2_ModelNumber': model_numbers['v2_v2'],
+    }, index=groups)[keep]
+    # The loop built each column from the kept groups only, so their dtype depends on them
+    for column in ['v1_v1_ModelNumber', 'v1_v2_ModelNumber', 'v2_v1_ModelNumber', 'v2_v2_ModelNumber']:
+        results_df[column] = model_number_column(results_df[column], model_dtype)
+    return results_df.reset_index(drop=True)
+
+def get_v1_best_models(ID, v1_df, score):
+    """
+    Best v1-model score against the v1 reference and its model number for every group of
+    v1_df, as chosen by the single-state and dual-state modes. Returns (groups, scores,
+    model numbers, whether each group has a model number), with 0.0 for groups without one.
+    """
+    if 'Model Version' not in v1_df.columns or v1_df['Model Version'].isna().all():
+        v1_df_by_model_v1 = v1_df
+    else:
+        v1_df_by_model_v1 = v1_df[v1_df['Model Version'] == 'v1']
+    groups = pd.Index(v1_df['Group'].unique(), name='Group')
+
+    one_group_only = ID == 'R1203' or ID == 'T1214'
+    if one_group_only:
+        # Ties between models of a group are broken by the descending score sort
+        v1_df_by_model_v1 = v1_df_by_model_v1.sort_values(by=score, ascending=False)
+    best_rows = best_rows_by_group(v1_df_by_model_v1, score)
+    best_score = best_rows[score].reindex(groups).fillna(0.0)
+    model_numbers = best_rows['Model Number'].reindex(groups)
+    has_model = model_numbers.notna().to_numpy()
+    if one_group_only:
+        # The per-group loop only set the model number when the best score was non-zero and
+        # otherwise kept the previous group's model number
+        assigned = has_model & (best_score != 0.0).to_numpy()
+        source = np.maximum.accumulate(np.where(assigned, np.arange(len(groups)), -1))
+        has_model = source >= 0
+        model_numbers = pd.Series(model_numbers.to_numpy()[np.maximum(source, 0)], index=groups,
+                                  dtype=model_numbers.dtype).where(has_model)
+    return groups, best_score, model_numbers, has_model
+
+
+def get_best_fit_single_state(ID, v1_df, score):
+    """Single state version of get_best_fit - only uses v1 data"""
+    groups, v1_v1_best, model_numbers, _ = get_v1_best_models(ID, v1_df, score)
+    # only include groups with a positive cumulative score
+    keep = (v1_v1_best > 0).to_numpy()
+    if not keep.any():
+        return pd.DataFrame()
+    groups, v1_v1_best, model_numbers = groups[keep], v1_v1_best[keep], model_numbers[keep]
+    model_numbers = model_number_column(model_numbers, v1_df['Model Number'].dtype)
+
+    return pd.DataFrame({
+        'Group': groups,
+        'Group_Name': get_group_names(groups).values,
+        'Combined_Score': v1_v1_best,
+        'Best_v1_ref': v1_v1_best,
+        'V1_Model_For_Combined_Score': groups + '_v1_' + model_numbers.astype(str),
+        'Best_Score': v1_v1_best,
+        'Best_Source': 'v1_v1',
+        'v1_v1_Score': v1_v1_best,
+        'v1_v1_ModelNumber': model_numbers,
+    }, index=groups).reset_index(drop=True)
+
+
+def get_best_fit_dual_state(ID, v1_df, v2_df, score):
+    """Dual state version of get_best_fit - finds best v1, then matching v2"""
+    groups, v1_v1_best, model_numbers, has_model = get_v1_best_models(ID, v1_df, score)
+
+    # One keyed lookup of the first V2 row of every (Group, Model Number) pair
+    v2_first = v2_df.drop_duplicates(['Group', 'Model Number'], keep='first')
+    v2_rows = pd.MultiIndex.from_arrays([v2_first['Group'], v2_first['Model Number']]).get_indexer(
+        pd.MultiIndex.from_arrays([groups, model_numbers]))
+    v2_rows[~has_model] = -1
+    has_v2 = v2_rows >= 0
+    # get_indexer marks misses with -1, which picks the NaN appended after the V2 scores
+    v2_score = pd.Series(np.append(v2_first[score].to_numpy(dtype=float), np.nan)[v2_rows], index=groups)
+    cumulative_score = pd.Series(np.where(has_v2, v1_v1_best + v2_score, v1_v1_best), index=groups)
+
+    # only include groups with a positive cumulative score
+    keep = (cumulative_score > 0).to_numpy()
+    if not keep.any():
+        return pd.DataFrame()
+    groups, v1_v1_best, cumulative_score = groups[keep], v1_v1_best[keep], cumulative_score[keep]
+    model_dtype = v1_df['Model Number'].dtype
+    v1_model_numbers = model_number_column(model_numbers[keep], model_dtype)
+    v2_model_numbers = model_number_column(model_numbers[keep].where(has_v2[keep]), model_dtype)
+    v2_score = model_number_column(v2_score[keep], np.dtype(float))
+
+    return pd.DataFrame({
+        'Group': groups,
+        'Group_Name': get_group_names(groups).values,
+        'Combined_Score': cumulative_score,
+        'Best_v1_ref': v1_v1_best,
+        'Best_v2_ref': v2_score,
+        'V1_Model_For_Combined_Score': groups + '_v1_' + v1_model_numbers.astype(str),
+        'v1_v1_Score': v1_v1_best,
+        'v1_v1_ModelNumber': v1_model_numbers,
+        'v2_v2_Score': v2_score,
+        'v2_v2_ModelNumber': v2_model_numbers,
+    }, index=groups).reset_index(drop=True)
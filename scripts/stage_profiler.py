@@ -0,0 +1,172 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+
+# Hierarchical stage timer and memory profiler.
+#
+# Pipeline code wraps its stages in `with stage(name, target=ID, metric=score):`
+# (loading, selection, csv_write, label_adjustment, tight_layout, savefig, ...). Stages
+# nest, and target/metric are inherited from the enclosing stage. Profiling is off unless
+# CASP_PROFILE=1 is set in the environment (inherited by worker processes) or
+# enable_profiling() is called; when it is off, stage() only yields.
+#
+# Each stage records wall time, CPU time and the peak RSS reached inside it. On Linux the
+# peak is measured from /proc/self/status VmHWM, which is reset on stage entry through
+# /proc/self/clear_refs. Elsewhere the process-wide ru_maxrss is used instead.
+# write_profile_report writes the records as JSON and CSV and as a folded-stack file
+# (self time in microseconds) for flamegraph.pl / speedscope.
+#
+# Usage:
+#     CASP_PROFILE=1 python scripts/MakePlotsForManuscript.py
+#     -> ./output/PROFILE/MakePlotsForManuscript.{json,csv,folded}
+
+import csv
+import json
+import os
+import time
+from contextlib import contextmanager
+
+PROFILE_DIR = './output/PROFILE'
+CLEAR_REFS_PATH = '/proc/self/clear_refs'
+STATUS_PATH = '/proc/self/status'
+RECORD_FIELDS = ['path', 'stage', 'target', 'metric', 'wall', 'cpu', 'peak_rss_mb', 'pid']
+
+_stack = []
+_records = []
+
+
+def is_enabled():
+    return os.environ.get('CASP_PROFILE', '') not in ('', '0')
+
+
+def enable_profiling():
+    """Turn profiling on for this process and the worker processes it starts"""
+    os.environ['CASP_PROFILE'] = '1'
+
+
+def reset_peak_rss():
+    try:
+        with open(CLEAR_REFS_PATH, 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def get_peak_rss_mb():
+    try:
+        with open(STATUS_PATH) as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    # ru_maxrss is in kB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if peak > 2**30 else peak / 1024
+
+
+@contextmanager
+def stage(name, target=None, metric=None):
+    """Time the enclosed block as stage name (nested under the enclosing stage, if any)"""
+    if not is_enabled():
+        yield
+        return
+    parent = _stack[-1] if _stack else None
+    frame = {
+        'name': name,
+        'target': target if target is not None else (parent['target'] if parent else None),
+        'metric': metric if metric is not None else (parent['metric'] if parent else None),
+        'child_peak': 0.0,
+    }
+    frame['path'] = f"{parent['path']};{name}" if parent else name
+    _stack.append(frame)
+    reset_peak_rss()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+        # Children reset the high-water mark, so fold their peaks back in
+        peak = max(get_peak_rss_mb(), frame['child_peak'])
+        _stack.pop()
+        if parent:
+            parent['child_peak'] = max(parent['child_peak'], peak)
+        _records.append({'path': frame['path'], 'stage': name, 'target': frame['target'],
+                         'metric': frame['metric'], 'wall': wall, 'cpu': cpu, 'peak_rss_mb': peak,
+                         'pid': os.getpid()})
+
+
+def get_records():
+    return list(_records)
+
+
+def reset_records():
+    _records.clear()
+
+
+def get_folded_stacks(records):
+    """Return {stack: self time in microseconds}, where self time excludes child stages"""
+    child_wall = {}
+    for record in records:
+        parent = record['path'].rpartition(';')[0]
+        if parent:
+            key = (record['pid'], parent)
+            child_wall[key] = child_wall.get(key, 0.0) + record['wall']
+    # Records of the same stack (e.g. one per target) are summed
+    wall = {}
+    for record in records:
+        wall[(record['pid'], record['path'])] = wall.get((record['pid'], record['path']), 0.0) + record['wall']
+    folded = {}
+    for (pid, path), seconds in wall.items():
+        self_seconds = max(seconds - child_wall.get((pid, path), 0.0), 0.0)
+        folded[path] = folded.get(path, 0) + int(round(self_seconds * 1e6))
+    return folded
+
+
+def summarize(records):
+    """Return one row per (target, metric, stage) with summed wall/CPU time and the max peak RSS"""
+    rows = {}
+    for record in records:
+        key = (record['target'] or '', record['metric'] or '', record['stage'])
+        row = rows.setdefault(key, {'target': key[0], 'metric': key[1], 'stage': key[2], 'calls': 0,
+                                    'wall': 0.0, 'cpu': 0.0, 'peak_rss_mb': 0.0})
+        row['calls'] += 1
+        row['wall'] += record['wall']
+        row['cpu'] += record['cpu']
+        row['peak_rss_mb'] = max(row['peak_rss_mb'], record['peak_rss_mb'])
+    return sorted(rows.values(), key=lambda row: row['wall'], reverse=True)
+
+
+def write_profile_report(records, name, profile_dir=PROFILE_DIR):
+    """Write {name}.json (records and summary), {name}.csv (summary) and {name}.folded"""
+    os.makedirs(profile_dir, exist_ok=True)
+    summary = summarize(records)
+    base = os.path.join(profile_dir, name)
+    with open(f'{base}.json', 'w') as f:
+        json.dump({'records': records, 'summary': summary}, f, indent=2)
+    with open(f'{base}.csv', 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['target', 'metric', 'stage', 'calls', 'wall', 'cpu', 'peak_rss_mb'])
+        writer.writeheader()
+        writer.writerows(summary)
+    with open(f'{base}.folded', 'w') as f:
+        for path, micros in sorted(get_folded_stacks(records).items()):
+            if micros > 0:
+                f.write(f'{path} {micros}\n')
+    print(f"Wrote profile of {len(records)} stages to {base}.json, {base}.csv and {base}.folded")
+    for row in summary[:10]:
+        print(f"  {row['stage']:20s} {row['target']:6s} {row['metric']:18s} "
+              f"wall {row['wall']:7.2f}s  cpu {row['cpu']:7.2f}s  peak {row['peak_rss_mb']:7.1f} MB")
@@ -0,0 +1,173 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+
+# Streaming reduction of the score tables for the selection engines.
+#
+# get_v1_ref_df and get_v2_ref_df load a whole score table, but the two-state and
+# single-state selections only look at the best row of every (Group, Model Version).
+# Here a table is read in chunks of at most CHUNK_ROWS rows, from the columnar store's
+# Arrow record batches when it is up to date and from the CSV otherwise. The accumulator
+# keeps only the TOP_MODELS best models of every key, plus the first row of every group.
+# The reduced table holds its rows in table order, with the original row labels, so the
+# selection engines give the same output as on the full table. Dual-state selection takes
+# the best v1 models first and then streams the V2 table for the rows of just those models.
+#
+# R1203/T1214 (ONE_GROUP_ONLY) are not streamed: their engines break ties between a
+# group's models with an unstable descending sort of the whole table, which a chunked read
+# cannot reproduce, and a stable order would change their published scores.
+#
+# reduce_top_rows accepts any iterable of chunks, so pooled evaluations over many
+# targets and references can chain iter_score_chunks of several tables and keep the best
+# models of every target, reference and group in bounded memory.
+#
+# Usage:
+#     python scripts/streaming_reduction.py --chunk-rows 10000 --targets T1228
+#     combined_df = get_streamed_best_fit('T1228', 'GDT_TS', mode='two')
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from data_manifest import DATA_DIR
+from score_store import STORE_DIR, get_score_csv_path, get_store_path, iter_store_batches, read_store_metadata
+from scoring_core import get_best_fit, get_best_fit_dual_state, get_best_fit_single_state, get_v1_best_models, \
+    get_v2_ref_version, prepare_reference_df
+from score_tensor import ONE_GROUP_ONLY
+from stage_profiler import stage
+
+CHUNK_ROWS = 100000
+# Models kept per key; the selection engines only need the best one
+TOP_MODELS = 1
+STREAM_MODES = ['two', 'single', 'dual']
+ROW_COLUMN = '_row'
+
+
+def iter_score_chunks(ID, version, score, chunk_rows=CHUNK_ROWS, data_dir=DATA_DIR, store_dir=STORE_DIR):
+    """Yield {ID}_{version}_{score}_scores.csv in frames of at most chunk_rows rows"""
+    csv_path = get_score_csv_path(ID, version, score, data_dir)
+    store_path = get_store_path(ID, version, score, store_dir)
+    metadata = read_store_metadata(store_path, csv_path)
+    if metadata is not None:
+        yield from iter_store_batches(store_path, metadata, chunk_rows)
+    else:
+        yield from pd.read_csv(csv_path, chunksize=chunk_rows)
+
+
+def number_chunks(chunks, prepare=None):
+    """Label the rows of a chunk stream with their table position and apply prepare to every chunk"""
+    offset = 0
+    for chunk in chunks:
+        chunk = chunk.set_axis(pd.RangeIndex(offset, offset + len(chunk)))
+        offset += len(chunk)
+        yield prepare(chunk) if prepare is not None else chunk
+
+
+def reduce_top_rows(chunks, score, keys=None, top=TOP_MODELS, prepare=None):
+    """
+    Reduce a stream of score table chunks to the rows of the top models of every key
+    (default Group and Model Version), keeping each model's best listing. prepare is applied
+    to every chunk first. The result is in table order with groups in order of first
+    appearance, as the selection engines expect.
+    """
+    kept = None
+    empty = pd.DataFrame()
+    first_rows = pd.Series(dtype='int64')
+    for chunk in number_chunks(chunks, prepare):
+        chunk = chunk[chunk[score].notna()]
+        if keys is None:
+            keys = [key for key in ['Group', 'Model Version'] if key in chunk.columns]
+        if chunk.empty:
+            empty = chunk
+            continue
+        first_rows = pd.concat([first_rows, chunk.index.to_series().groupby(chunk['Group'].to_numpy(), sort=False).min()])
+        first_rows = first_rows.groupby(level=0, sort=False).min()
+        # Best listing of every model in the chunk (the first one on ties), before merging
+        chunk = chunk.loc[chunk.groupby(keys + ['Model Number'], sort=False, dropna=False)[score].idxmax()]
+        chunk = chunk.assign(**{ROW_COLUMN: chunk.index})
+        kept = chunk if kept is None else pd.concat([kept, chunk])
+        kept = kept.sort_values([score, ROW_COLUMN], ascending=[False, True]) \
+            .drop_duplicates(keys + ['Model Number']) \
+            .groupby(keys, sort=False, dropna=False).head(top)
+    if kept is None:
+        return empty
+    first_row = kept['Group'].map(first_rows).to_numpy()
+    kept = kept.iloc[np.lexsort((kept[ROW_COLUMN].to_numpy(), first_row))]
+    return kept.drop(columns=ROW_COLUMN)
+
+
+def reduce_model_rows(chunks, models, prepare=None):
+    """Reduce a stream of score table chunks to the first row of every (Group, Model Number) in models"""
+    kept = []
+    for chunk in number_chunks(chunks, prepare):
+        wanted = models.get_indexer(pd.MultiIndex.from_arrays([chunk['Group'], chunk['Model Number']])) >= 0
+        kept.append(chunk[wanted])
+    if not kept:
+        return pd.DataFrame()
+    return pd.concat(kept).drop_duplicates(['Group', 'Model Number'], keep='first')
+
+
+def stream_ref_df(ID, score, state, top=TOP_MODELS, chunk_rows=CHUNK_ROWS):
+    """The reduced get_v1_ref_df (state 'v1') or get_v2_ref_df (state 'v2') table of ID/score"""
+    version = 'v1' if state == 'v1' else get_v2_ref_version(ID, score)
+    with stage('load', target=ID, metric=score):
+        return reduce_top_rows(iter_score_chunks(ID, version, score, chunk_rows), score, top=top,
+                               prepare=lambda chunk: prepare_reference_df(ID, chunk, state))
+
+
+def get_streamed_best_fit(ID, score, mode='two', chunk_rows=CHUNK_ROWS):
+    """get_best_fit (mode 'two'), get_best_fit_single_state or get_best_fit_dual_state on streamed score tables"""
+    if mode not in STREAM_MODES:
+        raise ValueError(f"Unknown mode '{mode}', expected one of {STREAM_MODES}")
+    if ID in ONE_GROUP_ONLY:
+        raise ValueError(f"{ID} breaks ties with a sort of the whole score table and cannot be streamed; "
+                         "use the in-memory loaders")
+    v1_df = stream_ref_df(ID, score, 'v1', chunk_rows=chunk_rows)
+    if mode == 'single':
+        with stage('selection', target=ID, metric=score):
+            return get_best_fit_single_state(ID, v1_df, score)
+    if mode == 'dual':
+        groups, _, model_numbers, has_model = get_v1_best_models(ID, v1_df, score)
+        models = pd.MultiIndex.from_arrays([groups[has_model], model_numbers[has_model].astype(v1_df['Model Number'].dtype)])
+        with stage('load', target=ID, metric=score):
+            v2_df = reduce_model_rows(iter_score_chunks(ID, get_v2_ref_version(ID, score), score, chunk_rows), models,
+                                      prepare=lambda chunk: prepare_reference_df(ID, chunk, 'v2'))
+        with stage('selection', target=ID, metric=score):
+            return get_best_fit_dual_state(ID, v1_df, v2_df, score)
+    v2_df = stream_ref_df(ID, score, 'v2', chunk_rows=chunk_rows)
+    with stage('selection', target=ID, metric=score):
+        return get_best_fit(ID, v1_df, v2_df, score)
+
+
+if __name__ == "__main__":
+    from process_two_state_score import TARGET_SCORE_DICT
+
+    parser = argparse.ArgumentParser(description='Reduce the score tables in chunks and run the selection on them')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help='Rows read per chunk')
+    parser.add_argument('--targets', nargs='+', default=None, help='Targets to reduce (default: all)')
+    args = parser.parse_args()
+    for ID, scores in TARGET_SCORE_DICT.items():
+        if args.targets is not None and ID not in args.targets:
+            continue
+        if ID in ONE_GROUP_ONLY:
+            print(f"{ID}: skipped, its tie-breaking needs the whole score table")
+            continue
+        for score in scores:
+            num_rows = sum(len(chunk) for chunk in iter_score_chunks(ID, 'v1', score, args.chunk_rows))
+            v1_df = stream_ref_df(ID, score, 'v1', chunk_rows=args.chunk_rows)
+            combined_df = get_streamed_best_fit(ID, score, chunk_rows=args.chunk_rows)
+            print(f"{ID} {score}: v1 table {num_rows} rows -> {len(v1_df)} kept, {len(combined_df)} groups scored")
@@ -0,0 +1,129 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+
+# Synthetic CASP-scale score tables for benchmarking the scoring core.
+#
+# generate_score_tables writes {ID}_v1_{score}_scores.csv and {ID}_v2_{score}_scores.csv
+# with the columns of the real ./data files. Every group has a skill level, every model a
+# noisy score around it, and the V2 reference scores are correlated with the V1 ones.
+# Scores are rounded (3 decimals by default, like the TMscore files) so ties between
+# models occur as in the real data. Two layouts are supported:
+#     two_state       Model, Group, Model Number, Model Version, score; each model
+#                     targets the v1 or v2 state (version_mix = fraction of v1 models)
+#     one_group_only  Model, Group, Model Number, score without a Model Version column,
+#                     as in the T1214 files (get_best_fit selects this path by ID, so
+#                     score these tables with ID='T1214')
+#
+# Usage:
+#     python scripts/synthetic_data.py --groups 1000 --out ./output/SYNTHETIC_DATA
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+SYNTHETIC_DIR = './output/SYNTHETIC_DATA'
+STYLES = ['two_state', 'one_group_only']
+
+
+def make_score_frames(ID='S0001', score='GDT_TS', num_groups=100, models_per_group=5, version_mix=0.5,
+                      nan_rate=0.02, missing_group_rate=0.05, style='two_state', decimals=3, seed=0):
+    """
+    Return (v1_df, v2_df) score frames for num_groups groups with 1..models_per_group
+    models each. nan_rate is the fraction of NaN scores and missing_group_rate the fraction
+    of groups that are absent from one of the two reference files.
+    """
+    if style not in STYLES:
+        raise ValueError(f"Unknown style {style}, expected one of {STYLES}")
+    rng = np.random.default_rng(seed)
+
+    # Most groups submit the full set of models, some fewer
+    models = np.where(rng.random(num_groups) < 0.8, models_per_group,
+                      rng.integers(1, models_per_group + 1, num_groups))
+    group_index = np.repeat(np.arange(num_groups), models)
+    model_number = np.concatenate([np.arange(1, count + 1) for count in models])
+    groups = np.char.add('TS', np.char.zfill(np.arange(1, num_groups + 1).astype(str), 3))
+    # The v2 state is generally harder to model than v1
+    skill = rng.beta(5, 2, num_groups)
+    versions = np.where(rng.random(len(group_index)) < version_mix, 'v1', 'v2')
+    on_target = versions == 'v1'
+
+    frames = []
+    for ref, ref_version in enumerate(['v1', 'v2']):
+        matches = on_target if ref_version == 'v1' else ~on_target
+        noise = rng.normal(0, 0.05, len(group_index))
+        # Models built for the other state score lower against this reference
+        scores = skill[group_index] * np.where(matches, 1.0, 0.8) - 0.05 * ref + noise
+        scores = np.round(np.clip(scores, 0.0, 1.0), decimals)
+        scores[rng.random(len(scores)) < nan_rate] = np.nan
+
+        keep = np.ones(len(group_index), dtype=bool)
+        missing = rng.random(num_groups) < missing_group_rate
+        keep &= ~missing[group_index]
+        rows = np.flatnonzero(keep)
+        # Row order is shuffled like the ranked score files
+        rows = rows[rng.permutation(len(rows))]
+
+        group_col = groups[group_index[rows]]
+        model_col = model_number[rows]
+        if style == 'two_state':
+            names = [f'{ID}{ref_version}{group}_{number}' for group, number in zip(group_col, model_col)]
+            df = pd.DataFrame({'Model': names, 'Group': group_col, 'Model Number': model_col,
+                               'Model Version': versions[rows], score: scores[rows]})
+        else:
+            names = [f'{ID}{group}_{number}' for group, number in zip(group_col, model_col)]
+            df = pd.DataFrame({'Model': names, 'Group': group_col, 'Model Number': model_col,
+                               score: scores[rows]})
+        frames.append(df)
+    return frames[0], frames[1]
+
+
+def generate_score_tables(out_dir=SYNTHETIC_DIR, ID='S0001', scores=('GDT_TS',), seed=0, **kwargs):
+    """Write the v1/v2 score CSVs of ID for every score to out_dir and return their paths"""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i, score in enumerate(scores):
+        v1_df, v2_df = make_score_frames(ID, score, seed=seed + i, **kwargs)
+        for version, df in [('v1', v1_df), ('v2', v2_df)]:
+            path = os.path.join(out_dir, f'{ID}_{version}_{score}_scores.csv')
+            df.to_csv(path, index=False)
+            paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Write synthetic {ID}_{version}_{score}_scores.csv files')
+    parser.add_argument('--out', default=SYNTHETIC_DIR, help='Output directory')
+    parser.add_argument('--id', default='S0001', help='Target ID (use T1214 with --style one_group_only)')
+    parser.add_argument('--scores', nargs='+', default=['GDT_TS'], help='Score columns to generate')
+    parser.add_argument('--groups', type=int, default=100, help='Number of predictor groups')
+    parser.add_argument('--models', type=int, default=5, help='Maximum models per group')
+    parser.add_argument('--version-mix', type=float, default=0.5, help='Fraction of models targeting v1')
+    parser.add_argument('--nan-rate', type=float, default=0.02, help='Fraction of NaN scores')
+    parser.add_argument('--missing-group-rate', type=float, default=0.05,
+                        help='Fraction of groups missing from each reference file')
+    parser.add_argument('--style', choices=STYLES, default='two_state')
+    parser.add_argument('--decimals', type=int, default=3, help='Score rounding (creates ties)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    paths = generate_score_tables(args.out, args.id, args.scores, num_groups=args.groups, models_per_group=args.models,
+                                  version_mix=args.version_mix, nan_rate=args.nan_rate,
+                                  missing_group_rate=args.missing_group_rate, style=args.style,
+                                  decimals=args.decimals, seed=args.seed)
+    for path in paths:
+        print(f"Wrote {path}")
@@ -0,0 +1,187 @@
+"""
+MIT License
+
+Copyright (c) 2025 Tiburon Leon Benavides
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Author: Tiburon Leon Benavides
+Contribution: Main contributor
+Date: 2025-09-01
+"""
+
+
+# CASP-style z-score leaderboard across targets and metrics.
+#
+# The Combined_Score of every two-state, single-state and dual-state result is loaded
+# through the result cache into one mode x group x target x metric array (NaN where a
+# group has no result). Z-scores are then computed for every mode/target/metric over the
+# groups in the CASP way:
+#   1. z-scores from the mean and standard deviation of all groups,
+#   2. groups below OUTLIER_Z are dropped and the mean and standard deviation recomputed,
+#   3. every group is scored against the second-pass statistics and negative z-scores are
+#      raised to Z_FLOOR, so a poor or missing prediction never costs more than skipping it.
+# A group's leaderboard score is the weighted sum of its z-scores over targets and metrics.
+# Both steps are whole-array NumPy reductions; the array is loaded once, so other weights
+# and metric choices only redo the reductions.
+#
+# Usage:
+#     python scripts/zscore_leaderboard.py --modes two --weights GDT_TS=1 TMscore=1 GlobalLDDT=0.5
+#     -> ./output/LEADERBOARD/{mode}_state_leaderboard.csv
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from group_registry import get_group_names
+from result_cache import MODES, get_combined_df
+
+LEADERBOARD_DIR = './output/LEADERBOARD'
+# Groups below this z-score in the first pass are left out of the second-pass statistics
+OUTLIER_Z = -2.0
+# Lowest z-score a group can contribute to a sum (missing results contribute it as well)
+Z_FLOOR = 0.0
+
+
+def get_mode_target_scores():
+    """The target/metric dictionaries of the two-state, single-state and dual-state scripts"""
+    from process_two_state_score import TARGET_SCORE_DICT as TWO_STATE
+    from process_single_state_score import TARGET_SCORE_DICT as SINGLE_STATE
+    from process_dual_state_score import TARGET_SCORE_DICT as DUAL_STATE
+
+    return {'two': TWO_STATE, 'single': SINGLE_STATE, 'dual': DUAL_STATE}
+
+
+def load_score_array(mode_target_scores=None):
+    """
+    Combined_Score of every mode, group, target and metric as one array, with its axes:
+        values   modes x groups x targets x metrics, NaN where there is no result
+    Without any result the group, target and metric axes are empty.
+    """
+    mode_target_scores = mode_target_scores or get_mode_target_scores()
+    frames = []
+    for mode, target_scores in mode_target_scores.items():
+        for ID, scores in target_scores.items():
+            for score in scores:
+                combined_df = get_combined_df(ID, score, mode)
+                if not combined_df.empty:
+                    frames.append(pd.DataFrame({'mode': mode, 'Group': combined_df['Group'], 'target': ID,
+                                                'metric': score, 'Combined_Score': combined_df['Combined_Score']}))
+    results = pd.concat(frames, ignore_index=True) if frames else \
+        pd.DataFrame(columns=['mode', 'Group', 'target', 'metric', 'Combined_Score'])
+
+    axes = {
+        'modes': [mode for mode in MODES if mode in mode_target_scores],
+        'groups': sorted(results['Group'].unique()),
+        'targets': list(pd.unique(results['target'])),
+        'metrics': list(pd.unique(results['metric'])),
+    }
+    codes = [pd.Index(axes[axis]).get_indexer(results[column])
+             for axis, column in [('modes', 'mode'), ('groups', 'Group'), ('targets', 'target'), ('metrics', 'metric')]]
+    values = np.full(tuple(len(axes[axis]) for axis in axes), np.nan)
+    values[tuple(codes)] = results['Combined_Score'].to_numpy(dtype=float)
+    return {'values': values, **axes}
+
+
+def masked_mean_std(values, member, axis):
+    """Mean and population standard deviation along axis over the member entries (NaN if there are none)"""
+    count = member.sum(axis=axis, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(member, values, 0.0).sum(axis=axis, keepdims=True) / count
+        std = np.sqrt(np.where(member, (values - mean) ** 2, 0.0).sum(axis=axis, keepdims=True) / count)
+    return mean, std
+
+
+def get_zscores(values, outlier_z=OUTLIER_Z, floor=Z_FLOOR, axis=-3):
+    """
+    Two-pass z-scores of values along the group axis. Entries without a result stay NaN;
+    where all assessed groups score the same the z-scores are 0.
+    """
+    present = ~np.isnan(values)
+    mean, std = masked_mean_std(values, present, axis)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        first_pass = (values - mean) / std
+        kept = present & ~(first_pass < outlier_z)
+        mean, std = masked_mean_std(values, kept, axis)
+        zscores = np.where(std > 0, (values - mean) / std, 0.0)
+    return np.where(present, np.maximum(zscores, floor), np.nan)
+
+
+def get_weight_vector(metrics, metric_weights=None):
+    """Weights in metric axis order; metrics missing from metric_weights get weight 0 (all 1 without weights)"""
+    if metric_weights is None:
+        return np.ones(len(metrics))
+    return np.array([metric_weights.get(metric, 0.0) for metric in metrics], dtype=float)
+
+
+def get_leaderboard(score_array, mode='two', metric_weights=None, targets=None, outlier_z=OUTLIER_Z,
+                    floor=Z_FLOOR, zscores=None):
+    """
+    Rank the groups of one mode by their weighted z-score sum over targets and metrics.
+    zscores can be passed to reuse get_zscores(score_array['values']) across weight choices.
+    """
+    if zscores is None:
+        zscores = get_zscores(score_array['values'], outlier_z, floor)
+    zscores = zscores[score_array['modes'].index(mode)]
+    target_mask = np.array([targets is None or target in targets for target in score_array['targets']], dtype=bool)
+    weights = get_weight_vector(score_array['metrics'], metric_weights)
+
+    # Missing results count as the floor; groups x targets weighted sums, then the total
+    per_target = (np.where(np.isnan(zscores), floor, zscores) * weights).sum(axis=-1)[:, target_mask]
+    assessed = ~np.isnan(zscores[:, target_mask]) & (weights > 0)
+    total = per_target.sum(axis=1)
+    num_targets = assessed.any(axis=-1).sum(axis=1)
+
+    groups = pd.Series(score_array['groups'], dtype=object)
+    leaderboard = pd.DataFrame({
+        'Group': groups,
+        'Group_Name': get_group_names(groups).values,
+        'Rank': 1 + (total[None, :] > total[:, None]).sum(axis=1),
+        'Z_Score_Sum': total,
+        'Num_Targets': num_targets,
+    })
+    for i, target in enumerate(np.array(score_array['targets'])[target_mask]):
+        leaderboard[f'{target}_Z'] = per_target[:, i]
+    leaderboard = leaderboard[num_targets > 0]
+    return leaderboard.sort_values(['Rank', 'Group'], kind='stable').reset_index(drop=True)
+
+
+def parse_weights(values):
+    """Parse METRIC=WEIGHT arguments"""
+    metric_weights = {}
+    for value in values or []:
+        metric, weight = value.split('=')
+        metric_weights[metric] = float(weight)
+    return metric_weights or None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='CASP-style z-score leaderboard across targets and metrics')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES)
+    parser.add_argument('--weights', nargs='*', metavar='METRIC=WEIGHT',
+                        help='Metric weights; unlisted metrics are left out (default: every metric, weight 1)')
+    parser.add_argument('--targets', nargs='+', default=None, help='Targets to sum over (default: all)')
+    parser.add_argument('--outlier-z', type=float, default=OUTLIER_Z)
+    parser.add_argument('--floor', type=float, default=Z_FLOOR)
+    args = parser.parse_args()
+
+    score_array = load_score_array()
+    start = time.perf_counter()
+    zscores = get_zscores(score_array['values'], args.outlier_z, args.floor)
+    leaderboards = {mode: get_leaderboard(score_array, mode, parse_weights(args.weights), args.targets,
+                                          args.outlier_z, args.floor, zscores) for mode in args.modes}
+    print(f"Computed {len(leaderboards)} leaderboards in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    os.makedirs(LEADERBOARD_DIR, exist_ok=True)
+    for mode, leaderboard in leaderboards.items():
+        path = f'{LEADERBOARD_DIR}/{mode}_state_leaderboard.csv'
+        leaderboard.to_csv(path, index=False)
+        print(f"Wrote {path}")
+        print(leaderboard.head(10)[['Rank', 'Group', 'Group_Name', 'Z_Score_Sum', 'Num_Targets']].to_string(index=False))